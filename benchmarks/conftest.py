@@ -0,0 +1,85 @@
+"""
+Shared fixtures of the benchmarks of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pytest
+
+# The modules are in the src directory, the graphical user interface is rendered without a display
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# The number of points of the synthetic paths
+SIZES = [10, 100, 1000, 10000, 100000]
+
+# The scale of the synthetic paths, these cover a stage of 4x3 meter
+PIXELS_PER_METER = 300
+
+
+def synthetic_path(count, seed=0):
+    """
+    Return an (N,2) array with a random walk in image pixels that stays on a stage of 4x3 meter, like a path
+    that is traced by hand over a stage plan
+    """
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(scale=5, size=(count, 2))
+    steps[0] = (600, 450)
+    path = np.cumsum(steps, axis=0)
+    # Fold the walk back onto the stage
+    size = np.array([4, 3]) * PIXELS_PER_METER
+    path = np.abs(np.mod(path, 2 * size) - size)
+    return path
+
+
+try:
+    import pytest_benchmark
+except ImportError:
+    pytest_benchmark = None
+
+if pytest_benchmark is None:
+    @pytest.fixture
+    def benchmark(request):
+        """
+        Without pytest-benchmark each benchmark runs once, so that the results are still checked. The time is
+        kept in the user properties of the test, e.g., for pytest --junitxml.
+        """
+        def run(function, *args, **kwargs):
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            request.node.user_properties.append(('time', time.perf_counter() - start))
+            return result
+        return run
+
+
+@pytest.fixture(scope='session')
+def app():
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+@pytest.fixture
+def editor(app):
+    from waypointeditor.editor import WaypointEditor
+    editor = WaypointEditor()
+    editor.resize(1200, 900)
+    editor.new_image(4, 3)
+    yield editor
+    editor.close()
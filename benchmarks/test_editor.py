@@ -0,0 +1,108 @@
+"""
+Benchmarks of the rendering and the image loading of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import pytest
+
+from conftest import SIZES, synthetic_path
+
+pytest.importorskip('PyQt5')
+
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QImage, QColor, QPainter
+from waypointeditor.editor import ImageLoader, TEMPLATES
+
+
+def render(widget):
+    """
+    Render the widget into an offscreen image, this calls its paintEvent
+    """
+    image = QImage(widget.size(), QImage.Format_ARGB32_Premultiplied)
+    widget.render(image)
+    return image
+
+
+@pytest.mark.parametrize('count', SIZES)
+def test_paint(benchmark, editor, count):
+    # Repaint without changes, the path in screen coordinates is cached
+    editor.trajectory.replace(synthetic_path(count))
+    render(editor.image_tab)
+    benchmark(render, editor.image_tab)
+
+
+@pytest.mark.parametrize('count', SIZES)
+def test_paint_after_move(benchmark, editor, count):
+    # Repaint after dragging a point, the path is converted to screen coordinates again
+    editor.trajectory.replace(synthetic_path(count))
+
+    def move_and_render():
+        editor.image_tab.edit('move', count // 2, 600, 450)
+        return render(editor.image_tab)
+
+    benchmark(move_and_render)
+
+
+@pytest.mark.parametrize('count', SIZES)
+def test_paint_profile(benchmark, editor, count):
+    # Repaint after dragging a point with the motion profile along a smooth path
+    trajectory = editor.trajectory
+    trajectory.replace(synthetic_path(count))
+    trajectory.max_speed, trajectory.max_acceleration, trajectory.smooth = 1.0, 0.5, True
+
+    def move_and_render():
+        editor.image_tab.edit('move', count // 2, 600, 450)
+        return render(editor.image_tab)
+
+    benchmark(move_and_render)
+
+
+@pytest.mark.parametrize('width, depth', TEMPLATES)
+def test_new_image(benchmark, editor, width, depth):
+    def new_image():
+        editor.new_image(width, depth)
+        return render(editor.image_tab)
+
+    benchmark(new_image)
+
+
+@pytest.fixture(scope='module')
+def stage_plan(tmp_path_factory, app):
+    """
+    A synthetic stage plan of 6000x4000 pixels with dark walls, saved as PNG
+    """
+    image = QImage(QSize(6000, 4000), QImage.Format_RGB32)
+    image.fill(QColor(255, 255, 255))
+    painter = QPainter(image)
+    for i in range(0, 6000, 250):
+        painter.fillRect(i, 0, 10, 4000 - i // 2, QColor(0, 0, 0))
+    painter.end()
+    file_name = str(tmp_path_factory.mktemp('images') / 'stage.png')
+    image.save(file_name)
+    return file_name
+
+
+def test_image_loading(benchmark, stage_plan):
+    # Load the preview, the full image and the mipmap levels on the current thread
+    def load():
+        loader = ImageLoader(stage_plan, QSize(1200, 900))
+        result = []
+        loader.loaded.connect(lambda pyramid, statistics: result.append(pyramid))
+        loader.run()
+        return result
+
+    assert len(benchmark(load)) == 1
@@ -0,0 +1,85 @@
+"""
+Benchmarks of the waypoint computation and the export of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import io
+import pytest
+
+from conftest import SIZES, PIXELS_PER_METER, synthetic_path
+from waypointeditor.trajectory import Trajectory, compute_waypoints, compute_profile, resample
+from waypointeditor.waypointio import format_csv, write_csv, write_binary, read_waypoints
+
+
+@pytest.mark.parametrize('count', SIZES)
+def test_compute_waypoints(benchmark, count):
+    points = synthetic_path(count)
+    waypoints = benchmark(compute_waypoints, points, PIXELS_PER_METER, 60, 90)
+    assert waypoints.shape == (count, 4)
+
+
+@pytest.mark.parametrize('count', SIZES)
+def test_trajectory_waypoints(benchmark, count):
+    trajectory = Trajectory(synthetic_path(count), PIXELS_PER_METER, 60, 90)
+    waypoints = benchmark(trajectory.waypoints)
+    assert len(waypoints) == count
+
+
+@pytest.mark.parametrize('count', SIZES)
+def test_move_point(benchmark, count):
+    # Dragging a point updates the cumulative length from that point onwards
+    trajectory = Trajectory(synthetic_path(count), PIXELS_PER_METER, 60, 90)
+    benchmark(trajectory.move, count // 2, 600, 450)
+
+
+@pytest.mark.parametrize('count', SIZES)
+def test_compute_profile(benchmark, count):
+    points = synthetic_path(count)
+    path, waypoints, minimum_duration = benchmark(compute_profile, points, PIXELS_PER_METER, 0, 0, 1.0, 0.5)
+    assert minimum_duration > 0
+
+
+@pytest.mark.parametrize('count', SIZES)
+def test_format_csv(benchmark, count):
+    waypoints = compute_waypoints(synthetic_path(count), PIXELS_PER_METER, 60, 90)
+    text = benchmark(format_csv, waypoints)
+    assert text.count('\n') == count
+
+
+@pytest.mark.parametrize('count', SIZES)
+def test_write_csv(benchmark, count, tmp_path):
+    waypoints = compute_waypoints(synthetic_path(count), PIXELS_PER_METER, 60, 90)
+    assert benchmark(write_csv, tmp_path / 'waypoints.csv', waypoints) == count
+
+
+@pytest.mark.parametrize('count', SIZES)
+def test_write_binary(benchmark, count):
+    waypoints = compute_waypoints(synthetic_path(count), PIXELS_PER_METER, 60, 90)
+    assert benchmark(write_binary, io.BytesIO(), waypoints) == count
+
+
+@pytest.mark.parametrize('count', SIZES)
+def test_read_waypoints(benchmark, count, tmp_path):
+    waypoints = compute_waypoints(synthetic_path(count), PIXELS_PER_METER, 60, 90)
+    write_csv(tmp_path / 'waypoints.csv', waypoints)
+    assert len(benchmark(read_waypoints, str(tmp_path / 'waypoints.csv'))) == count
+
+
+def test_resample(benchmark):
+    # One hour at 50 Hz
+    waypoints = compute_waypoints(synthetic_path(10000), PIXELS_PER_METER, 3600, 90)
+    assert benchmark(lambda: sum(len(chunk) for chunk in resample(waypoints, 50))) == 180001
@@ -1,3 +1,3 @@
 #!/bin/sh
 
-pyinstaller --windowed src/waypointeditor.py -n "Waypoint Editor"
+pyinstaller --windowed --paths src src/waypointeditor/__main__.py -n "Waypoint Editor"
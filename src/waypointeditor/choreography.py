@@ -0,0 +1,112 @@
+"""
+Collision checking between multiple robots of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import collections
+import numpy as np
+
+# A pair of robots that come closer than the clearance, from the start to the stop time (in seconds)
+Conflict = collections.namedtuple('Conflict', ['first', 'second', 'start', 'stop', 'distance'])
+
+# The number of time samples that are checked at once
+CHUNK_SIZE = 65536
+
+
+def sample_positions(timelines, times):
+    """
+    Return a (T,R,2) array with the position of each of the R robots at each of the T times. The timelines are
+    a list with the (N,) times and the (N,2) positions of each robot. A robot is at its first position before
+    it starts, and stays at its last position after it finished.
+    """
+    positions = np.zeros((len(times), len(timelines), 2))
+    for r, (time, position) in enumerate(timelines):
+        if len(time):
+            positions[:, r, 0] = np.interp(times, time, position[:, 0])
+            positions[:, r, 1] = np.interp(times, time, position[:, 1])
+        else:
+            positions[:, r] = np.nan
+    return positions
+
+
+def close_pairs(positions, clearance):
+    """
+    Return the time index, the two robots and the distance for each pair of robots in a (T,R,2) array that are
+    closer than the clearance.
+
+    This is a sweep and prune along the x axis: at each time the robots are sorted on x, and only the robots
+    that are less than the clearance apart in the sorted order are compared. All times are processed at once,
+    the loop is over the distance in the sorted order, which stops as soon as no pair is close enough on x.
+    """
+    count, robots = positions.shape[:2]
+    order = np.argsort(positions[:, :, 0], axis=1)
+    ordered = np.take_along_axis(positions, order[:, :, np.newaxis], axis=1)
+    found = []
+    for k in range(1, robots):
+        dx = ordered[:, k:, 0] - ordered[:, :-k, 0]
+        candidate = dx < clearance  # this is False for robots without a position
+        if not np.any(candidate):
+            break
+        t, i = np.nonzero(candidate)
+        distance = np.hypot(dx[t, i], ordered[t, i + k, 1] - ordered[t, i, 1])
+        close = distance < clearance
+        a, b = order[t[close], i[close]], order[t[close], i[close] + k]
+        found.append((t[close], np.minimum(a, b), np.maximum(a, b), distance[close]))
+    if not found:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0)
+    return tuple(np.concatenate(values) for values in zip(*found))
+
+
+def find_conflicts(names, timelines, clearance, rate=None):
+    """
+    Check the paths of multiple robots for moments at which two robots are closer than the clearance (in the
+    same units as the positions). The timelines are a list with the (N,) times and the (N,2) positions of each
+    robot. This returns a list of conflicts, in which consecutive moments for the same pair are combined.
+
+    The positions are sampled at the rate (in Hz). By default this is high enough that no robot moves more than
+    a quarter of the clearance between samples, so that robots cannot pass through each other unnoticed.
+    """
+    if not clearance > 0:
+        raise ValueError('the clearance should be positive')
+    timelines = [(np.asarray(time, dtype=float), np.asarray(position, dtype=float).reshape(-1, 2)) for time, position in timelines]
+    duration = max([time[-1] for time, position in timelines if len(time)], default=0)
+    if rate is None:
+        speed = 0
+        for time, position in timelines:
+            dt = np.diff(time)
+            ds = np.hypot(*np.diff(position, axis=0).T)
+            speed = max(speed, np.max(ds[dt > 0] / dt[dt > 0], initial=0))
+        rate = max(10, 4 * speed / clearance)
+    count = int(np.floor(duration * rate + 1e-9)) + 1
+
+    pairs = []
+    for start in range(0, count, CHUNK_SIZE):
+        index = np.arange(start, min(count, start + CHUNK_SIZE))
+        t, a, b, distance = close_pairs(sample_positions(timelines, index / rate), clearance)
+        pairs.append((t + start, a, b, distance))
+    t, a, b, distance = (np.concatenate(values) for values in zip(*pairs))
+
+    # Combine the consecutive samples of each pair into a single conflict
+    order = np.lexsort((t, b, a))
+    t, a, b, distance = t[order], a[order], b[order], distance[order]
+    new = np.ones(len(t), dtype=bool)
+    new[1:] = (a[1:] != a[:-1]) | (b[1:] != b[:-1]) | (t[1:] != t[:-1] + 1)
+    first = np.flatnonzero(new)
+    last = np.append(first[1:], len(t)) - 1
+    closest = np.minimum.reduceat(distance, first) if len(first) else np.zeros(0)
+    conflicts = [Conflict(names[a[i]], names[b[i]], float(t[i] / rate), float(t[j] / rate), float(d)) for i, j, d in zip(first, last, closest)]
+    return sorted(conflicts, key=lambda conflict: conflict.start)
@@ -0,0 +1,267 @@
+"""
+Command-line interface of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+This module does not import PyQt5, the graphical user interface is only imported when it is started.
+"""
+
+import time
+STARTED = time.perf_counter()  # the start of the imports, to report the startup time of the graphical user interface
+
+import os
+import sys
+import argparse
+import collections
+
+from waypointeditor.trajectory import compute_batch, compute_profile, resample
+from waypointeditor.simplify import METHODS, simplify, max_deviation
+from waypointeditor.waypointio import read_points, read_waypoints, write_csv, write_binary, time_decimals, RATE, PORT
+
+# The file formats that are recognized when a directory is given as input
+EXTENSIONS = ('.json', '.csv')
+
+
+def find_inputs(inputs):
+    """
+    Expand the directories in the list of inputs to the point files that they contain
+    """
+    files = []
+    for name in inputs:
+        if os.path.isdir(name):
+            for entry in sorted(os.listdir(name)):
+                if os.path.splitext(entry)[1].lower() in EXTENSIONS:
+                    files.append(os.path.join(name, entry))
+        else:
+            files.append(name)
+    return files
+
+
+def output_name(file_name):
+    """
+    Return the name of the waypoint file for a point file, without the extension
+    """
+    return os.path.splitext(os.path.basename(file_name))[0]
+
+
+def compile_files(files, output, options, binary=False, rate=None, tolerance=None, method=METHODS[0], smooth=False):
+    """
+    Compile a list of point files into waypoint files in the output directory. The paths are read one by one,
+    optionally simplified with the tolerance in meter, and their waypoints are computed together. The paths
+    with a maximum speed and acceleration get a motion profile, these are computed one by one. This returns
+    a list with an error message (or None) per file, and a list with the number of points before and after the
+    simplification and the largest deviation in meter (or None) per file.
+    """
+    errors = [None] * len(files)
+    reports = [None] * len(files)
+    paths, scale, duration, rotation, valid = [], [], [], [], []
+    profiles = {}
+    for i, file_name in enumerate(files):
+        try:
+            points, settings = read_points(file_name)
+            settings.update({key: value for key, value in options.items() if value is not None})
+            if not settings.get('pixels_per_meter', 0) > 0:
+                raise ValueError('the scale (pixels per meter) is not specified')
+        except (OSError, ValueError) as error:
+            errors[i] = str(error)
+            continue
+        if tolerance is not None:
+            keep = simplify(points, tolerance * settings['pixels_per_meter'], method)
+            reports[i] = (len(points), len(keep), max_deviation(points, keep) / settings['pixels_per_meter'])
+            points = points[keep]
+        if settings.get('max_speed', 0) > 0 and settings.get('max_acceleration', 0) > 0:
+            profiles[i] = compute_profile(points, settings['pixels_per_meter'], settings.get('total_duration', 0), settings.get('total_rotation', 0),
+                                          settings['max_speed'], settings['max_acceleration'], settings.get('max_angular_speed', 0), smooth)[1]
+            continue
+        paths.append(points)
+        scale.append(settings['pixels_per_meter'])
+        duration.append(settings.get('total_duration', 0))
+        rotation.append(settings.get('total_rotation', 0))
+        valid.append(i)
+
+    computed = dict(zip(valid, compute_batch(paths, scale, duration, rotation)))
+    computed.update(profiles)
+    for i, waypoints in sorted(computed.items()):
+        name = output_name(files[i])
+        if rate:
+            waypoints = resample(waypoints, rate)
+        try:
+            if binary:
+                write_binary(os.path.join(output, name + '.bin'), waypoints)
+            else:
+                write_csv(os.path.join(output, name + '.csv'), waypoints, time_decimals(rate))
+        except OSError as error:
+            errors[i] = str(error)
+    return errors, reports
+
+
+def compile_command(args):
+    files = find_inputs(args.input)
+    options = {
+        'pixels_per_meter': args.scale,
+        'total_duration': args.duration,
+        'total_rotation': args.rotation,
+        'max_speed': args.max_speed,
+        'max_acceleration': args.max_acceleration,
+        'max_angular_speed': args.max_angular_speed,
+    }
+    binary = args.format == 'binary'
+    if args.rate is not None and not args.rate > 0:
+        print('the rate should be positive', file=sys.stderr)
+        return 2
+    if args.simplify is not None and not args.simplify >= 0:
+        print('the tolerance should not be negative', file=sys.stderr)
+        return 2
+    os.makedirs(args.output, exist_ok=True)
+
+    # Files with the same name, e.g., a.json and a.csv, would be written to the same waypoint file
+    count = collections.Counter(output_name(file_name) for file_name in files)
+    duplicates = [file_name for file_name in files if count[output_name(file_name)] > 1]
+    for file_name in duplicates:
+        print(f'{file_name}: another input file has the same name, the waypoints of neither are written', file=sys.stderr)
+    total = len(files)
+    files = [file_name for file_name in files if count[output_name(file_name)] == 1]
+
+    # Split the files in chunks, so that each worker process computes the waypoints for multiple paths at once
+    from concurrent.futures import ProcessPoolExecutor
+    jobs = args.jobs or os.cpu_count() or 1
+    size = max(1, -(-len(files) // (jobs * 4)))
+    chunks = [files[i:i + size] for i in range(0, len(files), size)]
+    if jobs == 1 or len(chunks) <= 1:
+        results = [compile_files(chunk, args.output, options, binary, args.rate, args.simplify, args.method, args.smooth) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            repeat = lambda value: [value] * len(chunks)
+            results = list(executor.map(compile_files, chunks, repeat(args.output), repeat(options), repeat(binary), repeat(args.rate), repeat(args.simplify), repeat(args.method), repeat(args.smooth)))
+
+    failed = len(duplicates)
+    before, after, deviation = 0, 0, 0
+    for chunk, (errors, reports) in zip(chunks, results):
+        for file_name, error, report in zip(chunk, errors, reports):
+            if error:
+                print(f'{file_name}: {error}', file=sys.stderr)
+                failed += 1
+            elif report:
+                before, after, deviation = before + report[0], after + report[1], max(deviation, report[2])
+    if not args.quiet:
+        print(f'compiled {total - failed} of {total} files to {args.output}')
+        if args.simplify is not None:
+            print(f'simplified from {before} to {after} points, maximum deviation {deviation:.3f} m')
+    return 1 if failed else 0
+
+
+def play_command(args):
+    import asyncio
+    from waypointeditor.playback import Playback, play
+    try:
+        robots = {os.path.splitext(os.path.basename(file_name))[0]: read_waypoints(file_name) for file_name in args.input}
+        playback = Playback(robots, args.rate, args.speed, args.loop)
+    except (OSError, ValueError) as error:
+        print(error, file=sys.stderr)
+        return 2
+    if not args.quiet:
+        print(f'playing {len(robots)} robots for {playback.duration / args.speed:.1f} s at {args.rate:g} Hz')
+    try:
+        asyncio.run(play(playback, args.to or []))
+    except KeyboardInterrupt:
+        pass
+    except (OSError, ValueError) as error:
+        print(error, file=sys.stderr)
+        return 1
+    if not args.quiet:
+        print(playback.report())
+    return 0
+
+
+def receive_command(args):
+    import asyncio
+    from waypointeditor.playback import Receiver, receive
+
+    def show(robot, sample, sent):
+        print(f'{robot},{sample[0]:.3f},{sample[1]:.3f},{sample[2]:.3f},{sample[3]:.0f}')
+
+    receiver = Receiver(args.format == 'osc', args.rate, None if args.quiet else show)
+    try:
+        asyncio.run(receive(receiver, args.host, args.port, args.duration))
+    except KeyboardInterrupt:
+        pass
+    except OSError as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(receiver.report(), file=sys.stderr)
+    return 0
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='waypointeditor', description='Create waypoints for the EEGsynth robots.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    parser_compile = subparsers.add_parser('compile', help='compile point files into waypoint files without the graphical user interface')
+    parser_compile.add_argument('input', nargs='+', help='JSON or CSV files with points in image pixels, or directories containing them')
+    parser_compile.add_argument('-o', '--output', required=True, help='directory for the waypoint files')
+    parser_compile.add_argument('--scale', type=float, help='scale in pixels per meter, overrides the value in the file')
+    parser_compile.add_argument('--duration', type=float, help='total duration in seconds, overrides the value in the file')
+    parser_compile.add_argument('--rotation', type=float, help='total rotation in degrees, overrides the value in the file')
+    parser_compile.add_argument('--max-speed', type=float, help='maximum speed in meter/second, together with the maximum acceleration this computes a time-optimal motion profile')
+    parser_compile.add_argument('--max-acceleration', type=float, help='maximum acceleration in meter/second^2')
+    parser_compile.add_argument('--max-angular-speed', type=float, help='maximum angular speed in degrees/second')
+    parser_compile.add_argument('--smooth', action='store_true', help='follow a smooth spline through the points, this requires a motion profile')
+    parser_compile.add_argument('-f', '--format', choices=('csv', 'binary'), default='csv', help='output format, binary files contain float32 records with time, x, y and angle')
+    parser_compile.add_argument('-r', '--rate', type=float, help='resample the waypoints at a fixed rate in Hz, rather than one per point')
+    parser_compile.add_argument('-s', '--simplify', type=float, metavar='TOLERANCE', help='remove the points that are not needed to follow the path within the tolerance in meter')
+    parser_compile.add_argument('--method', choices=METHODS, default=METHODS[0], help='simplification method, the default is %(default)s')
+    parser_compile.add_argument('-j', '--jobs', type=int, help='number of parallel processes, the default is the number of CPUs')
+    parser_compile.add_argument('-q', '--quiet', action='store_true', help='do not print a summary')
+    parser_compile.set_defaults(function=compile_command)
+
+    parser_play = subparsers.add_parser('play', help='play waypoint files in real time and stream the setpoints to the robots')
+    parser_play.add_argument('input', nargs='+', help='CSV or binary waypoint files, one per robot')
+    parser_play.add_argument('-t', '--to', action='append', metavar='URL', help='stream to udp://host:port, osc://host:port or mqtt://host:port/topic, this can be repeated')
+    parser_play.add_argument('-r', '--rate', type=float, default=RATE, help='rate of the setpoints in Hz, the default is %(default)s')
+    parser_play.add_argument('--speed', type=float, default=1.0, help='playback speed, the default is %(default)s')
+    parser_play.add_argument('--loop', action='store_true', help='repeat until interrupted')
+    parser_play.add_argument('-q', '--quiet', action='store_true', help='do not print the timing statistics')
+    parser_play.set_defaults(function=play_command)
+
+    parser_receive = subparsers.add_parser('receive', help='receive the streamed setpoints over UDP, e.g., to test the playback on this computer')
+    parser_receive.add_argument('--host', default='127.0.0.1', help='address to listen on, the default is %(default)s')
+    parser_receive.add_argument('-p', '--port', type=int, default=PORT, help='UDP port, the default is %(default)s')
+    parser_receive.add_argument('-f', '--format', choices=('json', 'osc'), default='json', help='message format, the default is %(default)s')
+    parser_receive.add_argument('-r', '--rate', type=float, help='expected rate in Hz, to report the jitter of the interval')
+    parser_receive.add_argument('-d', '--duration', type=float, help='stop after this number of seconds')
+    parser_receive.add_argument('-q', '--quiet', action='store_true', help='do not print the setpoints, only the statistics')
+    parser_receive.set_defaults(function=receive_command)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    The main entry point for the application when started as the script created by the pip installer. Without
+    a command this starts the graphical user interface.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in ('compile', 'play', 'receive', '-h', '--help'):
+        args = parse_args(argv)
+        sys.exit(args.function(args))
+    else:
+        from waypointeditor import editor
+        editor.main(STARTED)
+
+
+if __name__ == '__main__':
+    main()
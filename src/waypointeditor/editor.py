@@ -0,0 +1,1939 @@
+#!/usr/bin/env python
+
+""" 
+Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+STARTED = time.perf_counter()  # the start of the imports, to report the startup time
+
+import os
+import sys
+import math
+import contextlib
+import collections
+import numpy
+from PyQt5.QtCore import Qt, QTimer, QPointF, QRect, QRectF, QLineF, QSize, QThread, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QPixmap, QImage, QImageReader, QPainter, QPen, QColor, QPalette, QPolygonF
+from PyQt5.QtWidgets import (
+    QApplication, QMainWindow, QLabel, QVBoxLayout, QFormLayout, QWidget, QFileDialog, QAction, QActionGroup,
+    QTabWidget, QTableView, QHeaderView, QInputDialog, QMessageBox, QLineEdit, QPlainTextEdit, QDialog, QPushButton,
+    QCheckBox
+)
+from waypointeditor.trajectory import Trajectory, resample, points_from_waypoints
+from waypointeditor.choreography import find_conflicts
+from waypointeditor.planner import Planner, occupancy_grid, CELL_SIZE
+from waypointeditor import project
+from waypointeditor.spatialindex import GridIndex
+from waypointeditor.waypointio import format_csv, read_waypoints, write_csv, write_binary, time_decimals
+
+try:
+    import resource
+except ImportError:
+    resource = None  # this is not available on Windows
+
+# The views that can be marked as stale by the update scheduler
+VIEWS = ('image', 'settings', 'waypoints', 'export')
+
+# The template stages in the "New image" menu, width and depth in meter
+TEMPLATES = [
+    (1, 1), (1, 2), (1, 3),
+    (2, 1), (2, 2), (2, 3), (2, 4),
+    (3, 1), (3, 2), (3, 3), (3, 4), (3, 5), (3, 6),
+    (4, 1), (4, 2), (4, 3), (4, 4), (4, 5), (4, 8),
+    (5, 2), (5, 5), (5, 10),
+    (6, 3), (6, 6), (6, 9),
+    (8, 2), (8, 4), (8, 8),
+]
+
+# The stage that is shown at startup
+DEFAULT_TEMPLATE = (4, 3)
+
+# Set this environment variable to log the time of every paint and recompute, e.g., WAYPOINTEDITOR_PROFILE=1
+PROFILE = 'WAYPOINTEDITOR_PROFILE'
+
+# A paint or recompute that takes longer than one frame at 60 Hz is marked as slow in the log
+FRAME_TIME = 1 / 60
+
+# The journal with the changes that were not saved in a project file
+AUTOSAVE = os.path.join(os.path.expanduser('~'), '.waypointeditor', 'autosave' + project.JOURNAL)
+
+
+def peak_memory():
+    """
+    Return the peak memory use of the process in bytes, or None if this is not available
+    """
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024  # macOS reports bytes, Linux kilobytes
+
+
+def buffer(polygon):
+    """
+    Return an (N,2) array that shares its memory with the points of the QPolygonF
+    """
+    pointer = polygon.data()
+    pointer.setsize(polygon.size() * 2 * 8)
+    return numpy.frombuffer(pointer, dtype=numpy.float64).reshape(-1, 2)
+
+
+def grayscale(pyramid, shape):
+    """
+    Return the stage image as a grayscale array, from the smallest level of the pyramid that has at least twice
+    the resolution of a grid with the specified shape
+    """
+    level = pyramid.levels[pyramid.level(2 * shape[1] / pyramid.levels[0].width())]
+    image = level.convertToFormat(QImage.Format_Grayscale8)
+    pointer = image.constBits()
+    pointer.setsize(image.sizeInBytes())
+    return numpy.frombuffer(pointer, dtype=numpy.uint8).reshape(image.height(), image.bytesPerLine())[:, :image.width()].copy()
+
+
+def fill_segments(polygon, path, scale, offset):
+    """
+    Fill the QPolygonF with the start and end point of each segment of the path in screen coordinates
+    """
+    polygon.fill(QPointF(), 2 * max(0, len(path) - 1))
+    if len(path) > 1:
+        segments = buffer(polygon).reshape(-1, 2, 2)
+        numpy.multiply(path[:-1], scale, out=segments[:, 0])
+        numpy.multiply(path[1:], scale, out=segments[:, 1])
+        segments += offset
+
+
+def isvalid(s):
+    """
+    Check if a string can be converted to a positive float, this is needed for teh configuration tab
+    """
+    try:
+        return float(s)>0
+    except ValueError:
+        return False        
+
+
+class UpdateStatistics:
+    """
+    Count the number of paints and recomputes, this is used to confirm that nothing happens while the editor is idle.
+
+    While profiling, the time of each paint and recompute is also logged to the standard error, so that slow
+    frames and stalls of the user interface can be found, e.g., with a large stage plan before a show.
+    """
+    def __init__(self):
+        self.counts = collections.Counter()
+        self.slowest = collections.defaultdict(float)
+        self.profiling = bool(os.environ.get(PROFILE))
+
+    def increment(self, name):
+        self.counts[name] += 1
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        """
+        Measure the time of a paint or recompute while profiling
+        """
+        if not self.profiling:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.slowest[name] = max(self.slowest[name], elapsed)
+            print(f'{time.strftime("%H:%M:%S")} {name} {1000 * elapsed:.2f} ms' + (' slow' if elapsed > FRAME_TIME else ''), file=sys.stderr, flush=True)
+
+    def report(self, interval=1.0):
+        """
+        Return a string with the number of events per second since the previous report, and reset the counts
+        """
+        rates = [f'{name} {self.counts[name] / interval:.0f}/s' for name in sorted(self.counts)]
+        if self.profiling:
+            rates += [f'slowest {name} {1000 * self.slowest[name]:.1f} ms' for name in sorted(self.slowest)]
+        self.counts.clear()
+        self.slowest.clear()
+        return ', '.join(rates) if rates else 'idle'
+
+
+class AboutDialog(QDialog):
+    """
+    A simple dialog that shows the about text
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        # Get the parent window position and size
+        position = parent.pos()
+        size = parent.size()
+        px = position.x()
+        py = position.y()
+        sx = size.width()
+        sy = size.height()
+
+        # Set the position and size of the help dialog
+        self.setGeometry(int(px + sx/2 - 150), int(py + sy/2 - 50), 300, 100)
+        self.setWindowTitle("About")
+
+        # Create a layout and add a label with help text
+        layout = QVBoxLayout()
+        help_text = QLabel("Waypoint Editor\n(C) 2025, Robert Oostenveld", self)
+        help_text.setWordWrap(True)
+        layout.addWidget(help_text)
+
+        # Add a close button
+        close_button = QPushButton("Close", self)
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button)
+
+        self.setLayout(layout)
+
+
+class HelpDialog(QDialog):
+    """
+    A simple dialog that shows the help text
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        # Get the parent window position and size
+        position = parent.pos()
+        size = parent.size()
+        px = position.x()
+        py = position.y()
+        sx = size.width()
+        sy = size.height()
+
+        # Set the position and size of the help dialog
+        self.setGeometry(int(px + sx/2 - 150), int(py + sy/2 - 50), 300, 100)
+        self.setWindowTitle("Help")
+
+        # Create a layout and add a label with help text
+        layout = QVBoxLayout()
+        help_text = QLabel("Press Z to clear the last point.\nPress C to clear all points.\nDrag a point to move it, or select it and press Delete to remove it.\nShift-click on a segment to insert a point, Ctrl-click to add a point on top of another one.\nUse the mouse wheel to zoom and drag with the right mouse button to pan.\nPress F to fit the image to the window.", self)
+        help_text.setWordWrap(True)
+        layout.addWidget(help_text)
+
+        # Add a close button
+        close_button = QPushButton("Close", self)
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button)
+
+        self.setLayout(layout)
+
+
+class TilePyramid:
+    """
+    A mipmap of the stage image, in which each level is half the size of the previous one. The levels are split
+    into tiles that are converted to pixmaps when they are first drawn, so that only the tiles that are visible
+    are sampled. The most recently used tiles are kept in a cache.
+    """
+    TILE_SIZE = 512
+    MAX_TILES = 128
+
+    def __init__(self, image, stage=None):
+        self.levels = [image]
+        self.tiles = collections.OrderedDict()
+        # The number of stage pixels per image pixel, this is larger than one for a downsampled preview
+        self.factor = stage.width() / image.width() if stage else 1
+
+    def build(self, scale):
+        """
+        Compute the levels that are needed for the scale in advance, e.g., on the worker thread that loads the image
+        """
+        self.level(scale * self.factor)
+
+    def memory(self):
+        return sum(level.sizeInBytes() for level in self.levels)
+
+    def level(self, scale):
+        """
+        Return the index of the smallest level that still has at least the resolution of the screen
+        """
+        level = 0
+        while scale * 2 ** (level + 1) <= 1 and min(self.levels[level].width(), self.levels[level].height()) > 1:
+            level += 1
+            if level == len(self.levels):
+                previous = self.levels[-1]
+                self.levels.append(previous.scaled(max(1, previous.width() // 2), max(1, previous.height() // 2), Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+        return level
+
+    def tile(self, level, column, row):
+        key = (level, column, row)
+        if key in self.tiles:
+            self.tiles.move_to_end(key)
+        else:
+            size = self.TILE_SIZE
+            self.tiles[key] = QPixmap.fromImage(self.levels[level].copy(column * size, row * size, size, size))
+            if len(self.tiles) > self.MAX_TILES:
+                self.tiles.popitem(last=False)
+        return self.tiles[key]
+
+    def draw(self, painter, scale, offset, rect, ratio=1):
+        """
+        Draw the part of the image that falls within the rectangle on the screen, given the scale and offset
+        between the image pixels and the screen pixels, and the ratio between the device and screen pixels
+        """
+        scale = scale * self.factor
+        level = self.level(scale * ratio)
+        factor = scale * 2 ** level  # between the pixels of this level and the screen pixels
+        image = self.levels[level]
+        size = self.TILE_SIZE
+
+        # Determine the range of tiles that is visible
+        c0 = max(0, int((rect.left() - offset[0]) / factor) // size)
+        r0 = max(0, int((rect.top() - offset[1]) / factor) // size)
+        c1 = min((image.width() - 1) // size, int((rect.right() - offset[0]) / factor) // size)
+        r1 = min((image.height() - 1) // size, int((rect.bottom() - offset[1]) / factor) // size)
+
+        for row in range(r0, r1 + 1):
+            for column in range(c0, c1 + 1):
+                pixmap = self.tile(level, column, row)
+                # Round the edges of the tiles on the screen, so that neighbouring tiles connect without a seam
+                left = round(column * size * factor + offset[0])
+                top = round(row * size * factor + offset[1])
+                right = round((column * size + pixmap.width()) * factor + offset[0])
+                bottom = round((row * size + pixmap.height()) * factor + offset[1])
+                painter.drawPixmap(QRect(left, top, right - left, bottom - top), pixmap, pixmap.rect())
+
+
+class StageGrid:
+    """
+    A template stage with grid lines every meter and every quarter meter. The lines are computed when they are
+    drawn, given the scale and the part that is visible, so that no bitmap of the stage is needed.
+    """
+    RESOLUTION = 300  # the default scale of the templates in pixels per meter
+    DIVISIONS = 4  # the number of grid lines per meter
+    MIN_SPACING = 4  # the minimal distance between lines on the screen, otherwise only the meter lines are drawn
+
+    def __init__(self, width, depth, resolution):
+        self.width = width  # in meter
+        self.depth = depth  # in meter
+        self.resolution = resolution  # in pixels per meter
+
+    def size(self):
+        return QSize(round(self.width * self.resolution), round(self.depth * self.resolution))
+
+    def lines(self, length, start, stop, step, divisions):
+        """
+        Return the indices of the lines between start and stop that fall on the stage, and whether they are on a meter
+        """
+        first = max(0, int(numpy.ceil(start / step)))
+        last = min(int(length * divisions + 1e-9), int(numpy.floor(stop / step)))
+        index = numpy.arange(first, last + 1)
+        return index, index % divisions == 0
+
+    def draw(self, painter, scale, offset, rect, ratio=1):
+        """
+        Draw the part of the stage that falls within the rectangle on the screen, given the scale and offset
+        between the image pixels and the screen pixels
+        """
+        meter = self.resolution * scale  # the size of one meter on the screen
+        painter.fillRect(QRectF(offset[0], offset[1], self.width * meter, self.depth * meter), Qt.white)
+
+        divisions = self.DIVISIONS if meter / self.DIVISIONS >= self.MIN_SPACING else 1
+        step = meter / divisions
+        if step < self.MIN_SPACING:
+            return
+
+        top = max(offset[1], rect.top())
+        bottom = min(offset[1] + self.depth * meter, rect.bottom() + 1)
+        left = max(offset[0], rect.left())
+        right = min(offset[0] + self.width * meter, rect.right() + 1)
+
+        # Put the lines in the middle of the device pixels, so that they remain sharp
+        gray, black = [], []
+        index, major = self.lines(self.width, rect.left() - offset[0], rect.right() - offset[0], step, divisions)
+        for i, m in zip(index, major):
+            x = (round((offset[0] + i * step) * ratio) + 0.5) / ratio
+            (black if m else gray).append(QLineF(x, top, x, bottom))
+        index, major = self.lines(self.depth, rect.top() - offset[1], rect.bottom() - offset[1], step, divisions)
+        for i, m in zip(index, major):
+            y = (round((offset[1] + i * step) * ratio) + 0.5) / ratio
+            (black if m else gray).append(QLineF(left, y, right, y))
+
+        painter.setPen(QPen(Qt.lightGray, 0))
+        painter.drawLines(gray)
+        painter.setPen(QPen(Qt.darkGray, 0))
+        painter.drawLines(black)
+
+
+class ImageLoader(QThread):
+    """
+    Load an image on a worker thread. A downsampled preview is shown first and then the image at full resolution,
+    together with the mipmap levels that are needed to show it. Loading can be cancelled with requestInterruption().
+
+    Only JPEG images can be decoded at a lower resolution for the preview, the other formats are decoded once at
+    full resolution and the preview is then a level of the mipmap.
+    """
+    PREVIEW_SIZE = 1024
+
+    preview = pyqtSignal(object)  # a TilePyramid with the preview
+    loaded = pyqtSignal(object, dict)  # a TilePyramid with the full image, and the statistics
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_name, view):
+        super().__init__()
+        self.file_name = file_name
+        self.view = view  # the size of the view in device pixels, to compute the mipmap levels in advance
+
+    def run(self):
+        start = time.perf_counter()
+        reader = QImageReader(self.file_name)
+        stage = reader.size()
+        if not stage.isValid():
+            self.failed.emit(reader.errorString())
+            return
+
+        large = max(stage.width(), stage.height()) > self.PREVIEW_SIZE
+        jpeg = bytes(reader.format()).lower() in (b'jpeg', b'jpg')
+        if large and jpeg:
+            reader.setScaledSize(stage.scaled(self.PREVIEW_SIZE, self.PREVIEW_SIZE, Qt.KeepAspectRatio))
+            image = reader.read()
+            if self.isInterruptionRequested():
+                return
+            if not image.isNull():
+                self.preview.emit(TilePyramid(image, stage))
+            reader = QImageReader(self.file_name)  # a reader can only read the image once
+
+        image = reader.read()
+        if self.isInterruptionRequested():
+            return
+        if image.isNull():
+            self.failed.emit(reader.errorString())
+            return
+        pyramid = TilePyramid(image)
+        if large and not jpeg:
+            level = pyramid.level(self.PREVIEW_SIZE / max(stage.width(), stage.height()))
+            self.preview.emit(TilePyramid(pyramid.levels[level], stage))
+        pyramid.build(min(self.view.width() / stage.width(), self.view.height() / stage.height()))
+        if self.isInterruptionRequested():
+            return
+        self.loaded.emit(pyramid, {'time': time.perf_counter() - start, 'memory': pyramid.memory(), 'peak': peak_memory()})
+
+
+class PlaybackThread(QThread):
+    """
+    Run the playback on an asyncio event loop on a worker thread, so that the timing of the setpoints that are
+    streamed to the robots does not depend on the repaints of the editor
+    """
+    failed = pyqtSignal(str)
+
+    def __init__(self, playback, urls):
+        super().__init__()
+        self.playback = playback
+        self.urls = urls
+
+    def run(self):
+        import asyncio
+        from waypointeditor.playback import play
+        try:
+            asyncio.run(play(self.playback, self.urls))
+        except Exception as error:
+            # An exception that is not caught here would abort the editor, since it is raised on another thread
+            self.failed.emit(str(error) or type(error).__name__)
+
+
+class ImageTab(QWidget):
+    HIT_RADIUS = 8  # The distance in screen pixels within which a point or segment is found under the mouse
+    BRUSH = 0.25  # The radius in meter of the brush for painting obstacles
+    ROBOT_RADIUS = 0.15  # The radius in meter of the robots during playback, when it is not specified
+
+    def __init__(self, parent):
+        super().__init__()
+        self.parent = parent
+        self.setMouseTracking(True)  # Enable mouse tracking
+        self.setFocusPolicy(Qt.StrongFocus)  # Set focus policy to accept keyboard events
+        self.stage = None  # The size of the stage image in pixels
+        self.pyramid = None  # Mipmap with tiles of the image for drawing
+        self.grid = None  # Template stage that is drawn without an image
+        self.background = None  # The image scaled to the widget size, this is cached between paints
+        self.offset = [0, 0]  # Offset to center the image
+        self.pixels_to_pixels = 0 # Scale factor between the image pixels and the screen pixels
+        self.zoom = 1  # Zoom factor relative to fitting the image in the widget
+        self.pan = [0, 0]  # Displacement of the image in screen pixels
+        self.drag = None  # Last position while panning with the right mouse button
+        self.polygon = QPolygonF()  # The points in screen coordinates, this buffer is reused between paints
+        self.segments = QPolygonF()  # The start and end point of each segment in screen coordinates
+        self.polygon_key = None  # The version of the points and the transform for which the buffers are valid
+        self.others = {}  # The segments of the other robots in screen coordinates, with the version for which they are valid
+        self.other_pen = QPen(QColor(160, 160, 160), 2)  # Gray line for the other robots
+        self.first_pen = QPen(QColor(0, 255, 0), 10)  # Green points, 10px size
+        self.point_pen = QPen(QColor(0, 0, 255), 10)  # Blue points, 10px size
+        self.line_pen = QPen(QColor(255, 0, 0), 2)  # Red line, 2px thickness
+        self.selected_pen = QPen(QColor(255, 160, 0), 3)  # Orange circle around the selected point
+        self.hover_pen = QPen(QColor(64, 64, 64), 1)  # Gray circle around the point under the mouse
+        self.robot_pen = QPen(QColor(0, 0, 0), 2)  # Black outline and heading of the robots during playback
+        self.robot_color = QColor(255, 200, 0, 192)  # Transparent yellow robots during playback
+        self.index = GridIndex()  # Spatial index of the points, for hit tests in image pixel coordinates
+        self.index_key = None  # The version of the points for which the spatial index is valid
+        self.selected = None  # Index of the selected point
+        self.hover = None  # Index of the point under the mouse
+        self.dragging = None  # Index of the point that is being dragged
+        self.painting = False  # Paint obstacles with the left mouse button rather than editing the points
+        self.stroke = None  # True while painting and False while erasing obstacles with the mouse
+        self.obstacles = None  # The obstacles as a transparent image, this is cached between paints
+        self.obstacles_key = None  # The version of the obstacles for which the image is valid
+        self.obstacle_color = (255, 0, 255, 96)  # Transparent magenta
+
+    def set_image(self, image):
+        """
+        Set the stage image (a QImage or a TilePyramid) or remove it when None
+        """
+        if isinstance(image, QImage):
+            image = TilePyramid(image) if not image.isNull() else None
+        stage = QSize(round(image.levels[0].width() * image.factor), round(image.levels[0].height() * image.factor)) if image else None
+        self.set_stage(stage)
+        self.pyramid = image
+        self.grid = None
+        self.update_transform()
+
+    def set_grid(self, grid):
+        """
+        Set a template stage (a StageGrid) instead of an image
+        """
+        self.set_stage(grid.size())
+        self.pyramid = None
+        self.grid = grid
+        self.update_transform()
+
+    def set_stage(self, stage):
+        if stage != self.stage:
+            # Keep the view when the image is replaced by one of the same size, e.g., the preview by the full image
+            self.zoom = 1
+            self.pan = [0, 0]
+        self.stage = stage
+
+    def update_transform(self):
+        """
+        Update the scale and offset between the image pixels and the screen pixels. This invalidates the
+        cached background, and is only called when the widget size, the image, the zoom or the pan changes.
+        """
+        self.background = None
+        if self.stage is None:
+            self.pixels_to_pixels = 0
+            return
+        w = self.stage.width()
+        h = self.stage.height()
+        self.pixels_to_pixels = min(self.width() / w, self.height() / h) * self.zoom
+        self.offset[0] = (self.width() - int(w * self.pixels_to_pixels)) / 2 + self.pan[0]
+        self.offset[1] = (self.height() - int(h * self.pixels_to_pixels)) / 2 + self.pan[1]
+
+    def resizeEvent(self, event):
+        self.update_transform()
+        super().resizeEvent(event)
+
+    def wheelEvent(self, event):
+        if self.stage is None:
+            return
+        # Zoom in or out while keeping the point under the mouse at the same position
+        zoom = min(max(self.zoom * 1.25 ** (event.angleDelta().y() / 120), 1), 64)
+        factor = zoom / self.zoom
+        position = event.pos()
+        center = [self.width() / 2, self.height() / 2]
+        self.pan[0] = (self.pan[0] + center[0] - position.x()) * factor - center[0] + position.x()
+        self.pan[1] = (self.pan[1] + center[1] - position.y()) * factor - center[1] + position.y()
+        self.zoom = zoom
+        self.update_transform()
+        self.parent.invalidate('image')
+
+    def to_image(self, position):
+        """
+        Convert a position on the screen to image pixel coordinates
+        """
+        return ((position.x() - self.offset[0]) / self.pixels_to_pixels, (position.y() - self.offset[1]) / self.pixels_to_pixels)
+
+    def spatial_index(self):
+        """
+        Return the spatial index of the points, this is rebuilt when the points were changed elsewhere, or when
+        the zoom changed so much that the grid cells no longer match the hit radius
+        """
+        trajectory = self.parent.trajectory
+        key = (id(trajectory), trajectory.version)
+        cell_size = 2 ** max(2, round(math.log2(2 * self.HIT_RADIUS / self.pixels_to_pixels))) if self.pixels_to_pixels else self.index.cell_size
+        if key != self.index_key or not 0.25 <= cell_size / self.index.cell_size <= 4:
+            self.index = GridIndex(cell_size, trajectory.points.tolist())
+            self.index_key = key
+        return self.index
+
+    def edit(self, operation, *args):
+        """
+        Apply an operation (append, pop, insert, remove or move) to the trajectory and to the spatial index
+        """
+        trajectory = self.parent.trajectory
+        index = self.spatial_index()
+        getattr(trajectory, operation)(*args)
+        getattr(index, operation)(*args)
+        self.index_key = (id(trajectory), trajectory.version)
+        self.parent.record('edit', self.parent.robot, operation, *args)
+        self.parent.invalidate()
+
+    def mouseMoveEvent(self, event):
+        if self.stroke is not None:
+            self.paint_obstacle(event.pos())
+        elif self.drag is not None:
+            position = event.pos()
+            self.pan[0] += position.x() - self.drag.x()
+            self.pan[1] += position.y() - self.drag.y()
+            self.drag = position
+            self.update_transform()
+            self.parent.invalidate('image')
+        elif self.dragging is not None:
+            # Move the point, but keep it on the stage
+            x, y = self.to_image(event.pos())
+            x = min(max(x, 0), self.stage.width())
+            y = min(max(y, 0), self.stage.height())
+            self.edit('move', self.dragging, int(x), int(y))
+        elif self.stage is not None:
+            # Highlight the point under the mouse
+            hover = self.spatial_index().nearest_point(*self.to_image(event.pos()), self.HIT_RADIUS / self.pixels_to_pixels)
+            if hover != self.hover:
+                self.hover = hover
+                self.setCursor(Qt.PointingHandCursor if hover is not None else Qt.ArrowCursor)
+                self.parent.invalidate('image')
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.RightButton:
+            self.drag = None
+        if event.button() == Qt.LeftButton:
+            self.dragging = None
+            self.stroke = None
+            trajectory = self.parent.trajectory
+            if trajectory.draft:
+                # Plan the routes to and from the point that was dragged
+                trajectory.draft = False
+                if trajectory.planner is not None:
+                    self.parent.invalidate()
+
+    def paint_obstacle(self, position):
+        planner = self.parent.planner
+        if planner is not None:
+            x, y = self.to_image(position)
+            planner.paint(x, y, self.BRUSH * planner.pixels_per_meter, self.stroke)
+            self.parent.record('paint', x, y, self.BRUSH * planner.pixels_per_meter, self.stroke)
+            self.parent.invalidate()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.RightButton:
+            self.drag = event.pos()
+        if event.button() == Qt.LeftButton and self.painting:
+            # Paint obstacles, or erase them with Shift
+            self.stroke = not event.modifiers() & Qt.ShiftModifier
+            self.paint_obstacle(event.pos())
+            return
+        if event.button() == Qt.LeftButton and self.stage is not None:
+            x, y = self.to_image(event.pos())
+            radius = self.HIT_RADIUS / self.pixels_to_pixels
+            if not event.modifiers() & Qt.ControlModifier:
+                # Select and start dragging the point under the mouse
+                i = self.spatial_index().nearest_point(x, y, radius)
+                if i is not None:
+                    self.selected = self.dragging = i
+                    self.parent.trajectory.draft = True
+                    self.parent.invalidate('image')
+                    return
+                # Insert a point on the segment under the mouse
+                if event.modifiers() & Qt.ShiftModifier:
+                    segment, position = self.spatial_index().nearest_segment(x, y, radius)
+                    if segment is not None:
+                        self.edit('insert', segment + 1, int(position[0]), int(position[1]))
+                        self.selected = self.dragging = segment + 1
+                        self.parent.trajectory.draft = True
+                        return
+            if x<0 or x>self.stage.width() or y<0 or y>self.stage.height():
+                # Don't add points that fall outside the image
+                return
+            # Add the clicked point to the trajectory
+            self.edit('append', int(x), int(y))
+            self.selected = None
+
+    def keyPressEvent(self, event):
+        trajectory = self.parent.trajectory
+        if event.key() == Qt.Key_C:  # Clear canvas when 'C' is pressed
+            trajectory.clear()
+            self.parent.record('edit', self.parent.robot, 'clear')
+            self.selected = self.hover = self.dragging = None
+            self.parent.invalidate()
+        if event.key() == Qt.Key_Z:  # Undo last point when 'Z' is pressed
+            if len(trajectory):
+                self.edit('pop')
+                self.selected = self.hover = self.dragging = None
+        if event.key() in (Qt.Key_Delete, Qt.Key_Backspace):  # Remove the selected point
+            if self.selected is not None and self.selected < len(trajectory):
+                self.edit('remove', self.selected)
+                self.selected = self.hover = self.dragging = None
+        if event.key() == Qt.Key_Escape:  # Deselect the point
+            self.selected = None
+            self.parent.invalidate('image')
+        if event.key() == Qt.Key_F:  # Fit the image to the window when 'F' is pressed
+            self.zoom = 1
+            self.pan = [0, 0]
+            self.update_transform()
+            self.parent.invalidate('image')
+
+    def paintEvent(self, event):
+        with self.parent.statistics.timer('image paint'):
+            self.paint()
+        if self.parent.pending_startup is not None:
+            self.parent.first_frame()
+
+    def paint(self):
+        self.parent.statistics.increment('image paint')
+
+        # The image is only scaled again when the widget size, the image or the view has changed
+        if self.background is None and (self.pyramid or self.grid):
+            self.parent.statistics.increment('image scale')
+            ratio = self.devicePixelRatioF()
+            self.background = QPixmap(self.size() * ratio)
+            self.background.setDevicePixelRatio(ratio)
+            self.background.fill(self.palette().color(QPalette.Window))
+            background_painter = QPainter(self.background)
+            background_painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            (self.pyramid or self.grid).draw(background_painter, self.pixels_to_pixels, self.offset, self.rect(), ratio)
+            background_painter.end()
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)  # Enable antialiasing for smoother lines
+
+        # Draw the image if it exists
+        if self.background:
+            painter.drawPixmap(0, 0, self.background)
+
+        # Draw the obstacles while they are painted or avoided
+        if self.painting or self.parent.trajectory.planner is not None:
+            self.draw_obstacles(painter)
+
+        # Draw the paths of the other robots
+        painter.setPen(self.other_pen)
+        for segments in self.update_others():
+            painter.drawLines(segments)
+
+        # Draw the robots at their current position during playback
+        self.draw_robots(painter)
+
+        self.update_polygon()
+        if self.polygon.isEmpty():
+            return
+
+        # Draw points, the first one in a different color
+        painter.setPen(self.point_pen)
+        painter.drawPoints(self.polygon)
+        painter.setPen(self.first_pen)
+        painter.drawPoint(self.polygon.at(0))
+
+        # Draw lines connecting the points. These are drawn as separate lines rather than as a polyline, since
+        # stroking a long self-intersecting polyline as a single path is very slow.
+        painter.setPen(self.line_pen)
+        painter.drawLines(self.segments)
+
+        # Draw circles around the selected point and the point under the mouse
+        painter.setBrush(Qt.NoBrush)
+        for i, pen in ((self.selected, self.selected_pen), (self.hover, self.hover_pen)):
+            if i is not None and i < self.polygon.size():
+                painter.setPen(pen)
+                painter.drawEllipse(self.polygon.at(i), self.HIT_RADIUS, self.HIT_RADIUS)
+
+    def update_polygon(self):
+        """
+        Convert the points and the path from image to screen coordinates. This is only done when the points,
+        the path or the transform have changed, the result is written directly into the memory of the reused
+        buffers. The path consists of the points, or of the samples along the smooth path.
+        """
+        trajectory = self.parent.trajectory
+        key = self.path_key(trajectory)
+        if key == self.polygon_key:
+            return
+        self.polygon_key = key
+        points = trajectory.points
+        self.polygon.fill(QPointF(), len(points))
+        if len(points):
+            screen = buffer(self.polygon)
+            numpy.multiply(points, self.pixels_to_pixels, out=screen)
+            screen += self.offset
+        fill_segments(self.segments, trajectory.path, self.pixels_to_pixels, self.offset)
+
+    def draw_obstacles(self, painter):
+        planner = self.parent.planner
+        if planner is None:
+            return
+        if self.obstacles_key != (id(planner), planner.version):
+            self.obstacles_key = (id(planner), planner.version)
+            pixels = numpy.zeros(planner.shape + (4,), dtype=numpy.uint8)
+            pixels[planner.occupied] = self.obstacle_color
+            self.obstacles = QImage(pixels.tobytes(), planner.shape[1], planner.shape[0], 4 * planner.shape[1], QImage.Format_RGBA8888).copy()
+        size = planner.cell * self.pixels_to_pixels
+        painter.drawImage(QRectF(self.offset[0], self.offset[1], planner.shape[1] * size, planner.shape[0] * size), self.obstacles)
+
+    def draw_robots(self, painter):
+        """
+        Draw each robot as a circle with a line in the direction that it faces. The setpoints are in stage
+        coordinates relative to the first point, these are converted back to the image.
+        """
+        playback = self.parent.playback
+        if playback is None:
+            return
+        painter.setPen(self.robot_pen)
+        painter.setBrush(self.robot_color)
+        for name, sample in list(playback.position.items()):
+            if name not in self.parent.robots:
+                continue
+            trajectory = self.parent.robots[name]
+            origin, pixels_per_meter = self.parent.playback_origins[name]
+            t, x, y, angle = sample
+            center = QPointF((origin[0] - y * pixels_per_meter) * self.pixels_to_pixels + self.offset[0], (origin[1] - x * pixels_per_meter) * self.pixels_to_pixels + self.offset[1])
+            radius = max((trajectory.radius or self.ROBOT_RADIUS) * pixels_per_meter * self.pixels_to_pixels, self.HIT_RADIUS)
+            heading = math.radians(angle)
+            painter.drawEllipse(center, radius, radius)
+            painter.drawLine(center, center + QPointF(-math.sin(heading), -math.cos(heading)) * radius)
+        painter.setBrush(Qt.NoBrush)
+
+    def update_others(self):
+        """
+        Convert the paths of the other robots to screen coordinates, this is only done for the paths that changed
+        """
+        others = {}
+        for name, trajectory in self.parent.robots.items():
+            if trajectory is self.parent.trajectory:
+                continue
+            key, segments = self.others.get(name, (None, None))
+            if key != self.path_key(trajectory):
+                key, segments = self.path_key(trajectory), QPolygonF()
+                fill_segments(segments, trajectory.path, self.pixels_to_pixels, self.offset)
+            others[name] = (key, segments)
+        self.others = others
+        return [segments for key, segments in others.values()]
+
+    def path_key(self, trajectory):
+        """
+        Return the version of the path, of the route around the obstacles and of the transform, the path in screen
+        coordinates is valid as long as this does not change
+        """
+        return (id(trajectory), trajectory.route_key(), trajectory.has_profile and trajectory.smooth, trajectory.pixels_per_meter, self.pixels_to_pixels, self.offset[0], self.offset[1])
+
+
+class WaypointsModel(QAbstractTableModel):
+    """
+    A table model on top of the trajectory, the cells are only computed and formatted when they are shown
+    """
+    HEADER = ["Time (s)", "X (meter)", "Y (meter)", "Angle (degrees)"]
+    FORMAT = ['{:.1f}', '{:.3f}', '{:.3f}', '{:.0f}']
+
+    def __init__(self, parent):
+        super().__init__()
+        self.parent = parent
+        self.rows = 0
+
+    def rowCount(self, index=QModelIndex()):
+        return 0 if index.isValid() else self.rows
+
+    def columnCount(self, index=QModelIndex()):
+        return 0 if index.isValid() else 4
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid() and index.row() < self.rows:
+            return self.FORMAT[index.column()].format(self.parent.trajectory.waypoint(index.row())[index.column()])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            if orientation == Qt.Horizontal:
+                return self.HEADER[section]
+            else:
+                return str(section + 1)
+        return None
+
+    def refresh(self):
+        """
+        Update the number of rows from the trajectory. Rows are inserted or removed at the end and the existing
+        rows are marked as changed, the view then only computes and formats the rows that are visible.
+        """
+        trajectory = self.parent.trajectory
+        before, after = self.rows, trajectory.waypoint_count()
+        if after > before:
+            self.beginInsertRows(QModelIndex(), before, after - 1)
+            self.rows = after
+            self.endInsertRows()
+        elif after < before:
+            self.beginRemoveRows(QModelIndex(), after, before - 1)
+            self.rows = after
+            self.endRemoveRows()
+        if min(before, after) > 0:
+            self.dataChanged.emit(self.index(0, 0), self.index(min(before, after) - 1, 3), [Qt.DisplayRole])
+
+
+class LazyTab(QWidget):
+    """
+    A placeholder in the tab widget that creates the actual tab when it is first shown, so that the tabs that
+    are not needed at startup do not delay it
+    """
+    def __init__(self, create):
+        super().__init__()
+        self.create = create
+        self.tab = None
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+
+    def showEvent(self, event):
+        if self.tab is None:
+            self.tab = self.create()
+            self.layout.addWidget(self.tab)
+        super().showEvent(event)
+
+
+class WaypointsTab(QWidget):
+    def __init__(self, parent):
+        super().__init__()
+        self.parent = parent
+        self.layout = QVBoxLayout(self)
+        self.model = WaypointsModel(parent)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.layout.addWidget(self.table)
+
+    def refresh(self):
+        self.parent.statistics.increment('waypoints recompute')
+        self.model.refresh()
+
+
+class SettingsTab(QWidget):
+    def __init__(self, parent):
+        super().__init__()
+        self.parent           = parent
+        self.layout           = QFormLayout(self)
+        self.width_pixels     = QLineEdit(parent=self)
+        self.depth_pixels     = QLineEdit(parent=self)
+        self.length_pixels    = QLineEdit(parent=self)
+        self.pixels_per_meter = QLineEdit(parent=self)
+        self.width_meter      = QLineEdit(parent=self)
+        self.depth_meter      = QLineEdit(parent=self)
+        self.length_meter     = QLineEdit(parent=self)
+        self.total_duration   = QLineEdit(parent=self)
+        self.total_rotation   = QLineEdit(parent=self)
+        self.average_speed    = QLineEdit(parent=self)
+        self.angular_speed    = QLineEdit(parent=self)
+        self.output_rate      = QLineEdit(parent=self)
+        self.max_speed        = QLineEdit(parent=self)
+        self.max_acceleration = QLineEdit(parent=self)
+        self.max_angular_speed = QLineEdit(parent=self)
+        self.smooth           = QCheckBox(parent=self)
+        self.minimum_duration = QLineEdit(parent=self)
+        self.avoid_obstacles  = QCheckBox(parent=self)
+        self.robot_radius     = QLineEdit(parent=self)
+
+        self.width_pixels.setReadOnly(True)
+        self.depth_pixels.setReadOnly(True)
+        self.length_pixels.setReadOnly(True)
+        self.width_meter.setReadOnly(True)
+        self.depth_meter.setReadOnly(True)
+        self.length_meter.setReadOnly(True)
+        self.average_speed.setReadOnly(True)
+        self.angular_speed.setReadOnly(True)
+        self.minimum_duration.setReadOnly(True)
+
+        # A single style sheet for all read-only fields, this is parsed once rather than for each field
+        bg_color = QColor(229, 229, 229).name()
+        self.setStyleSheet(f'QLineEdit[readOnly="true"] {{ background-color: {bg_color}; border: 2px solid {bg_color}; }}')
+
+        self.layout.addRow("Stage width (pixels):", self.width_pixels)
+        self.layout.addRow("Stage depth (pixels):", self.depth_pixels)
+        self.layout.addRow("Total length (pixels):", self.length_pixels)
+        self.layout.addRow("Scale (pixels/meter):", self.pixels_per_meter)
+        self.layout.addRow("", QLabel(" "))
+        self.layout.addRow("Stage width (meter):", self.width_meter)
+        self.layout.addRow("Stage depth (meter):", self.depth_meter)
+        self.layout.addRow("Total length (meter):", self.length_meter)
+        self.layout.addRow("Total duration (second):", self.total_duration)
+        self.layout.addRow("Total rotation (degrees):", self.total_rotation)
+        self.layout.addRow("Average speed (meter/second):", self.average_speed)
+        self.layout.addRow("Angular speed (degrees/second):", self.angular_speed)
+        self.layout.addRow("", QLabel(" "))
+        self.layout.addRow("Maximum speed (meter/second):", self.max_speed)
+        self.layout.addRow("Maximum acceleration (meter/second²):", self.max_acceleration)
+        self.layout.addRow("Maximum angular speed (degrees/second):", self.max_angular_speed)
+        self.layout.addRow("Smooth path:", self.smooth)
+        self.layout.addRow("Minimum duration (second):", self.minimum_duration)
+        self.layout.addRow("Avoid obstacles:", self.avoid_obstacles)
+        self.layout.addRow("Robot radius (meter):", self.robot_radius)
+        self.max_speed.setPlaceholderText("constant speed")
+        self.max_angular_speed.setPlaceholderText("no limit")
+        self.layout.addRow("", QLabel(" "))
+        self.layout.addRow("Export rate (Hz):", self.output_rate)
+        self.output_rate.setPlaceholderText("one waypoint per point")
+
+        self.pixels_per_meter.textEdited.connect(self.parent.settings_changed)
+        self.total_duration.textEdited.connect(self.parent.settings_changed)
+        self.total_rotation.textEdited.connect(self.parent.settings_changed)
+        self.max_speed.textEdited.connect(self.parent.settings_changed)
+        self.max_acceleration.textEdited.connect(self.parent.settings_changed)
+        self.max_angular_speed.textEdited.connect(self.parent.settings_changed)
+        self.smooth.toggled.connect(self.parent.settings_changed)
+        self.avoid_obstacles.toggled.connect(self.parent.settings_changed)
+        self.robot_radius.textEdited.connect(self.parent.settings_changed)
+
+    def load(self, trajectory):
+        """
+        Show the settings of a robot, the scale is the same for all robots
+        """
+        for field in ('total_duration', 'total_rotation', 'max_speed', 'max_acceleration', 'max_angular_speed'):
+            value = getattr(trajectory, field)
+            getattr(self, field).setText(f'{value:g}' if value else '')
+        self.robot_radius.setText(f'{trajectory.radius:g}' if trajectory.radius else '')
+        for checkbox, checked in ((self.smooth, trajectory.smooth), (self.avoid_obstacles, self.parent.robot in self.parent.avoid)):
+            checkbox.blockSignals(True)
+            checkbox.setChecked(checked)
+            checkbox.blockSignals(False)
+
+    def refresh(self):
+        """
+        Recompute the derived values that are shown in the read-only fields
+        """
+        self.parent.statistics.increment('settings recompute')
+
+        image = self.parent.image_tab.stage
+        if image:
+            self.depth_pixels.setText(f'{image.height()}')
+            self.width_pixels.setText(f'{image.width()}')
+        else:
+            self.depth_pixels.setText("")
+            self.width_pixels.setText("")
+
+        try:
+            if not image:
+                raise ValueError
+            depth_meter = image.height() / float(self.pixels_per_meter.text())
+            if depth_meter < 0:
+                raise ValueError
+            self.depth_meter.setText(f'{depth_meter:.2f}')
+            width_meter = image.width() / float(self.pixels_per_meter.text())
+            if width_meter < 0:
+                raise ValueError
+            self.width_meter.setText(f'{width_meter:.2f}')
+        except (ValueError, ZeroDivisionError):
+            self.depth_meter.setText("")
+            self.width_meter.setText("")
+
+        length_pixels = self.parent.trajectory.length_pixels
+        self.length_pixels.setText(f'{length_pixels:.0f}')
+
+        try:
+            length_meter = length_pixels / float(self.pixels_per_meter.text())
+            if length_meter < 0:
+                raise ValueError
+            self.length_meter.setText(f'{length_meter:.2f}')
+        except (ValueError, ZeroDivisionError):
+            length_meter = 0
+            self.length_meter.setText(str(""))
+
+        try:
+            total_duration = float(self.total_duration.text())
+            if total_duration < 0:
+                raise ValueError
+            average_speed = length_meter / total_duration
+            self.average_speed.setText(f'{average_speed:.3f}')
+        except (ValueError, ZeroDivisionError):
+            average_speed = 0
+            self.average_speed.setText(str(""))
+
+        try:
+            total_duration = float(self.total_duration.text())
+            total_rotation = float(self.total_rotation.text())
+            angular_speed = total_rotation / total_duration
+            self.angular_speed.setText(f'{angular_speed:.0f}')
+        except (ValueError, ZeroDivisionError):
+            self.angular_speed.setText(str(""))
+
+        trajectory = self.parent.trajectory
+        if trajectory.is_valid() and trajectory.has_profile:
+            self.minimum_duration.setText(f'{trajectory.minimum_duration:.1f}')
+        else:
+            self.minimum_duration.setText("")
+
+
+class ExportTab(QWidget):
+    def __init__(self, parent):
+        super().__init__()
+        self.parent = parent
+
+        self.layout = QVBoxLayout(self)
+        self.text = QPlainTextEdit(self)
+        self.text.setReadOnly(True)
+        self.layout.addWidget(self.text)
+        self.outdated = False
+
+    def refresh(self):
+        """
+        Format all waypoints in one pass and set the text at once. This is postponed until the tab is shown.
+        """
+        if not self.isVisible():
+            self.outdated = True
+            return
+        self.outdated = False
+        self.parent.statistics.increment('export recompute')
+        self.text.setPlainText(format_csv(self.parent.trajectory.waypoints()).rstrip('\n'))
+
+    def showEvent(self, event):
+        if self.outdated:
+            self.refresh()
+        super().showEvent(event)
+
+
+class WaypointEditor(QMainWindow):
+    """
+    The main window of the application. It consists of four tabs:
+    - Image: to display the image and the waypoints
+    - Settings: to configure the scale and the duration
+    - Waypoints: to display the waypoints as a table
+    - Export: to export the waypoints
+    """
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle('Waypoint Editor')
+        self.setGeometry(100, 100, 800, 600)
+
+        # The work that is postponed until the first frame has been drawn, and the time of each phase of the
+        # startup, which is only kept with --startup-timing
+        self.pending_startup = None
+        self.startup_timing = None
+
+        # The views that need to be recomputed and repainted in the next event loop iteration
+        self.stale = set()
+        self.refresh_pending = False
+        self.statistics = UpdateStatistics()
+        self.statistics_timer = QTimer(self)
+        self.statistics_timer.timeout.connect(lambda: self.statusBar().showMessage(self.statistics.report()))
+
+        # The robots on the stage, each with its own points and settings. The tabs render from the current one.
+        self.robots = {'Robot 1': Trajectory()}
+        self.robot = 'Robot 1'
+        self.trajectory = self.robots[self.robot]
+
+        # The obstacles on the stage for the robots that avoid them, this is shared by all robots
+        self.avoid = set()
+        self.planner = None
+        self.planner_key = None
+        self.pending_obstacles = None  # the painted obstacles of a project, until the stage has been loaded
+
+        # The stage image or template, the project file and the journal with the changes since it was saved
+        self.image_file = None
+        self.template = None
+        self.project_file = None
+        self.journal = None
+
+        # The playback of the waypoints, which runs on a worker thread and optionally streams to the robots
+        self.playback = None
+        self.playback_thread = None
+        self.playback_origins = {}
+        self.stream_urls = []
+        self.playback_timer = QTimer(self)
+        self.playback_timer.timeout.connect(lambda: self.invalidate('image'))
+
+        # The image that is being loaded on a worker thread, and all threads that did not finish yet
+        self.loader = None
+        self.loaders = []
+
+        # Create a central widget and set the layout
+        self.central_widget = QTabWidget()
+        self.setCentralWidget(self.central_widget)
+
+        # Create the tabs
+        self.settings_tab = SettingsTab(self)
+        self.waypoints_tab = LazyTab(lambda: self.create_tab('waypoints', WaypointsTab))
+        self.image_tab = ImageTab(self)
+        self.export_tab = LazyTab(lambda: self.create_tab('export', ExportTab))
+    
+        # Add the tabs to the central widget
+        self.central_widget.addTab(self.image_tab, "Image")
+        self.central_widget.addTab(self.settings_tab, "Settings")
+        self.central_widget.addTab(self.waypoints_tab, "Waypoints")
+        self.central_widget.addTab(self.export_tab, "Waypoints as CSV")
+        self.central_widget.setCurrentIndex(0)
+
+        # Create a menu bar
+        self.menu_bar = self.menuBar()
+
+        # Create a "File", "Edit", "Robot", "Playback" and "Help" menu
+        file_menu = self.menu_bar.addMenu('File')
+        edit_menu = self.menu_bar.addMenu('Edit')
+        self.robot_menu = self.menu_bar.addMenu('Robot')
+        playback_menu = self.menu_bar.addMenu('Playback')
+        help_menu = self.menu_bar.addMenu('Help')
+
+        # Add a "New image" menu to the "File" menu, the templates are only added when it is first opened
+        self.new_menu = file_menu.addMenu('New image')
+        self.new_menu.aboutToShow.connect(self.update_new_menu)
+
+        # Add an "Open Image" action to the "File" menu
+        open_image = QAction('Open image', self)
+        open_image.triggered.connect(self.open_image)
+        file_menu.addAction(open_image)
+
+        # Add a "Cancel loading" action to the "File" menu, this is only enabled while an image is being loaded
+        self.cancel_action = QAction('Cancel loading', self)
+        self.cancel_action.triggered.connect(self.cancel_loading)
+        self.cancel_action.setEnabled(False)
+        file_menu.addAction(self.cancel_action)
+
+        # Add a "Close Image" action to the "File" menu
+        close_image = QAction('Close image', self)
+        close_image.triggered.connect(self.close_image)
+        file_menu.addAction(close_image)
+
+        # Add the "Open project", "Save project" and "Save project as" actions to the "File" menu
+        file_menu.addSeparator()
+        open_project = QAction('Open project...', self)
+        open_project.triggered.connect(self.open_project)
+        file_menu.addAction(open_project)
+        save_project = QAction('Save project', self)
+        save_project.setShortcut('Ctrl+S')
+        save_project.triggered.connect(self.save_project)
+        file_menu.addAction(save_project)
+        save_project_as = QAction('Save project as...', self)
+        save_project_as.triggered.connect(self.save_project_as)
+        file_menu.addAction(save_project_as)
+        file_menu.addSeparator()
+
+        # Add an "Import" action to the "File" menu
+        import_file = QAction('Import...', self)
+        import_file.triggered.connect(self.import_file)
+        file_menu.addAction(import_file)
+
+        # Add an "Export waypoints" action to the "File" menu
+        export_waypoints = QAction('Export waypoints', self)
+        export_waypoints.triggered.connect(self.export_waypoints)
+        file_menu.addAction(export_waypoints)
+
+        # Add a "Simplify path" action to the "Edit" menu
+        simplify_path = QAction('Simplify path...', self)
+        simplify_path.triggered.connect(lambda: self.simplify_path())
+        edit_menu.addAction(simplify_path)
+
+        # Add a "Paint obstacles" toggle and a "Clear painted obstacles" action to the "Edit" menu
+        paint_obstacles = QAction('Paint obstacles', self, checkable=True)
+        paint_obstacles.toggled.connect(self.paint_obstacles)
+        edit_menu.addAction(paint_obstacles)
+        clear_obstacles = QAction('Clear painted obstacles', self)
+        clear_obstacles.triggered.connect(self.clear_obstacles)
+        edit_menu.addAction(clear_obstacles)
+
+        # The "Robot" menu lists the robots, it is filled when the robots change
+        self.update_robot_menu()
+
+        # Add a "Play" toggle, a "Loop" toggle and a "Stream to" action to the "Playback" menu
+        self.play_action = QAction('Play', self, checkable=True)
+        self.play_action.setShortcut('Ctrl+P')
+        self.play_action.toggled.connect(self.toggle_playback)
+        playback_menu.addAction(self.play_action)
+        self.loop_action = QAction('Loop', self, checkable=True)
+        playback_menu.addAction(self.loop_action)
+        stream_to = QAction('Stream to...', self)
+        stream_to.triggered.connect(self.stream_to)
+        playback_menu.addAction(stream_to)
+
+        # Add an "Help" action to the "Help" menu
+        show_help = QAction('Help', self)
+        show_help.triggered.connect(self.show_help)
+        help_menu.addAction(show_help)
+
+        # Add an "About" action to the "Help" menu
+        show_about = QAction('About', self)
+        show_about.triggered.connect(self.show_about)
+        help_menu.addAction(show_about) # on macOS this will be shown in the application menu
+
+        # Add a "Show update statistics" toggle to the "Help" menu
+        show_statistics = QAction('Show update statistics', self, checkable=True)
+        show_statistics.toggled.connect(self.show_statistics)
+        help_menu.addAction(show_statistics)
+
+        # Add a "Log paint and recompute times" toggle to the "Help" menu, this is on when profiling at startup
+        log_times = QAction('Log paint and recompute times', self, checkable=True)
+        log_times.setChecked(self.statistics.profiling)
+        log_times.toggled.connect(self.log_times)
+        help_menu.addAction(log_times)
+
+    def update_new_menu(self):
+        """
+        Add the template sizes and the custom size to the "New image" menu, with a separator after each width
+        """
+        if not self.new_menu.isEmpty():
+            return
+        for i, (width, depth) in enumerate(TEMPLATES):
+            if i and width != TEMPLATES[i - 1][0]:
+                self.new_menu.addSeparator()
+            self.new_menu.addAction(f'{width}x{depth} meter').triggered.connect(lambda checked, width=width, depth=depth: self.new_image(width, depth))
+        self.new_menu.addSeparator()
+        self.new_menu.addAction("Custom size...").triggered.connect(self.new_custom_image)
+
+    def update_robot_menu(self):
+        self.robot_menu.clear()
+        self.robot_menu.addAction('New robot...').triggered.connect(self.new_robot)
+        self.robot_menu.addAction('Rename robot...').triggered.connect(self.rename_robot)
+        remove_robot = self.robot_menu.addAction('Remove robot')
+        remove_robot.triggered.connect(self.remove_robot)
+        remove_robot.setEnabled(len(self.robots) > 1)
+        self.robot_menu.addSeparator()
+        group = QActionGroup(self.robot_menu)
+        for name in self.robots:
+            action = self.robot_menu.addAction(name)
+            action.setCheckable(True)
+            action.setChecked(name == self.robot)
+            action.triggered.connect(lambda checked, name=name: self.select_robot(name))
+            group.addAction(action)
+        self.robot_menu.addSeparator()
+        # The triggered signal passes the checked state, which should not be taken as the clearance
+        self.robot_menu.addAction('Check collisions...').triggered.connect(lambda: self.check_collisions())
+
+    def select_robot(self, name):
+        """
+        Make the robot the current one, the settings tab then shows its duration and rotation
+        """
+        if name != self.robot:
+            self.record('select_robot', name)
+        self.robot = name
+        self.trajectory = self.robots[name]
+        self.image_tab.selected = self.image_tab.hover = self.image_tab.dragging = None
+        self.settings_tab.load(self.trajectory)
+        self.setWindowTitle(f'Waypoint Editor - {name}')
+        self.update_robot_menu()
+        self.invalidate()
+
+    def robot_name(self, title, text=''):
+        name, ok = QInputDialog.getText(self, title, 'Name of the robot:', text=text)
+        name = name.strip()
+        if not ok or not name:
+            return None
+        if name in self.robots:
+            QMessageBox.warning(self, title, f'There is already a robot "{name}"')
+            return None
+        return name
+
+    def new_robot(self, name=None):
+        if not name:
+            number = len(self.robots) + 1
+            while f'Robot {number}' in self.robots:
+                number += 1
+            name = self.robot_name('New Robot', f'Robot {number}')
+            if not name:
+                return
+        # The scale belongs to the stage, it is the same for all robots
+        self.robots[name] = Trajectory(pixels_per_meter=self.trajectory.pixels_per_meter)
+        self.record('new_robot', name)
+        self.robot = name
+        self.select_robot(name)
+
+    def rename_robot(self, name=None):
+        name = name or self.robot_name('Rename Robot', self.robot)
+        if name:
+            self.robots = {name if key == self.robot else key: value for key, value in self.robots.items()}
+            self.avoid = {name if key == self.robot else key for key in self.avoid}
+            self.record('rename_robot', self.robot, name)
+            self.robot = name
+            self.select_robot(name)
+
+    def remove_robot(self):
+        if len(self.robots) > 1:
+            del self.robots[self.robot]
+            self.avoid.discard(self.robot)
+            self.record('remove_robot', self.robot)
+            self.robot = next(iter(self.robots))
+            self.select_robot(self.robot)
+
+    def check_collisions(self, clearance=None):
+        if not self.trajectory.has_scale:
+            QMessageBox.warning(self, 'Check Collisions', 'The scale (pixels per meter) should be specified first')
+            return
+        if clearance is None:
+            clearance, ok = QInputDialog.getDouble(self, 'Check Collisions', 'Clearance (meter):', 0.5, 0.01, 100, 2)
+            if not ok:
+                return
+        start = time.perf_counter()
+        names = [name for name, trajectory in self.robots.items() if trajectory.is_valid()]
+        try:
+            conflicts = find_conflicts(names, [self.robots[name].timeline() for name in names], clearance)
+        except ValueError as error:
+            QMessageBox.warning(self, 'Check Collisions', str(error))
+            return
+        self.statusBar().showMessage(f'Checked {len(names)} robots in {time.perf_counter() - start:.2f} s, found {len(conflicts)} conflicts')
+        if conflicts:
+            lines = [f'{c.first} and {c.second} from {c.start:.1f} to {c.stop:.1f} s, closest {c.distance:.2f} m' for c in conflicts[:20]]
+            if len(conflicts) > 20:
+                lines.append(f'and {len(conflicts) - 20} more')
+            QMessageBox.warning(self, 'Check Collisions', 'The robots come closer than the clearance:\n\n' + '\n'.join(lines))
+        else:
+            QMessageBox.information(self, 'Check Collisions', f'The robots stay at least {clearance} m apart')
+        return conflicts
+
+    def update_planner(self):
+        """
+        Make the occupancy grid of the stage when the image or the scale changed, the painted obstacles are kept
+        """
+        image_tab = self.image_tab
+        pixels_per_meter = self.trajectory.pixels_per_meter
+        key = (id(image_tab.pyramid or image_tab.grid), pixels_per_meter)
+        if key == self.planner_key:
+            return
+        self.planner_key = key
+        planner = self.planner
+        if image_tab.stage is None or not pixels_per_meter > 0:
+            self.planner = None
+        else:
+            self.planner = Planner(image_tab.stage.width(), image_tab.stage.height(), pixels_per_meter)
+            if image_tab.pyramid:
+                self.planner.image = occupancy_grid(grayscale(image_tab.pyramid, self.planner.shape), self.planner.shape)
+            if planner is not None and (planner.width, planner.depth) == (self.planner.width, self.planner.depth):
+                self.planner.copy_painted(planner)
+            if self.pending_obstacles is not None:
+                painted, strokes = self.pending_obstacles
+                if painted is not None and painted.shape == self.planner.shape:
+                    self.planner.painted[:] = painted
+                for stroke in strokes:
+                    self.planner.paint(*stroke)
+                self.planner.changed()
+                self.pending_obstacles = None
+        for name, trajectory in self.robots.items():
+            trajectory.planner = self.planner if name in self.avoid else None
+
+    def paint_obstacles(self, checked):
+        self.update_planner()
+        self.image_tab.painting = checked
+        self.invalidate('image')
+
+    def clear_obstacles(self):
+        if self.planner is not None:
+            self.planner.clear_painted()
+            self.record('clear_painted')
+            self.invalidate()
+
+    def close_image(self):
+        self.cancel_loading()
+        self.image_tab.set_image(None)
+        self.image_file = self.template = None
+        for trajectory in self.robots.values():
+            trajectory.clear()
+        self.record('close')
+        self.update_planner()
+        self.invalidate()
+
+    def new_image(self, x, y):
+        """
+        Start with an empty template stage of x by y meter, the grid lines are drawn without a bitmap
+        """
+        resolution = StageGrid.RESOLUTION
+        self.settings_tab.pixels_per_meter.setText(f'{resolution}')
+        self.settings_changed()
+        self.cancel_loading()
+        self.image_tab.set_grid(StageGrid(x, y, resolution))
+        self.image_file, self.template = None, [x, y]
+        self.record('template', x, y)
+        self.update_planner()
+        self.invalidate()
+
+    def new_custom_image(self):
+        text, ok = QInputDialog.getText(self, 'New Image', 'Stage width x depth (meter):', text='20x15')
+        if ok:
+            try:
+                x, y = [float(value) for value in text.lower().split('x')]
+                # The stage should be at least one pixel wide and deep at the scale of the templates
+                if not (math.isfinite(x) and math.isfinite(y) and round(x * StageGrid.RESOLUTION) >= 1 and round(y * StageGrid.RESOLUTION) >= 1):
+                    raise ValueError
+            except ValueError:
+                QMessageBox.warning(self, 'New Image', f'Invalid stage size "{text}"')
+                return
+            self.new_image(x, y)
+
+    def open_image(self, file_name=None):
+        if not file_name:
+            # Open a file dialog to select an image file
+            file_name, _ = QFileDialog.getOpenFileName(self, 'Open Image File', '', 'Images (*.png *.jpg *.jpeg *.bmp)')
+        if file_name:
+            # Load the image on a worker thread, this replaces an image that is still being loaded
+            self.cancel_loading()
+            self.image_file, self.template = os.path.abspath(file_name), None
+            self.record('image', self.image_file)
+            loader = ImageLoader(file_name, self.image_tab.size() * self.image_tab.devicePixelRatioF())
+            loader.preview.connect(lambda pyramid: self.image_loaded(loader, pyramid))
+            loader.loaded.connect(lambda pyramid, statistics: self.image_loaded(loader, pyramid, statistics))
+            loader.failed.connect(lambda error: self.image_failed(loader, error))
+            loader.finished.connect(lambda: self.loaders.remove(loader))
+            self.loaders.append(loader)
+            self.loader = loader
+            self.cancel_action.setEnabled(True)
+            self.statusBar().showMessage(f'Loading {os.path.basename(file_name)} ...')
+            loader.start()
+
+    def image_loaded(self, loader, pyramid, statistics=None):
+        if loader is not self.loader:
+            return  # the loading was cancelled or replaced
+        self.image_tab.set_image(pyramid)
+        self.update_planner()
+        self.invalidate()
+        if statistics is not None:
+            self.loader = None
+            self.cancel_action.setEnabled(False)
+            stage = self.image_tab.stage
+            message = f'Loaded {os.path.basename(loader.file_name)} ({stage.width()}x{stage.height()}) in {statistics["time"]:.2f} s, image memory {statistics["memory"] / 2**20:.0f} MB'
+            if statistics['peak'] is not None:
+                message += f', peak memory {statistics["peak"] / 2**20:.0f} MB'
+            self.statusBar().showMessage(message)
+
+    def image_failed(self, loader, error):
+        if loader is not self.loader:
+            return
+        self.loader = None
+        self.cancel_action.setEnabled(False)
+        self.statusBar().showMessage(f'Could not load {os.path.basename(loader.file_name)}: {error}')
+
+    def cancel_loading(self):
+        if self.loader is not None:
+            self.loader.requestInterruption()
+            self.loader = None
+            self.cancel_action.setEnabled(False)
+            self.statusBar().showMessage('Loading cancelled')
+
+    def export_waypoints(self, file_name=None):
+        if not file_name:
+            # Open a file dialog to select the output file, the format follows from the extension
+            file_name, _ = QFileDialog.getSaveFileName(self, 'Export Waypoints', '', 'CSV files (*.csv);;Binary files (*.bin)')
+        if file_name:
+            # The waypoints are optionally resampled at a fixed rate, these are streamed to the file
+            rate = self.settings_tab.output_rate.text()
+            rate = float(rate) if isvalid(rate) else None
+            waypoints = self.trajectory.waypoints()
+            if rate:
+                waypoints = resample(waypoints, rate)
+            try:
+                if file_name.lower().endswith('.bin'):
+                    write_binary(file_name, waypoints)
+                else:
+                    write_csv(file_name, waypoints, time_decimals(rate))
+            except OSError as error:
+                QMessageBox.warning(self, 'Export Waypoints', f'Could not export "{file_name}": {error}')
+
+    def import_file(self, file_name=None):
+        """
+        Import exported waypoints (CSV or binary) into the current robot, keeping the time and angle of each
+        waypoint, or import the tracks of a GPX file or the polylines of an SVG file, each as another robot
+        """
+        if not file_name:
+            file_name, _ = QFileDialog.getOpenFileName(self, 'Import', '', 'Waypoints and paths (*.csv *.bin *.gpx *.svg)')
+        if not file_name:
+            return
+        from waypointeditor.importer import read_gpx, read_svg
+        extension = os.path.splitext(file_name)[1].lower()
+        pixels_per_meter = self.trajectory.pixels_per_meter
+        if extension != '.svg' and not pixels_per_meter > 0:
+            QMessageBox.warning(self, 'Import', 'The scale (pixels per meter) should be specified first')
+            return
+        # The stage coordinates are relative to the first point, which is kept or otherwise placed in the middle
+        if len(self.trajectory):
+            origin = tuple(self.trajectory.points[0])
+        elif self.image_tab.stage is not None:
+            origin = (self.image_tab.stage.width() / 2, self.image_tab.stage.height() / 2)
+        else:
+            origin = (0, 0)
+        try:
+            if extension == '.gpx':
+                paths = [(name, numpy.column_stack([origin[0] + points[:, 0] * pixels_per_meter, origin[1] - points[:, 1] * pixels_per_meter]), times, None) for name, points, times in read_gpx(file_name)]
+            elif extension == '.svg':
+                paths = [(name, points, times, None) for name, points, times in read_svg(file_name)]
+            else:
+                waypoints = read_waypoints(file_name)
+                paths = [(self.robot, points_from_waypoints(waypoints, origin, pixels_per_meter), waypoints[:, 0], waypoints[:, 3])]
+        except (OSError, ValueError, SyntaxError) as error:
+            QMessageBox.warning(self, 'Import', f'Could not import "{file_name}": {error}')
+            return
+        if not paths:
+            QMessageBox.warning(self, 'Import', f'"{file_name}" does not contain any paths')
+            return
+
+        for i, (name, points, times, angles) in enumerate(paths):
+            # The first path replaces the points of the current robot if there are none, or if these are waypoints
+            if i > 0 or (len(self.trajectory) and extension in ('.gpx', '.svg')):
+                unique = name
+                number = 2
+                while unique in self.robots:
+                    unique, number = f'{name} {number}', number + 1
+                self.new_robot(unique)
+            self.trajectory.replace(points, times, angles)
+            self.record('edit', self.robot, 'replace', points, times, angles)
+            if times is not None:
+                self.settings_tab.total_duration.setText(f'{times[-1]:g}')
+                self.settings_changed()
+        self.image_tab.selected = self.image_tab.hover = self.image_tab.dragging = None
+        self.invalidate()
+        self.statusBar().showMessage(f'Imported {sum(len(points) for name, points, times, angles in paths)} points from {os.path.basename(file_name)}')
+
+    def simplify_path(self, tolerance=None):
+        if not self.trajectory.has_scale:
+            QMessageBox.warning(self, 'Simplify Path', 'The scale (pixels per meter) should be specified first')
+            return
+        if tolerance is None:
+            tolerance, ok = QInputDialog.getDouble(self, 'Simplify Path', 'Tolerance (meter):', 0.01, 0, 10, 3)
+            if not ok:
+                return
+        before, after, deviation = self.trajectory.simplify(tolerance)
+        self.record('edit', self.robot, 'simplify', tolerance)
+        image_tab = self.image_tab
+        image_tab.selected = image_tab.hover = image_tab.dragging = None
+        self.invalidate()
+        self.statusBar().showMessage(f'Simplified the path from {before} to {after} points, maximum deviation {deviation:.3f} m')
+
+    def toggle_playback(self, checked):
+        """
+        Start or stop the playback of the waypoints of all robots, at the export rate if that is specified
+        """
+        if not checked:
+            if self.playback is not None:
+                self.playback.stop()
+            return
+        if self.playback is not None:
+            return  # the previous playback did not finish yet
+        # The playback is only imported when it is used, since asyncio takes a relatively long time to import
+        from waypointeditor.playback import RATE, Playback
+        robots = {name: trajectory.waypoints() for name, trajectory in self.robots.items() if trajectory.is_valid()}
+        if not robots:
+            QMessageBox.warning(self, 'Play', 'There are no waypoints to play, the points and the scale should be specified first')
+            self.play_action.setChecked(False)
+            return
+        rate = self.settings_tab.output_rate.text()
+        rate = float(rate) if isvalid(rate) else RATE
+        self.playback = Playback(robots, rate, loop=self.loop_action.isChecked())
+        self.playback_origins = {name: (self.robots[name].points[0], self.robots[name].pixels_per_meter) for name in robots}
+        self.playback_thread = PlaybackThread(self.playback, list(self.stream_urls))
+        self.playback_thread.failed.connect(lambda error: QMessageBox.warning(self, 'Play', f'Could not stream the waypoints: {error}'))
+        self.playback_thread.finished.connect(self.playback_finished)
+        self.playback_thread.start()
+        self.playback_timer.start(33)  # the robots are drawn at about 30 frames per second
+
+    def playback_finished(self):
+        self.playback_timer.stop()
+        self.statusBar().showMessage(self.playback.report())
+        self.playback = self.playback_thread = None
+        self.play_action.blockSignals(True)
+        self.play_action.setChecked(False)
+        self.play_action.blockSignals(False)
+        self.invalidate('image')
+
+    def stream_to(self):
+        text, ok = QInputDialog.getText(self, 'Stream To', 'Stream the setpoints to (udp://host:port, osc://host:port or mqtt://host:port/topic, separated by spaces):', text=' '.join(self.stream_urls))
+        if ok:
+            from waypointeditor.playback import create_sender
+            try:
+                for url in text.split():
+                    create_sender(url)
+            except ValueError as error:
+                QMessageBox.warning(self, 'Stream To', str(error))
+                return
+            self.stream_urls = text.split()
+
+    def record(self, operation, *args):
+        """
+        Write a change to the journal, so that it can be recovered when the editor is closed without saving
+        """
+        if self.journal is not None:
+            self.journal.record(operation, *args)
+
+    def start_journal(self, file_name):
+        """
+        Start a new journal with the current state, the changes are recorded on top of that
+        """
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = project.Journal(file_name)
+        self.journal.reset()
+        if self.project_file is None:
+            # Without a project file the journal starts from scratch, it contains everything to recover the state
+            self.journal.snapshot(self.snapshot())
+
+    def snapshot(self):
+        """
+        Return the changes that recreate the current state from an empty project
+        """
+        if self.image_file:
+            yield 'image', self.image_file
+        elif self.template:
+            yield ('template', *self.template)
+        for name, trajectory in self.robots.items():
+            yield 'new_robot', name
+            settings = {key: getattr(trajectory, key) for key in project.SETTINGS}
+            yield 'settings', name, dict(settings, pixels_per_meter=trajectory.pixels_per_meter, avoid_obstacles=name in self.avoid)
+            if trajectory.has_timing:
+                # The imported waypoints keep their time and angle
+                yield ('edit', name, 'replace', trajectory.as_array(), *trajectory.timing())
+            else:
+                for x, y in trajectory.points.tolist():
+                    yield 'edit', name, 'append', x, y
+        if self.pending_obstacles is not None:
+            # The image of the project is still being loaded, the obstacles are not on the stage yet
+            painted, strokes = self.pending_obstacles
+            cell = self.trajectory.pixels_per_meter * CELL_SIZE
+        elif self.planner is not None:
+            painted, strokes, cell = self.planner.painted, [], self.planner.cell
+        else:
+            painted, strokes = None, []
+        if painted is not None:
+            for row, col in zip(*numpy.nonzero(painted)):
+                yield 'paint', (col + 0.5) * cell, (row + 0.5) * cell, 0, bool(painted[row, col] > 0)
+        for stroke in strokes:
+            yield ('paint', *stroke)
+        yield 'select_robot', self.robot
+
+    def project(self):
+        """
+        Return the current state as a project, without the graphical user interface
+        """
+        result = project.Project()
+        result.image, result.template = self.image_file, self.template
+        result.pixels_per_meter = self.trajectory.pixels_per_meter
+        result.robots = dict(self.robots)
+        result.avoid = set(self.avoid)
+        result.robot = self.robot
+        result.painted = self.planner.painted if self.planner is not None else None
+        return result
+
+    def load_project(self, loaded):
+        """
+        Replace the current state with the project
+        """
+        journal, self.journal = self.journal, None  # the changes while loading are not recorded
+        self.robots = dict(loaded.robots) or {'Robot 1': Trajectory(pixels_per_meter=loaded.pixels_per_meter)}
+        self.robot = loaded.robot if loaded.robot in self.robots else next(iter(self.robots))
+        self.trajectory = self.robots[self.robot]
+        self.avoid = set(loaded.avoid) & set(self.robots)
+        self.planner = self.planner_key = None
+        self.pending_obstacles = (loaded.painted, loaded.strokes)
+        self.settings_tab.pixels_per_meter.setText(f'{loaded.pixels_per_meter:g}')
+        if loaded.image:
+            # The obstacles are applied when the image has been loaded
+            self.image_tab.set_image(None)
+            self.open_image(loaded.image)
+        elif loaded.template:
+            self.cancel_loading()
+            self.image_tab.set_grid(StageGrid(*loaded.template, loaded.pixels_per_meter))
+            self.image_file, self.template = None, list(loaded.template)
+        else:
+            self.cancel_loading()
+            self.image_tab.set_image(None)
+            self.image_file = self.template = None
+        self.image_tab.selected = self.image_tab.hover = self.image_tab.dragging = None
+        self.update_planner()
+        self.update_robot_menu()
+        self.select_robot(self.robot)
+        self.journal = journal
+
+    def open_project(self, file_name=None):
+        if not file_name:
+            file_name, _ = QFileDialog.getOpenFileName(self, 'Open Project', '', 'Projects (*.wpe)')
+        if file_name:
+            try:
+                loaded = project.load(file_name)
+                if os.path.exists(file_name + project.JOURNAL):
+                    # Recover the changes that were not saved
+                    loaded = project.replay(file_name + project.JOURNAL, loaded)
+            except (OSError, ValueError, KeyError) as error:
+                QMessageBox.warning(self, 'Open Project', f'Could not open "{file_name}": {error}')
+                return
+            self.project_file = file_name
+            self.load_project(loaded)
+            # The changes are recorded next to the project file, after the changes that were recovered from it
+            if self.journal is not None:
+                self.journal.close()
+            project.Journal(AUTOSAVE).reset()
+            self.journal = project.Journal(file_name + project.JOURNAL)
+            self.statusBar().showMessage(f'Opened {os.path.basename(file_name)}')
+
+    def save_project(self, file_name=None):
+        file_name = file_name or self.project_file
+        if not file_name:
+            self.save_project_as()
+            return
+        try:
+            project.save(file_name, self.project())
+        except OSError as error:
+            QMessageBox.warning(self, 'Save Project', f'Could not save "{file_name}": {error}')
+            return
+        # The changes after this are recorded next to the project file, the autosave journal is not needed anymore
+        self.project_file = file_name
+        self.start_journal(file_name + project.JOURNAL)
+        project.Journal(AUTOSAVE).reset()
+        self.statusBar().showMessage(f'Saved {os.path.basename(file_name)}')
+
+    def save_project_as(self):
+        file_name, _ = QFileDialog.getSaveFileName(self, 'Save Project', '', 'Projects (*.wpe)')
+        if file_name:
+            if not file_name.lower().endswith('.wpe'):
+                file_name += '.wpe'
+            self.save_project(file_name)
+
+    def closeEvent(self, event):
+        # Wait for the worker threads, an image that is being decoded cannot be interrupted
+        self.cancel_loading()
+        if self.playback is not None:
+            self.playback.stop()
+            self.playback_thread.wait()
+        for loader in self.loaders:
+            loader.wait()
+        super().closeEvent(event)
+
+    def show_help(self):
+        # Create and show the help dialog
+        help_dialog = HelpDialog(self)
+        help_dialog.exec_()
+
+    def show_about(self):
+        # Create and show the help dialog
+        about_dialog = AboutDialog(self)
+        about_dialog.exec_()
+
+    def show_statistics(self, checked):
+        # The timer only runs while the statistics are shown, so that it does not keep the application busy
+        self.statistics.report()
+        if checked:
+            self.statistics_timer.start(1000)
+        else:
+            self.statistics_timer.stop()
+            self.statusBar().clearMessage()
+
+    def log_times(self, checked):
+        self.statistics.profiling = checked
+
+    def settings_changed(self):
+        """
+        Copy the settings to the current robot, the scale is the same for all robots
+        """
+        text = self.settings_tab.pixels_per_meter.text()
+        for trajectory in self.robots.values():
+            trajectory.pixels_per_meter = float(text) if isvalid(text) else 0
+        text = self.settings_tab.total_duration.text()
+        self.trajectory.total_duration = float(text) if isvalid(text) else 0
+        text = self.settings_tab.total_rotation.text()
+        self.trajectory.total_rotation = float(text) if isvalid(text) else 0
+        text = self.settings_tab.max_speed.text()
+        self.trajectory.max_speed = float(text) if isvalid(text) else 0
+        text = self.settings_tab.max_acceleration.text()
+        self.trajectory.max_acceleration = float(text) if isvalid(text) else 0
+        text = self.settings_tab.max_angular_speed.text()
+        self.trajectory.max_angular_speed = float(text) if isvalid(text) else 0
+        self.trajectory.smooth = self.settings_tab.smooth.isChecked()
+        text = self.settings_tab.robot_radius.text()
+        self.trajectory.radius = float(text) if isvalid(text) else 0
+        self.update_planner()
+        if self.settings_tab.avoid_obstacles.isChecked():
+            self.avoid.add(self.robot)
+        else:
+            self.avoid.discard(self.robot)
+        self.trajectory.planner = self.planner if self.robot in self.avoid else None
+        settings = {key: getattr(self.trajectory, key) for key in project.SETTINGS}
+        self.record('settings', self.robot, dict(settings, pixels_per_meter=self.trajectory.pixels_per_meter, avoid_obstacles=self.robot in self.avoid))
+        # The smooth path is drawn on the image
+        self.invalidate('settings', 'waypoints', 'export', 'image')
+
+    def mark(self, phase):
+        if self.startup_timing is not None:
+            self.startup_timing.append((phase, time.perf_counter()))
+
+    def after_first_frame(self, function):
+        """
+        Call the function once the first frame has been drawn, or after a second if the window is not exposed
+        """
+        self.pending_startup = function
+        QTimer.singleShot(1000, self.first_frame)
+
+    def first_frame(self):
+        if self.pending_startup is None:
+            return
+        function, self.pending_startup = self.pending_startup, None
+        self.mark('first frame')
+        QTimer.singleShot(0, function)  # the frame reaches the screen before the function is called
+
+    def startup(self):
+        """
+        The work at startup that is not needed for the first frame: the default stage and the autosave journal
+        """
+        self.new_image(*DEFAULT_TEMPLATE)
+        if self.startup_timing is not None:
+            self.image_tab.repaint()
+            self.mark('stage ready')
+            started = self.startup_timing[0][1]
+            print(', '.join(f'{phase} {1000 * (moment - started):.0f} ms' for phase, moment in self.startup_timing[1:]), file=sys.stderr, flush=True)
+
+        journal = project.Journal(AUTOSAVE)
+        if journal.has_changes():
+            # The editor was closed without saving the changes, these are recovered from the autosave journal
+            answer = QMessageBox.question(self, 'Recover', 'The last session was not saved. Do you want to recover the changes?')
+            if answer == QMessageBox.Yes:
+                try:
+                    self.load_project(project.replay(AUTOSAVE))
+                except (KeyError, ValueError, TypeError) as error:
+                    QMessageBox.warning(self, 'Recover', f'Could not recover the changes: {error}')
+        self.start_journal(AUTOSAVE)
+
+    def create_tab(self, view, cls):
+        """
+        Create a tab when it is first shown, it is then filled in the next event loop iteration
+        """
+        self.invalidate(view)
+        return cls(self)
+
+    def invalidate(self, *views):
+        """
+        Mark the specified views (or all views) as stale. Multiple changes in the same event loop iteration
+        are combined, and each stale view is recomputed and repainted only once in the next iteration.
+        """
+        self.stale.update(views or VIEWS)
+        if not self.refresh_pending:
+            self.refresh_pending = True
+            QTimer.singleShot(0, self.refresh)
+
+    def refresh(self):
+        """
+        Recompute and repaint the views that have been marked as stale
+        """
+        stale, self.stale = self.stale, set()
+        self.refresh_pending = False
+        for view, tab in (('settings', self.settings_tab), ('waypoints', self.waypoints_tab.tab), ('export', self.export_tab.tab)):
+            if view in stale and tab is not None:
+                with self.statistics.timer(f'{view} recompute'):
+                    tab.refresh()
+        if 'image' in stale:
+            self.image_tab.update()
+
+
+def main(started=None):
+    """
+    The main entry point for the application when started as the script created by the pip installer. With
+    --startup-timing the time from the start of the imports to each phase of the startup is reported.
+    """
+    timing = [('start', started or STARTED), ('imports', time.perf_counter())] if '--startup-timing' in sys.argv else None
+    app = QApplication([arg for arg in sys.argv if arg != '--startup-timing'])
+    app.setApplicationName("Waypoint Editor")
+    viewer = WaypointEditor()
+    viewer.startup_timing = timing
+    viewer.mark('window')
+    # Show the window first, the default stage of 4x3 meters and the autosave journal follow after the first frame
+    viewer.after_first_frame(viewer.startup)
+    viewer.show()
+    sys.exit(app.exec_())
+
+
+if __name__ == '__main__':
+    """
+    The main entry point for the application when started from the command line.
+    """
+    main()
@@ -0,0 +1,167 @@
+"""
+Import of paths from other programs into the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import re
+import math
+import collections
+import datetime
+import xml.etree.ElementTree as ElementTree
+import numpy as np
+
+# A path that was read from a file, with the (N,2) points and the (N,) times in seconds or None
+Path = collections.namedtuple('Path', ['name', 'points', 'times'])
+
+# The mean radius of the earth in meter
+EARTH_RADIUS = 6371008.8
+
+# The commands and the number of values of each command in the path data of an SVG file
+SVG_COMMANDS = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'C': 6, 'S': 4, 'Q': 4, 'T': 2, 'A': 7, 'Z': 0}
+SVG_TOKEN = re.compile(r'[MmLlHhVvCcSsQqTtAaZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+
+def local_name(tag):
+    # Remove the XML namespace from the tag
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_time(text):
+    """
+    Parse an ISO 8601 time as used in GPX files, this returns the seconds since the epoch
+    """
+    text = text.strip().replace('Z', '+00:00')
+    return datetime.datetime.fromisoformat(text).timestamp()
+
+
+def read_gpx(file_name):
+    """
+    Read the tracks and routes from a GPX file. This returns a list of paths with the points in meter, east
+    and north relative to the first point of each path. The times are in seconds from the first point, or None
+    when not all points have a time.
+
+    The file is parsed incrementally and each point is discarded after it has been read, so that large tracks
+    do not have to be held in memory as a tree. The positions are projected onto a plane that touches the earth
+    at the first point, which is accurate to a fraction of a millimeter over the size of a stage.
+    """
+    paths = []
+    name, latitude, longitude, times = None, [], [], []
+    default = os.path.splitext(os.path.basename(file_name))[0]
+    for event, element in ElementTree.iterparse(file_name, events=('start', 'end')):
+        tag = local_name(element.tag)
+        if event == 'start':
+            if tag in ('trkseg', 'rte'):
+                latitude, longitude, times = [], [], []
+            if tag in ('trk', 'rte'):
+                name = None
+            continue
+        if tag == 'name' and name is None:
+            name = (element.text or '').strip() or None
+        elif tag in ('trkpt', 'rtept'):
+            latitude.append(float(element.get('lat')))
+            longitude.append(float(element.get('lon')))
+            time = next((child.text for child in element if local_name(child.tag) == 'time'), None)
+            times.append(parse_time(time) if time else None)
+            element.clear()
+        elif tag in ('trkseg', 'rte') and latitude:
+            lat, lon = np.radians(latitude), np.radians(longitude)
+            points = np.zeros((len(lat), 2))
+            points[:, 0] = (lon - lon[0]) * math.cos(lat[0]) * EARTH_RADIUS
+            points[:, 1] = (lat - lat[0]) * EARTH_RADIUS
+            times = np.array(times, dtype=float) - times[0] if None not in times else None
+            paths.append(Path(name or f'{default} {len(paths) + 1}', points, times))
+            latitude, longitude, times = [], [], []
+    return paths
+
+
+def parse_svg_path(data):
+    """
+    Parse the path data of an SVG path element into a list of (N,2) arrays, one per subpath. The curves are
+    replaced by straight lines between their end points.
+    """
+    tokens = SVG_TOKEN.findall(data)
+    subpaths = []
+    points = []
+    x = y = 0.0
+    start = (0.0, 0.0)
+    command = None
+    i = 0
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+            if command in 'Zz':
+                if points:
+                    points.append(start)
+                    x, y = start
+                continue
+        elif command is None:
+            raise ValueError('the path data should start with a command')
+        count = SVG_COMMANDS[command.upper()]
+        values = [float(value) for value in tokens[i:i + count]]
+        if len(values) < count:
+            raise ValueError(f'the command "{command}" has too few values')
+        i += count
+        relative = command.islower()
+        if command in 'Hh':
+            x = values[0] + (x if relative else 0)
+        elif command in 'Vv':
+            y = values[0] + (y if relative else 0)
+        else:
+            x, y = values[-2] + (x if relative else 0), values[-1] + (y if relative else 0)
+        if command in 'Mm':
+            if len(points) > 1:
+                subpaths.append(np.array(points))
+            points = [(x, y)]
+            start = (x, y)
+            command = 'l' if relative else 'L'  # the values after a move are lines
+        else:
+            points.append((x, y))
+    if len(points) > 1:
+        subpaths.append(np.array(points))
+    return subpaths
+
+
+def read_svg(file_name):
+    """
+    Read the polylines, polygons, lines and paths from an SVG file. This returns a list of paths with the points
+    in the units of the SVG file, which are taken as image pixels. Transforms are not applied.
+    """
+    paths = []
+    default = os.path.splitext(os.path.basename(file_name))[0]
+    for event, element in ElementTree.iterparse(file_name, events=('end',)):
+        tag = local_name(element.tag)
+        if tag in ('polyline', 'polygon'):
+            values = [float(value) for value in re.split(r'[\s,]+', element.get('points', '').strip()) if value]
+            points = np.array(values[:len(values) // 2 * 2]).reshape(-1, 2)
+            if tag == 'polygon' and len(points):
+                points = np.concatenate([points, points[:1]])
+            subpaths = [points]
+        elif tag == 'line':
+            subpaths = [np.array([[float(element.get(key, 0)) for key in ('x1', 'y1')], [float(element.get(key, 0)) for key in ('x2', 'y2')]])]
+        elif tag == 'path':
+            subpaths = parse_svg_path(element.get('d', ''))
+        else:
+            continue
+        name = element.get('id')
+        for points in subpaths:
+            if len(points) > 1:
+                paths.append(Path(name or f'{default} {len(paths) + 1}', points, None))
+                name = None  # the other subpaths get a number
+        element.clear()
+    return paths
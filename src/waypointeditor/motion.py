@@ -0,0 +1,117 @@
+"""
+Motion planning of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+
+# The largest number of samples along a single segment of the path
+MAX_SAMPLES = 256
+
+
+def unique_points(points):
+    """
+    Remove the points that are at the same position as the point before
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(np.diff(points, axis=0) != 0, axis=1)
+    return points[keep]
+
+
+def sample_path(points, spacing, smooth=False):
+    """
+    Sample a path with an (N,2) array of points at (approximately) the specified spacing. The path is either
+    the polyline through the points, or a centripetal Catmull-Rom spline that passes through all points and
+    that does not overshoot or form loops at sharp corners. Each segment is divided into at least two parts,
+    the original points are part of the samples.
+    """
+    points = unique_points(points)
+    if len(points) < 2:
+        return points
+    length = np.hypot(*np.diff(points, axis=0).T)
+    count = np.clip(np.ceil(length / spacing).astype(int), 2, MAX_SAMPLES)
+    segment = np.repeat(np.arange(len(points) - 1), count)
+    u = (np.arange(len(segment)) - np.repeat(np.cumsum(count) - count, count)) / count[segment]
+    u = u[:, np.newaxis]
+
+    if not smooth or len(points) < 3:
+        samples = points[segment] + u * (points[segment + 1] - points[segment])
+        return np.concatenate([samples, points[-1:]])
+
+    # Extend the path at both ends, segment k is then determined by the extended points k to k+3
+    p = np.concatenate([2 * points[:1] - points[1:2], points, 2 * points[-1:] - points[-2:-1]])
+    knots = np.zeros(len(p))
+    knots[1:] = np.cumsum(np.sqrt(np.hypot(*np.diff(p, axis=0).T)))
+    p0, p1, p2, p3 = (p[segment + j] for j in range(4))
+    t0, t1, t2, t3 = (knots[segment + j][:, np.newaxis] for j in range(4))
+    t = t1 + u * (t2 - t1)
+
+    # The Barry-Goldman pyramidal formulation, evaluated for all samples at once
+    a1 = ((t1 - t) * p0 + (t - t0) * p1) / (t1 - t0)
+    a2 = ((t2 - t) * p1 + (t - t1) * p2) / (t2 - t1)
+    a3 = ((t3 - t) * p2 + (t - t2) * p3) / (t3 - t2)
+    b1 = ((t2 - t) * a1 + (t - t0) * a2) / (t2 - t0)
+    b2 = ((t3 - t) * a2 + (t - t1) * a3) / (t3 - t1)
+    samples = ((t2 - t) * b1 + (t - t1) * b2) / (t2 - t1)
+    return np.concatenate([samples, points[-1:]])
+
+
+def curvature(path):
+    """
+    Return the curvature at each sample of the path, i.e., the change in heading per unit of length
+    """
+    path = np.asarray(path, dtype=float).reshape(-1, 2)
+    result = np.zeros(len(path))
+    if len(path) < 3:
+        return result
+    d = np.diff(path, axis=0)
+    ds = np.hypot(*d.T)
+    heading = np.arctan2(d[:, 1], d[:, 0])
+    turn = np.abs(np.angle(np.exp(1j * np.diff(heading))))
+    np.divide(2 * turn, ds[:-1] + ds[1:], out=result[1:-1], where=ds[:-1] + ds[1:] > 0)
+    return result
+
+
+def speed_profile(cumulative, speed_limit, max_acceleration):
+    """
+    Return the largest speed at each sample that respects the speed limit at every sample and the acceleration
+    limit between samples, starting and ending at rest. This is the time-optimal trapezoidal profile.
+
+    The forward pass v[i]^2 = min(limit[i]^2, v[i-1]^2 + 2*a*ds) is solved in closed form with a cumulative
+    minimum, and likewise the backward pass, so that the whole profile is computed without a Python loop.
+    """
+    s = np.asarray(cumulative, dtype=float)
+    limit = np.square(np.asarray(speed_limit, dtype=float))
+    if len(s) == 0:
+        return np.zeros(0)
+    limit[0] = limit[-1] = 0
+    twice = 2 * max_acceleration
+    forward = twice * s + np.minimum.accumulate(limit - twice * s)
+    backward = np.minimum.accumulate((limit + twice * s)[::-1])[::-1] - twice * s
+    return np.sqrt(np.maximum(np.minimum(forward, backward), 0))
+
+
+def travel_time(cumulative, speed):
+    """
+    Return the time at each sample, with a constant acceleration between the samples
+    """
+    ds = np.diff(cumulative)
+    v = speed[:-1] + speed[1:]
+    time = np.zeros(len(cumulative))
+    np.cumsum(np.divide(2 * ds, v, out=np.zeros(len(ds)), where=v > 0), out=time[1:])
+    return time
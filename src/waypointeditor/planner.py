@@ -0,0 +1,301 @@
+"""
+Obstacle-aware path planning of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import math
+import heapq
+import collections
+import numpy as np
+
+CELL_SIZE = 0.1      # the size of the cells of the occupancy grid in meter
+MAX_DISTANCE = 1.0   # the distance to the obstacles is only computed up to this distance in meter
+THRESHOLD = 128      # pixels that are darker than this are obstacles
+MAX_ROUTES = 4096    # the number of routes between two points that are cached
+COARSE_CELLS = 100   # the number of cells along the longest side of the coarse grid that is searched first
+
+# The neighbours of a cell with the cost of moving there
+NEIGHBOURS = [(-1, 0, 1), (1, 0, 1), (0, -1, 1), (0, 1, 1), (-1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (1, 1, math.sqrt(2))]
+
+
+def occupancy_grid(gray, shape, threshold=THRESHOLD):
+    """
+    Return a boolean array with the specified shape in which the cells are True that contain at least one pixel
+    of the grayscale image that is darker than the threshold. The cells are taken to cover the whole image, so
+    that thin walls are not lost when the image has a much higher resolution than the grid.
+    """
+    rows = np.floor(np.arange(shape[0]) * gray.shape[0] / shape[0]).astype(int)
+    cols = np.floor(np.arange(shape[1]) * gray.shape[1] / shape[1]).astype(int)
+    darkest = np.minimum.reduceat(np.minimum.reduceat(gray, rows, axis=0), cols, axis=1)
+    return darkest < threshold
+
+
+def distance_transform(occupied, max_distance):
+    """
+    Return the Euclidean distance in cells from each cell to the nearest occupied cell, up to the maximum
+    distance. The occupied cells are shifted over all offsets within the maximum distance, which takes
+    O(n * max_distance^2) time but only a few vectorized operations per offset.
+    """
+    rows, cols = occupied.shape
+    distance = np.full(occupied.shape, float(max_distance))
+    distance[occupied] = 0
+    if not np.any(occupied):
+        return distance
+    reach = int(math.ceil(max_distance))
+    for dr in range(-reach, reach + 1):
+        for dc in range(-reach, reach + 1):
+            d = math.hypot(dr, dc)
+            if d == 0 or d >= max_distance:
+                continue
+            # the cells of which the neighbour at this offset is occupied are at most this far away
+            source = occupied[max(0, dr):rows + min(0, dr), max(0, dc):cols + min(0, dc)]
+            target = distance[max(0, -dr):rows + min(0, -dr), max(0, -dc):cols + min(0, -dc)]
+            np.minimum(target, np.where(source, d, max_distance), out=target)
+    return distance
+
+
+def line_of_sight(free, a, b):
+    """
+    Check whether all cells along the straight line between two cells (row, column) are free
+    """
+    steps = int(2 * max(abs(b[0] - a[0]), abs(b[1] - a[1]))) + 1
+    fraction = np.linspace(0, 1, steps + 1)
+    rows = np.rint(a[0] + fraction * (b[0] - a[0])).astype(int)
+    cols = np.rint(a[1] + fraction * (b[1] - a[1])).astype(int)
+    return bool(np.all(free[rows, cols]))
+
+
+def astar(free, start, goal):
+    """
+    Return the list of cells (row, column) of the shortest 8-connected path between two free cells, or None if
+    the goal cannot be reached. Diagonal steps are not allowed to cut the corner of an occupied cell.
+
+    The grid is padded with occupied cells and the cells are numbered, so that the neighbours are found with
+    fixed offsets and without checking the bounds of the grid.
+    """
+    rows, cols = free.shape
+    width = cols + 2
+    padded = np.zeros((rows + 2, width), dtype=bool)
+    padded[1:-1, 1:-1] = free
+    cells = padded.ravel().tobytes()
+    start, goal = (start[0] + 1) * width + start[1] + 1, (goal[0] + 1) * width + goal[1] + 1
+    gr, gc = divmod(goal, width)
+    # The offset of each neighbour, the offsets of the cells of which the corner is cut, and the cost of the step
+    neighbours = [(dr * width + dc, dr * width, dc, math.hypot(dr, dc)) for dr, dc, step in NEIGHBOURS]
+    diagonal = math.sqrt(2) - 1
+
+    cost = {start: 0}
+    parent = {start: None}
+    heap = [(0, 0, start)]
+    while heap:
+        f, g, cell = heapq.heappop(heap)
+        if cell == goal:
+            path = []
+            while cell is not None:
+                r, c = divmod(cell, width)
+                path.append((r - 1, c - 1))
+                cell = parent[cell]
+            return path[::-1]
+        if g > cost[cell]:
+            continue  # this cell was already reached at a lower cost
+        for offset, row, col, step in neighbours:
+            neighbour = cell + offset
+            if not cells[neighbour] or (row and col and not (cells[cell + row] and cells[cell + col])):
+                continue
+            g_neighbour = g + step
+            if g_neighbour < cost.get(neighbour, math.inf):
+                cost[neighbour] = g_neighbour
+                parent[neighbour] = cell
+                dr, dc = divmod(neighbour, width)
+                dr, dc = abs(dr - gr), abs(dc - gc)
+                heapq.heappush(heap, (g_neighbour + max(dr, dc) + diagonal * min(dr, dc), g_neighbour, neighbour))
+    return None
+
+
+def coarse_astar(free, start, goal, size=COARSE_CELLS):
+    """
+    Return the cells of a short path between two free cells like astar(), but search a coarse grid first. The
+    fine grid is then only searched in a corridor along the coarse path, which is much faster on a large stage.
+    A coarse cell is free if all its cells are free, the whole grid is searched when there is no coarse path,
+    e.g., through a passage that is narrower than the coarse cells.
+    """
+    factor = math.ceil(max(free.shape) / size)
+    if factor > 1:
+        rows, cols = free.shape
+        blocks = np.minimum.reduceat(np.minimum.reduceat(free.astype(np.uint8), np.arange(0, rows, factor), axis=0), np.arange(0, cols, factor), axis=1) > 0
+        blocks[start[0] // factor, start[1] // factor] = blocks[goal[0] // factor, goal[1] // factor] = True
+        path = astar(blocks, (start[0] // factor, start[1] // factor), (goal[0] // factor, goal[1] // factor))
+        if path:
+            # The corridor consists of the coarse cells along the path and their neighbours
+            corridor = np.zeros((blocks.shape[0] + 2, blocks.shape[1] + 2), dtype=bool)
+            for r, c in path:
+                corridor[r:r + 3, c:c + 3] = True
+            corridor = corridor[1:-1, 1:-1].repeat(factor, axis=0)[:rows].repeat(factor, axis=1)[:, :cols]
+            cells = astar(free & corridor, start, goal)
+            if cells:
+                return cells
+    return astar(free, start, goal)
+
+
+def shortcut(free, path):
+    """
+    Remove the cells from the path that can be skipped with a straight line, this leaves the corners around
+    the obstacles.
+
+    The path consists of straight runs of cells. The furthest cell that is visible is searched among the cells
+    where the path turns, and then by bisection along the run after that, rather than by trying all cells.
+    """
+    last = len(path) - 1
+    turns = [0] + [k for k in range(1, last) if (path[k][0] - path[k - 1][0], path[k][1] - path[k - 1][1]) != (path[k + 1][0] - path[k][0], path[k + 1][1] - path[k][1])] + [last]
+    result = [path[0]]
+    i = t = 0
+    while i < last:
+        # Find the furthest turn that is visible from the current cell, the next turn always is
+        while turns[t] <= i:
+            t += 1
+        k = len(turns) - 1
+        while k > t and not line_of_sight(free, path[i], path[turns[k]]):
+            k -= 1
+        # Find the furthest visible cell in the run that follows it
+        j, end = turns[k], turns[min(k + 1, len(turns) - 1)]
+        while end - j > 1:
+            middle = (j + end) // 2
+            if line_of_sight(free, path[i], path[middle]):
+                j = middle
+            else:
+                end = middle
+        result.append(path[j])
+        i = j
+    return result
+
+
+class Planner:
+    """
+    Routes between points around the obstacles on the stage. The obstacles are the dark parts of the stage
+    image and the obstacles that are painted on top of it, both on a grid with cells of a few centimeter. The
+    robot is kept clear of the obstacles by its radius.
+
+    The occupancy grid, the distance to the obstacles and the free cells for each radius are computed once and
+    cached, as well as the route between each pair of points, so that moving one point only plans the two
+    routes to and from that point again.
+
+    This does not depend on Qt, the image is passed as a grayscale array.
+    """
+    def __init__(self, width, depth, pixels_per_meter, gray=None, cell_size=CELL_SIZE, threshold=THRESHOLD):
+        self.width = width  # in image pixels
+        self.depth = depth  # in image pixels
+        self.pixels_per_meter = pixels_per_meter
+        self.cell_size = cell_size
+        self.cell = cell_size * pixels_per_meter  # the size of the cells in image pixels
+        self.shape = (max(1, math.ceil(depth / self.cell)), max(1, math.ceil(width / self.cell)))
+        self.image = occupancy_grid(gray, self.shape, threshold) if gray is not None else np.zeros(self.shape, dtype=bool)
+        self.painted = np.zeros(self.shape, dtype=np.int8)  # +1 for painted obstacles, -1 for erased obstacles
+        self.version = 0  # this is incremented when the obstacles change
+        self._distance = None
+        self._free = {}
+        self.routes = collections.OrderedDict()
+
+    @property
+    def occupied(self):
+        return (self.image & (self.painted >= 0)) | (self.painted > 0)
+
+    def paint(self, x, y, radius, obstacle=True):
+        """
+        Paint or erase obstacles in a circle around the position, in image pixels
+        """
+        rows, cols = np.ogrid[:self.shape[0], :self.shape[1]]
+        inside = np.hypot((cols + 0.5) * self.cell - x, (rows + 0.5) * self.cell - y) <= max(radius, self.cell / 2)
+        self.painted[inside] = 1 if obstacle else -1
+        self.changed()
+
+    def copy_painted(self, other):
+        """
+        Copy the painted obstacles from another planner for the same stage, e.g., after the scale changed
+        """
+        rows = np.minimum(((np.arange(self.shape[0]) + 0.5) * self.cell / other.cell).astype(int), other.shape[0] - 1)
+        cols = np.minimum(((np.arange(self.shape[1]) + 0.5) * self.cell / other.cell).astype(int), other.shape[1] - 1)
+        self.painted = other.painted[np.ix_(rows, cols)]
+        self.changed()
+
+    def clear_painted(self):
+        self.painted[:] = 0
+        self.changed()
+
+    def changed(self):
+        self.version += 1
+        self._distance = None
+        self._free = {}
+        self.routes.clear()
+
+    def distance(self):
+        """
+        The distance in meter from each cell to the nearest obstacle, up to the maximum distance
+        """
+        if self._distance is None:
+            self._distance = distance_transform(self.occupied, MAX_DISTANCE / self.cell_size) * self.cell_size
+        return self._distance
+
+    def free(self, radius):
+        """
+        The cells in which a robot with the radius (in meter) does not touch an obstacle, with a margin of half
+        a cell for the resolution of the grid
+        """
+        radius = min(radius + self.cell_size / 2, MAX_DISTANCE - self.cell_size)
+        if radius not in self._free:
+            self._free[radius] = self.distance() > radius
+        return self._free[radius]
+
+    def to_cell(self, x, y):
+        return (min(max(int(y // self.cell), 0), self.shape[0] - 1), min(max(int(x // self.cell), 0), self.shape[1] - 1))
+
+    def plan(self, a, b, radius, draft=False):
+        """
+        Return the route between two positions (in image pixels) as a list of positions, starting at the first
+        and ending at the second. When there is no route, e.g., because a position is inside an obstacle, this
+        is the straight line. As a draft, e.g., while a point is dragged, a route that was not planned before
+        is also the straight line.
+        """
+        key = (tuple(a), tuple(b), radius)
+        if key in self.routes:
+            self.routes.move_to_end(key)
+            return self.routes[key]
+        route = [tuple(a), tuple(b)]
+        if draft:
+            return route
+        free = self.free(radius)
+        start, goal = self.to_cell(*a), self.to_cell(*b)
+        if start != goal and free[start] and free[goal] and not line_of_sight(free, start, goal):
+            cells = coarse_astar(free, start, goal)
+            if cells:
+                corners = shortcut(free, cells)
+                route = [tuple(a)] + [((c + 0.5) * self.cell, (r + 0.5) * self.cell) for r, c in corners[1:-1]] + [tuple(b)]
+        self.routes[key] = route
+        if len(self.routes) > MAX_ROUTES:
+            self.routes.popitem(last=False)
+        return route
+
+    def route(self, points, radius, draft=False):
+        """
+        Return the route along all points as an (M,2) array in image pixels, the points are part of the route
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if len(points) < 2:
+            return points
+        route = [points[0]]
+        for a, b in zip(points[:-1].tolist(), points[1:].tolist()):
+            route.extend(self.plan(a, b, radius, draft)[1:])
+        return np.array(route, dtype=float)
@@ -0,0 +1,366 @@
+"""
+Real-time playback and streaming of the waypoints of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+This module does not import PyQt5, the playback runs on an asyncio event loop, e.g., on a worker thread of the
+graphical user interface or from the command line.
+"""
+
+import re
+import math
+import time
+import json
+import struct
+import asyncio
+import collections
+import numpy as np
+from urllib.parse import urlsplit
+
+from waypointeditor.waypointio import RATE, PORT  # the default rate of the setpoints in Hz and the default port for UDP and OSC
+
+MQTT_PORT = 1883      # the default port of the MQTT broker
+TOPIC = 'waypointeditor'
+RESERVOIR = 10000     # the number of recent values that are kept for the percentiles of the statistics
+
+# The protocols that the setpoints can be streamed with, the first one is the default
+SCHEMES = ('udp', 'osc', 'mqtt')
+
+
+def interpolate(waypoints, t):
+    """
+    Return the (4,) setpoint with the time, position and angle at time t along an (N,4) array of waypoints. The
+    robot is at its first waypoint before it starts, and stays at its last waypoint after it finished.
+    """
+    time = waypoints[:, 0]
+    if len(waypoints) == 1 or t <= time[0]:
+        sample = waypoints[0].copy()
+    elif t >= time[-1]:
+        sample = waypoints[-1].copy()
+    else:
+        i = int(np.searchsorted(time, t, side='right')) - 1
+        fraction = (t - time[i]) / (time[i + 1] - time[i])
+        sample = waypoints[i] + (waypoints[i + 1] - waypoints[i]) * fraction
+    sample[0] = t
+    return sample
+
+
+class Statistics:
+    """
+    Running statistics of a timing error in seconds, e.g., the jitter of the timer or the latency of the
+    network. The mean and standard deviation are over all values, the percentiles over the most recent ones.
+    """
+    def __init__(self, reservoir=RESERVOIR):
+        self.count = 0
+        self.mean = 0.0
+        self.squares = 0.0
+        self.maximum = -math.inf
+        self.recent = collections.deque(maxlen=reservoir)
+
+    def add(self, value):
+        # Welford's algorithm, this is numerically stable for long performances
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.squares += delta * (value - self.mean)
+        self.maximum = max(self.maximum, value)
+        self.recent.append(value)
+
+    @property
+    def std(self):
+        return math.sqrt(self.squares / (self.count - 1)) if self.count > 1 else 0.0
+
+    def percentile(self, q):
+        return float(np.percentile(self.recent, q)) if self.recent else 0.0
+
+    def report(self, name):
+        if not self.count:
+            return f'{name}: no samples'
+        return f'{name}: mean {1000 * self.mean:.2f} ms, sd {1000 * self.std:.2f} ms, 99% {1000 * self.percentile(99):.2f} ms, max {1000 * self.maximum:.2f} ms over {self.count} samples'
+
+
+def osc_string(text):
+    data = text.encode('utf-8') + b'\0'
+    return data + b'\0' * (-len(data) % 4)
+
+
+def osc_address(robot):
+    # The OSC address cannot contain spaces and some other characters
+    return f'/{TOPIC}/' + re.sub(r'[^A-Za-z0-9_.-]', '_', robot)
+
+
+def encode_osc(robot, sample, sent):
+    """
+    Encode a setpoint as an OSC message with the time, x, y and angle as float32 and the send time as float64
+    """
+    return osc_string(osc_address(robot)) + osc_string(',ffffd') + struct.pack('>ffffd', *sample, sent)
+
+
+def decode_osc(data):
+    """
+    Decode an OSC message from encode_osc, this returns the robot, the setpoint and the send time
+    """
+    end = data.index(b'\0')
+    address = data[:end].decode('utf-8')
+    start = end + 1 + (-(end + 1) % 4)
+    end = data.index(b'\0', start)
+    if data[start:end] != b',ffffd':
+        raise ValueError(f'unexpected OSC type tag "{data[start:end]}"')
+    start = end + 1 + (-(end + 1) % 4)
+    *sample, sent = struct.unpack_from('>ffffd', data, start)
+    return address.rsplit('/', 1)[-1], np.array(sample), sent
+
+
+def encode_json(robot, sample, sent):
+    """
+    Encode a setpoint as a JSON object, this is used for UDP and MQTT
+    """
+    t, x, y, angle = (float(value) for value in sample)
+    return json.dumps({'robot': robot, 'time': t, 'x': x, 'y': y, 'angle': angle, 'sent': sent}).encode('utf-8')
+
+
+def decode_json(data):
+    message = json.loads(data)
+    return message['robot'], np.array([message['time'], message['x'], message['y'], message['angle']]), message['sent']
+
+
+class UDPSender:
+    """
+    Send the setpoints as UDP datagrams, either as JSON or as OSC messages
+    """
+    def __init__(self, host, port, osc=False):
+        self.host = host
+        self.port = port
+        self.encode = encode_osc if osc else encode_json
+        self.transport = None
+
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        self.transport, _ = await loop.create_datagram_endpoint(asyncio.DatagramProtocol, remote_addr=(self.host, self.port))
+
+    async def send(self, robot, sample, sent):
+        self.transport.sendto(self.encode(robot, sample, sent))
+
+    async def close(self):
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+
+def mqtt_length(length):
+    # The remaining length of an MQTT packet is encoded with 7 bits per byte
+    data = bytearray()
+    while True:
+        length, byte = divmod(length, 128)
+        data.append(byte | (128 if length else 0))
+        if not length:
+            return bytes(data)
+
+
+def mqtt_string(text):
+    data = text.encode('utf-8')
+    return struct.pack('>H', len(data)) + data
+
+
+def mqtt_packet(kind, body):
+    return bytes([kind]) + mqtt_length(len(body)) + body
+
+
+class MQTTSender:
+    """
+    Publish the setpoints as JSON to an MQTT broker, one topic per robot. This implements the few packets of
+    MQTT 3.1.1 that are needed to publish with QoS 0, so that no MQTT library is required.
+    """
+    def __init__(self, host, port, topic=TOPIC):
+        self.host = host
+        self.port = port
+        self.topic = topic.strip('/') or TOPIC
+        self.reader = self.writer = None
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        # Protocol level 4 with a clean session and without keep alive
+        body = mqtt_string('MQTT') + bytes([4, 0x02]) + struct.pack('>H', 0) + mqtt_string(f'waypointeditor-{id(self):x}')
+        self.writer.write(mqtt_packet(0x10, body))
+        try:
+            connack = await self.reader.readexactly(4)
+        except asyncio.IncompleteReadError:
+            raise ConnectionError(f'the connection to {self.host}:{self.port} was closed before the MQTT broker accepted it') from None
+        if connack[0] != 0x20 or connack[3] != 0:
+            raise ConnectionError(f'the MQTT broker refused the connection (code {connack[3]})')
+
+    async def send(self, robot, sample, sent):
+        self.writer.write(mqtt_packet(0x30, mqtt_string(f'{self.topic}/{robot}') + encode_json(robot, sample, sent)))
+        await self.writer.drain()
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.write(mqtt_packet(0xe0, b''))
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.writer = None
+
+
+def create_sender(url):
+    """
+    Create a sender for a URL like udp://host:port, osc://host:port or mqtt://host:port/topic
+    """
+    parts = urlsplit(url if '://' in url else 'udp://' + url)
+    if parts.scheme not in SCHEMES:
+        raise ValueError(f'unsupported protocol "{parts.scheme}", this should be one of {", ".join(SCHEMES)}')
+    host = parts.hostname or '127.0.0.1'
+    if parts.scheme == 'mqtt':
+        return MQTTSender(host, parts.port or MQTT_PORT, parts.path or TOPIC)
+    return UDPSender(host, parts.port or PORT, osc=parts.scheme == 'osc')
+
+
+class Playback:
+    """
+    Step through the waypoints of one or more robots at a fixed rate and send the interpolated setpoints. The
+    ticks are scheduled at absolute times on the monotonic clock of the event loop, so that the timing errors
+    do not accumulate; ticks that are missed completely are skipped rather than sent in a burst. The latest
+    setpoint of each robot is available in the position attribute, e.g., to draw the robots in the editor.
+    """
+    def __init__(self, robots, rate=RATE, speed=1.0, loop=False):
+        if not rate > 0:
+            raise ValueError('the rate should be positive')
+        if not speed > 0:
+            raise ValueError('the speed should be positive')
+        self.robots = {name: np.asarray(waypoints, dtype=float).reshape(-1, 4) for name, waypoints in robots.items()}
+        self.robots = {name: waypoints for name, waypoints in self.robots.items() if len(waypoints)}
+        self.rate = rate
+        self.speed = speed
+        self.loop = loop
+        self.duration = max([waypoints[-1, 0] for waypoints in self.robots.values()], default=0)
+        self.position = {}
+        self.time = 0.0
+        self.jitter = Statistics()
+        self.skipped = 0
+        self.stopped = False
+
+    def stop(self):
+        """
+        Stop the playback at the next tick, this can be called from another thread
+        """
+        self.stopped = True
+
+    async def run(self, senders=()):
+        loop = asyncio.get_running_loop()
+        period = 1 / self.rate
+        start = loop.time()
+        tick = 0
+        while not self.stopped:
+            deadline = start + tick * period
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.jitter.add(loop.time() - deadline)
+
+            t = tick * period * self.speed
+            if self.loop and self.duration > 0:
+                t %= self.duration
+            self.time = t
+            sent = time.time()
+            for name, waypoints in self.robots.items():
+                sample = interpolate(waypoints, t)
+                self.position[name] = sample
+                for sender in senders:
+                    await sender.send(name, sample, sent)
+            if not self.loop and t >= self.duration:
+                break
+
+            tick += 1
+            behind = int((loop.time() - start) / period)
+            if behind > tick:
+                self.skipped += behind - tick
+                tick = behind
+
+    def report(self):
+        return self.jitter.report('timer jitter') + f', {self.skipped} ticks skipped'
+
+
+async def play(playback, urls=()):
+    """
+    Open the senders for the URLs, run the playback and close the senders again
+    """
+    senders = [create_sender(url) for url in urls]
+    try:
+        for sender in senders:
+            await sender.open()
+        await playback.run(senders)
+    finally:
+        for sender in senders:
+            await sender.close()
+
+
+class Receiver(asyncio.DatagramProtocol):
+    """
+    Receive the setpoints that are sent over UDP as JSON or OSC, e.g., to test the playback on the loopback
+    interface. This keeps the latency, i.e., the time between sending and receiving, which is only meaningful
+    when the sender is on the same computer or has a synchronized clock, and the jitter of the interval between
+    the setpoints of each robot.
+    """
+    def __init__(self, osc=False, rate=None, callback=None):
+        self.decode = decode_osc if osc else decode_json
+        self.period = 1 / rate if rate else None
+        self.callback = callback
+        self.latency = Statistics()
+        self.jitter = Statistics()
+        self.interval = Statistics()
+        self.last = {}
+        self.errors = 0
+
+    def datagram_received(self, data, address):
+        received = time.time()
+        try:
+            robot, sample, sent = self.decode(data)
+        except (ValueError, KeyError, struct.error):
+            self.errors += 1
+            return
+        self.latency.add(received - sent)
+        if robot in self.last:
+            interval = received - self.last[robot]
+            self.interval.add(interval)
+            if self.period:
+                self.jitter.add(abs(interval - self.period))
+        self.last[robot] = received
+        if self.callback:
+            self.callback(robot, sample, sent)
+
+    def report(self):
+        lines = [self.latency.report('latency'), self.interval.report('interval')]
+        if self.period:
+            lines.append(self.jitter.report('interval jitter'))
+        if self.errors:
+            lines.append(f'{self.errors} messages could not be decoded')
+        return '\n'.join(lines)
+
+
+async def receive(receiver, host='127.0.0.1', port=PORT, duration=None):
+    """
+    Receive setpoints on the UDP port for the duration in seconds, or until cancelled. The receiver keeps the
+    statistics, also when this is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(lambda: receiver, local_addr=(host, port))
+    try:
+        if duration is None:
+            await asyncio.Event().wait()
+        else:
+            await asyncio.sleep(duration)
+    finally:
+        transport.close()
+    return receiver
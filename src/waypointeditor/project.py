@@ -0,0 +1,285 @@
+"""
+Project files and the autosave journal of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+import base64
+import struct
+import numpy as np
+
+from waypointeditor.trajectory import Trajectory
+
+# A project file starts with the magic bytes, the format version and the length of the JSON header. The header
+# is followed by a binary block with the arrays, i.e., the points of all robots and the painted obstacles.
+MAGIC = b'WPEDITOR'
+VERSION = 1
+PREFIX = struct.Struct('<8sII')
+ALIGNMENT = 8
+
+# The settings of each robot that are stored in the project
+SETTINGS = ('total_duration', 'total_rotation', 'max_speed', 'max_acceleration', 'max_angular_speed', 'smooth', 'radius')
+
+# The extension of the journal that is written next to the project file
+JOURNAL = '.journal'
+
+# The line that follows the snapshot of the state at the start of the journal, the changes come after this
+SNAPSHOT = b'["snapshot"]'
+
+
+class Project:
+    """
+    The stage, the scale and the robots with their points and settings, without the graphical user interface.
+    The stage is either an image file or a template of width by depth meter. The obstacles that are painted on
+    the stage are stored as an array, together with the strokes that were painted after the last save.
+    """
+    def __init__(self):
+        self.image = None       # the file name of the stage image
+        self.template = None    # the width and depth in meter of a template stage
+        self.pixels_per_meter = 0
+        self.robots = {}        # the name of each robot and its trajectory
+        self.avoid = set()      # the names of the robots that avoid the obstacles
+        self.robot = None       # the name of the current robot
+        self.painted = None     # the painted obstacles, see the Planner class
+        self.strokes = []       # the obstacles that were painted or erased after the painted array was stored
+
+    def apply(self, operation, *args):
+        """
+        Apply a change that was recorded in the journal
+        """
+        if operation == 'image':
+            self.image, self.template = args[0], None
+        elif operation == 'template':
+            self.image, self.template = None, list(args)
+        elif operation == 'close':
+            self.image = self.template = None
+            for trajectory in self.robots.values():
+                trajectory.clear()
+        elif operation == 'edit':
+            robot, method, args = args[0], args[1], args[2:]
+            getattr(self.robots[robot], method)(*args)
+        elif operation == 'settings':
+            robot, settings = args
+            self.set_settings(robot, settings)
+        elif operation == 'new_robot':
+            self.robots[args[0]] = Trajectory(pixels_per_meter=self.pixels_per_meter)
+            self.robot = args[0]
+        elif operation == 'rename_robot':
+            old, new = args
+            self.robots = {new if name == old else name: trajectory for name, trajectory in self.robots.items()}
+            self.avoid = {new if name == old else name for name in self.avoid}
+            self.robot = new if self.robot == old else self.robot
+        elif operation == 'remove_robot':
+            del self.robots[args[0]]
+            self.avoid.discard(args[0])
+            if self.robot == args[0]:
+                self.robot = next(iter(self.robots), None)
+        elif operation == 'select_robot':
+            self.robot = args[0]
+        elif operation == 'paint':
+            self.strokes.append(tuple(args))
+        elif operation == 'clear_painted':
+            self.painted = None
+            self.strokes = []
+        elif operation == 'snapshot':
+            pass  # the end of the snapshot, nothing changes
+        else:
+            raise ValueError(f'unknown operation "{operation}"')
+
+    def settings(self, robot):
+        trajectory = self.robots[robot]
+        settings = {key: getattr(trajectory, key) for key in SETTINGS}
+        settings['avoid_obstacles'] = robot in self.avoid
+        return settings
+
+    def set_settings(self, robot, settings):
+        trajectory = self.robots[robot]
+        if 'pixels_per_meter' in settings:
+            # The scale belongs to the stage, it is the same for all robots
+            self.pixels_per_meter = settings['pixels_per_meter']
+            for other in self.robots.values():
+                other.pixels_per_meter = self.pixels_per_meter
+        for key in SETTINGS:
+            if key in settings:
+                setattr(trajectory, key, settings[key])
+        if settings.get('avoid_obstacles'):
+            self.avoid.add(robot)
+        elif 'avoid_obstacles' in settings:
+            self.avoid.discard(robot)
+
+
+def save(file_name, project):
+    """
+    Save the project. The header with the settings is JSON, the arrays are written as a single binary block,
+    so that large projects are read back without parsing the points one by one. The file is written under a
+    temporary name and then renamed, so that an existing project is never left half-written.
+    """
+    directory = os.path.dirname(os.path.abspath(file_name))
+    header = {
+        'image': os.path.relpath(project.image, directory) if project.image else None,
+        'template': project.template,
+        'pixels_per_meter': project.pixels_per_meter,
+        'robot': project.robot,
+        'robots': [],
+    }
+    arrays = []
+    offset = 0
+    for name, trajectory in project.robots.items():
+        points = np.ascontiguousarray(trajectory.points, dtype='<f8')
+        header['robots'].append({'name': name, 'settings': project.settings(name), 'count': len(points), 'offset': offset})
+        arrays.append(points)
+        offset += points.nbytes
+        if trajectory.has_timing:
+            # The explicit times and angles of imported waypoints, as two columns after the points
+            timing = np.ascontiguousarray(np.column_stack(trajectory.timing()), dtype='<f8')
+            header['robots'][-1]['timing'] = offset
+            arrays.append(timing)
+            offset += timing.nbytes
+    if project.painted is not None:
+        painted = np.ascontiguousarray(project.painted, dtype=np.int8)
+        header['painted'] = {'shape': list(painted.shape), 'offset': offset}
+        arrays.append(painted)
+
+    text = json.dumps(header).encode('utf-8')
+    text += b' ' * (-(PREFIX.size + len(text)) % ALIGNMENT)
+    temporary = file_name + '.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(PREFIX.pack(MAGIC, VERSION, len(text)))
+        f.write(text)
+        for array in arrays:
+            f.write(array.tobytes())
+    os.replace(temporary, file_name)
+
+
+def load(file_name):
+    """
+    Load a project, the points of each robot are taken directly from the binary block
+    """
+    with open(file_name, 'rb') as f:
+        prefix = f.read(PREFIX.size)
+        if len(prefix) < PREFIX.size or not prefix.startswith(MAGIC):
+            raise ValueError(f'"{file_name}" is not a project file')
+        magic, version, length = PREFIX.unpack(prefix)
+        if version > VERSION:
+            raise ValueError(f'"{file_name}" was written by a newer version')
+        text = f.read(length)
+        if len(text) < length:
+            raise ValueError(f'"{file_name}" is incomplete')
+        header = json.loads(text.decode('utf-8'))
+        data = f.read()
+
+    project = Project()
+    directory = os.path.dirname(os.path.abspath(file_name))
+    project.image = os.path.normpath(os.path.join(directory, header['image'])) if header.get('image') else None
+    project.template = header.get('template')
+    project.pixels_per_meter = header.get('pixels_per_meter', 0)
+    for robot in header['robots']:
+        points = np.frombuffer(data, dtype='<f8', count=2 * robot['count'], offset=robot['offset']).reshape(-1, 2)
+        project.robots[robot['name']] = Trajectory(points, project.pixels_per_meter)
+        if 'timing' in robot:
+            timing = np.frombuffer(data, dtype='<f8', count=2 * robot['count'], offset=robot['timing']).reshape(-1, 2)
+            project.robots[robot['name']].replace(points, timing[:, 0], timing[:, 1])
+        project.set_settings(robot['name'], robot['settings'])
+    if 'painted' in header:
+        shape = header['painted']['shape']
+        project.painted = np.frombuffer(data, dtype=np.int8, count=shape[0] * shape[1], offset=header['painted']['offset']).reshape(shape).copy()
+    project.robot = header.get('robot') if header.get('robot') in project.robots else next(iter(project.robots), None)
+    return project
+
+
+def encode_array(value):
+    # Arrays are written to the journal as base64, which is much faster than a list of numbers for large arrays
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value, dtype='<f8')
+        return {'array': base64.b64encode(value.tobytes()).decode('ascii'), 'shape': list(value.shape)}
+    raise TypeError(f'{type(value).__name__} cannot be written to the journal')
+
+
+def decode_array(value):
+    if 'array' in value and 'shape' in value:
+        return np.frombuffer(base64.b64decode(value['array']), dtype='<f8').reshape(value['shape'])
+    return value
+
+
+class Journal:
+    """
+    An append-only file with the changes since the project was last saved, one JSON line per change. This is
+    flushed after every change, so that the changes can be recovered after a crash by replaying them on top of
+    the saved project. A line that was only partially written is ignored.
+    """
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.file = None
+
+    def record(self, operation, *args):
+        if self.file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.file_name)), exist_ok=True)
+            self.file = open(self.file_name, 'a')
+        self.file.write(json.dumps([operation, *args], default=encode_array) + '\n')
+        self.file.flush()
+
+    def reset(self):
+        """
+        Remove the journal, e.g., after the project has been saved
+        """
+        self.close()
+        if os.path.exists(self.file_name):
+            os.remove(self.file_name)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def snapshot(self, changes):
+        """
+        Record the changes that recreate the state at the start of the journal, followed by a line that marks
+        the end of the snapshot
+        """
+        for operation, *args in changes:
+            self.record(operation, *args)
+        self.record('snapshot')
+
+    def has_changes(self):
+        """
+        Return whether there are changes in the journal, a journal with only a snapshot has none
+        """
+        if not os.path.exists(self.file_name):
+            return False
+        with open(self.file_name, 'rb') as f:
+            # Only the last line is read, the journal of a long session can be large
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(size - len(SNAPSHOT) - 4, 0))
+            last = f.read().rstrip().rsplit(b'\n', 1)[-1]
+            return size > 0 and last != SNAPSHOT
+
+
+def replay(file_name, project=None):
+    """
+    Apply the changes in the journal to the project, or to a new project. This returns the project.
+    """
+    if project is None:
+        project = Project()
+    with open(file_name) as f:
+        for line in f:
+            try:
+                operation, *args = json.loads(line, object_hook=decode_array)
+            except ValueError:
+                break  # the last change was not completely written
+            project.apply(operation, *args)
+    return project
@@ -0,0 +1,143 @@
+"""
+Path simplification of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import math
+import heapq
+import numpy as np
+
+# The simplification methods, the first one is the default
+METHODS = ('douglas-peucker', 'visvalingam')
+
+
+def segment_distance(points, a, b):
+    """
+    Return the distance of each of the (N,2) points to the segment from a to b, these can be a single point or
+    an (N,2) array with one segment per point
+    """
+    points, a, b = np.asarray(points, dtype=float), np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    ab = b - a
+    length = np.sum(ab * ab, axis=-1)
+    t = np.divide(np.sum((points - a) * ab, axis=-1), length, out=np.zeros(np.broadcast(points[..., 0], length).shape), where=length > 0)
+    t = np.clip(t, 0, 1)[..., np.newaxis]
+    return np.hypot(*(points - (a + t * ab)).T)
+
+
+def douglas_peucker(points, tolerance):
+    """
+    Return the indices of the points that are kept by the Ramer-Douglas-Peucker algorithm. Each range is split
+    at the point that is furthest from the segment between its first and last point, until all points are within
+    the tolerance. The distances are computed per range in a single vectorized pass, the expected time is
+    O(n log n) for the irregular paths that are traced by hand, with O(n^2) as the worst case.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    n = len(points)
+    if n < 3:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distance = segment_distance(points[first + 1:last], points[first], points[last])
+        i = int(np.argmax(distance))
+        if distance[i] > tolerance:
+            i += first + 1
+            keep[i] = True
+            stack.append((first, i))
+            stack.append((i, last))
+    return np.flatnonzero(keep)
+
+
+def visvalingam(points, tolerance):
+    """
+    Return the indices of the points that are kept by the Visvalingam-Whyatt algorithm. The point that is
+    closest to the segment between its neighbours is removed repeatedly, until all remaining points are further
+    than the tolerance. The points are kept in a priority queue, which takes O(n log n) time.
+
+    The distance to the segment between the neighbours is used rather than the area of the triangle, so that
+    the tolerance is a distance, like for the Ramer-Douglas-Peucker algorithm. The distances of the neighbours
+    of a removed point are not allowed to decrease, since that would remove points out of order.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    n = len(points)
+    if n < 3:
+        return np.arange(n)
+    xy = points.tolist()
+    previous = list(range(-1, n - 1))
+    following = list(range(1, n + 1))
+    removed = [False] * n
+
+    def cost(i):
+        (x, y), (x1, y1), (x2, y2) = xy[i], xy[previous[i]], xy[following[i]]
+        dx, dy = x2 - x1, y2 - y1
+        length = dx * dx + dy * dy
+        t = min(max(((x - x1) * dx + (y - y1) * dy) / length, 0), 1) if length > 0 else 0
+        return math.hypot(x1 + t * dx - x, y1 + t * dy - y)
+
+    costs = [0.0] + segment_distance(points[1:-1], points[:-2], points[2:]).tolist() + [0.0]
+    heap = [(costs[i], i) for i in range(1, n - 1)]
+    heapq.heapify(heap)
+    while heap:
+        c, i = heapq.heappop(heap)
+        if removed[i] or c != costs[i]:
+            continue  # the point was already removed, or its cost changed after it was queued
+        if c > tolerance:
+            break
+        removed[i] = True
+        p, q = previous[i], following[i]
+        following[p], previous[q] = q, p
+        for j in (p, q):
+            if 0 < j < n - 1:
+                costs[j] = max(c, cost(j))
+                heapq.heappush(heap, (costs[j], j))
+    return np.flatnonzero(~np.array(removed))
+
+
+def max_deviation(points, keep):
+    """
+    Return the largest distance of the original points to the simplified path with the points that are kept
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    keep = np.asarray(keep)
+    if len(keep) < 2:
+        return 0.0
+    # the segment of the simplified path that replaces each of the original points
+    segment = np.clip(np.searchsorted(keep, np.arange(len(points)), side='right') - 1, 0, len(keep) - 2)
+    return float(np.max(segment_distance(points, points[keep[segment]], points[keep[segment + 1]])))
+
+
+def simplify(points, tolerance, method=METHODS[0]):
+    """
+    Simplify a path with an (N,2) array of points with the specified tolerance, in the same units as the points.
+    This returns the indices of the points that are kept, the first and last point are always kept.
+
+    With the Ramer-Douglas-Peucker algorithm all removed points are within the tolerance from the simplified
+    path. The Visvalingam-Whyatt algorithm only compares each point with its current neighbours, so that the
+    deviation can accumulate beyond the tolerance; use max_deviation() to check the result.
+    """
+    if not tolerance >= 0:
+        raise ValueError('the tolerance should not be negative')
+    if method == 'douglas-peucker':
+        return douglas_peucker(points, tolerance)
+    elif method == 'visvalingam':
+        return visvalingam(points, tolerance)
+    else:
+        raise ValueError(f'unknown simplification method "{method}"')
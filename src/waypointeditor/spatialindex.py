@@ -0,0 +1,147 @@
+"""
+Spatial index of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import math
+import collections
+
+
+class GridIndex:
+    """
+    A uniform grid with the points and segments of a path, for finding the point or segment that is closest to
+    a position without considering all points. Segment i connects point i and point i+1.
+
+    Appending, removing the last point and moving a point update the grid incrementally. Inserting or removing
+    a point elsewhere changes the index of all following points, in that case the grid is rebuilt.
+    """
+    def __init__(self, cell_size=64, points=()):
+        self.cell_size = cell_size
+        self.rebuild(points)
+
+    def __len__(self):
+        return len(self.points)
+
+    def rebuild(self, points):
+        self.points = [(x, y) for x, y in points]
+        self.point_cells = collections.defaultdict(set)
+        self.segment_cells = collections.defaultdict(set)
+        for i, (x, y) in enumerate(self.points):
+            self.point_cells[self.cell(x, y)].add(i)
+        for i in range(len(self.points) - 1):
+            for cell in self.cells(i):
+                self.segment_cells[cell].add(i)
+
+    def cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def cells(self, segment):
+        """
+        Return the cells that contain the points along a segment, which are sampled every quarter cell
+        """
+        (x1, y1), (x2, y2) = self.points[segment], self.points[segment + 1]
+        steps = max(1, math.ceil(4 * math.hypot(x2 - x1, y2 - y1) / self.cell_size))
+        return {self.cell(x1 + (x2 - x1) * k / steps, y1 + (y2 - y1) * k / steps) for k in range(steps + 1)}
+
+    def add_segment(self, segment):
+        for cell in self.cells(segment):
+            self.segment_cells[cell].add(segment)
+
+    def remove_segment(self, segment):
+        for cell in self.cells(segment):
+            self.segment_cells[cell].discard(segment)
+            if not self.segment_cells[cell]:
+                del self.segment_cells[cell]
+
+    def remove_point(self, i):
+        cell = self.cell(*self.points[i])
+        self.point_cells[cell].discard(i)
+        if not self.point_cells[cell]:
+            del self.point_cells[cell]
+
+    def append(self, x, y):
+        self.points.append((x, y))
+        self.point_cells[self.cell(x, y)].add(len(self.points) - 1)
+        if len(self.points) > 1:
+            self.add_segment(len(self.points) - 2)
+
+    def pop(self):
+        if len(self.points) > 1:
+            self.remove_segment(len(self.points) - 2)
+        self.remove_point(len(self.points) - 1)
+        return self.points.pop()
+
+    def move(self, i, x, y):
+        neighbours = [segment for segment in (i - 1, i) if 0 <= segment < len(self.points) - 1]
+        for segment in neighbours:
+            self.remove_segment(segment)
+        self.remove_point(i)
+        self.points[i] = (x, y)
+        self.point_cells[self.cell(x, y)].add(i)
+        for segment in neighbours:
+            self.add_segment(segment)
+
+    def insert(self, i, x, y):
+        points = list(self.points)
+        points.insert(i, (x, y))
+        self.rebuild(points)
+
+    def remove(self, i):
+        points = list(self.points)
+        del points[i]
+        self.rebuild(points)
+
+    def nearby(self, cells, x, y, radius):
+        """
+        Return the items in the cells that overlap with the square around the position
+        """
+        c0, r0 = self.cell(x - radius, y - radius)
+        c1, r1 = self.cell(x + radius, y + radius)
+        items = set()
+        for column in range(c0, c1 + 1):
+            for row in range(r0, r1 + 1):
+                items.update(cells.get((column, row), ()))
+        return items
+
+    def nearest_point(self, x, y, radius):
+        """
+        Return the index of the point that is closest to the position and within the radius, or None
+        """
+        best, distance = None, radius
+        for i in self.nearby(self.point_cells, x, y, radius):
+            d = math.hypot(self.points[i][0] - x, self.points[i][1] - y)
+            if d <= distance:
+                best, distance = i, d
+        return best
+
+    def nearest_segment(self, x, y, radius):
+        """
+        Return the index of the segment that is closest to the position and within the radius, together with
+        the closest position on that segment, or (None, None)
+        """
+        best, position, distance = None, None, radius
+        # The sampled points are within a quarter cell of every position on the segment
+        for i in self.nearby(self.segment_cells, x, y, radius + self.cell_size / 4):
+            (x1, y1), (x2, y2) = self.points[i], self.points[i + 1]
+            dx, dy = x2 - x1, y2 - y1
+            length = dx * dx + dy * dy
+            t = min(max(((x - x1) * dx + (y - y1) * dy) / length, 0), 1) if length > 0 else 0
+            px, py = x1 + t * dx, y1 + t * dy
+            d = math.hypot(px - x, py - y)
+            if d <= distance:
+                best, position, distance = i, (px, py), d
+        return best, position
@@ -0,0 +1,583 @@
+"""
+Trajectory model of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+
+from waypointeditor.simplify import METHODS, simplify, max_deviation
+from waypointeditor.motion import sample_path, curvature, speed_profile, travel_time
+from waypointeditor.waypointio import check_times
+
+# The spacing in meter of the samples along the path for the motion profile
+SPACING = 0.05
+
+
+def cumulative_length(points):
+    """
+    Return the cumulative length along a path with an (N,2) array of points, the first value is always zero
+    """
+    cumulative = np.zeros(len(points))
+    if len(points) > 1:
+        np.cumsum(np.hypot(*np.diff(points, axis=0).T), out=cumulative[1:])
+    return cumulative
+
+
+def compute_waypoints(points, pixels_per_meter, total_duration=0, total_rotation=0):
+    """
+    Compute the waypoints for an (N,2) array of points in image pixel coordinates. This returns an (N,4) array
+    with the time, the x and y stage coordinates and the angle for each point.
+    """
+    if not pixels_per_meter > 0:
+        raise ValueError('the scale should be positive')
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    return waypoints_from_cumulative(points, cumulative_length(points), pixels_per_meter, total_duration, total_rotation)
+
+
+def waypoints_from_cumulative(points, cumulative, pixels_per_meter, total_duration, total_rotation):
+    waypoints = np.zeros((len(points), 4))
+    if len(points) == 0:
+        return waypoints
+
+    # normalize the total length of all segments to one
+    fraction = cumulative / cumulative[-1] if cumulative[-1] > 0 else np.zeros(len(points))
+
+    # Convert to stage coordinates:
+    # - positive x is away from the audience
+    # - positive y is to the left
+    # - positive angle is counter clockwise
+    waypoints[:, 0] = fraction * total_duration
+    waypoints[:, 1] = -((points[:, 1] - points[0, 1]) / pixels_per_meter)
+    waypoints[:, 2] = -((points[:, 0] - points[0, 0]) / pixels_per_meter)
+    waypoints[:, 3] = fraction * total_rotation
+    return waypoints
+
+
+def points_from_waypoints(waypoints, origin, pixels_per_meter):
+    """
+    Convert the stage coordinates of an (N,4) array of waypoints back to image pixel coordinates, this is the
+    inverse of compute_waypoints(). The stage coordinates are relative to the first point, which is placed at
+    the origin in image pixels.
+    """
+    if not pixels_per_meter > 0:
+        raise ValueError('the scale should be positive')
+    waypoints = np.asarray(waypoints, dtype=float).reshape(-1, 4)
+    points = np.empty((len(waypoints), 2))
+    points[:, 0] = origin[0] - waypoints[:, 2] * pixels_per_meter
+    points[:, 1] = origin[1] - waypoints[:, 1] * pixels_per_meter
+    return points
+
+
+def compute_batch(paths, pixels_per_meter, total_duration=0, total_rotation=0):
+    """
+    Compute the waypoints for many paths at once, e.g., for all robots in a show. The paths are a sequence
+    of (N,2) arrays, the scale, duration and rotation can be a single value or a sequence with one value per
+    path. This returns a list with an (N,4) array for each path.
+
+    All paths are concatenated and processed in a single vectorized pass, rather than one path at a time.
+    """
+    paths = [np.asarray(path, dtype=float).reshape(-1, 2) for path in paths]
+    if not paths:
+        return []
+    count = np.array([len(path) for path in paths])
+    pixels_per_meter = np.broadcast_to(np.asarray(pixels_per_meter, dtype=float), count.shape)
+    total_duration = np.broadcast_to(np.asarray(total_duration, dtype=float), count.shape)
+    total_rotation = np.broadcast_to(np.asarray(total_rotation, dtype=float), count.shape)
+    if np.any(pixels_per_meter[count > 0] <= 0):
+        raise ValueError('the scale should be positive')
+
+    points = np.concatenate(paths)
+    if len(points) == 0:
+        return [np.zeros((0, 4)) for path in paths]
+    index = np.repeat(np.arange(len(paths)), count)  # the path that each point belongs to
+    first = np.cumsum(count) - count                 # the index of the first point of each path
+    last = first + count - 1                         # the index of the last point of each path
+
+    # the segments that connect the last point of one path to the first point of the next are not part of a path
+    segment = np.zeros(len(points))
+    segment[1:] = np.hypot(*np.diff(points, axis=0).T)
+    segment[first[count > 0]] = 0
+    cumulative = np.cumsum(segment)
+    nonempty = count > 0
+    start = np.zeros(len(paths))
+    start[nonempty] = cumulative[first[nonempty]]
+    length = np.zeros(len(paths))
+    length[nonempty] = cumulative[last[nonempty]] - start[nonempty]
+    cumulative -= start[index]
+    fraction = np.divide(cumulative, length[index], out=np.zeros(len(points)), where=length[index] > 0)
+
+    origin = np.zeros((len(paths), 2))
+    origin[nonempty] = points[first[nonempty]]
+    scale = pixels_per_meter[index]
+    waypoints = np.empty((len(points), 4))
+    waypoints[:, 0] = fraction * total_duration[index]
+    waypoints[:, 1] = -((points[:, 1] - origin[index, 1]) / scale)
+    waypoints[:, 2] = -((points[:, 0] - origin[index, 0]) / scale)
+    waypoints[:, 3] = fraction * total_rotation[index]
+    return np.split(waypoints, np.cumsum(count)[:-1])
+
+
+def compute_profile(points, pixels_per_meter, total_duration, total_rotation, max_speed, max_acceleration, max_angular_speed=0, smooth=False):
+    """
+    Compute the waypoints for an (N,2) array of points with a time-optimal speed profile, rather than with a
+    constant speed. The path is sampled every few centimeter along the polyline or along a smooth spline through
+    the points. The speed accelerates from rest and decelerates to rest, it is limited by the maximum speed, by
+    the maximum (lateral) acceleration in the curves, and by the maximum angular speed for the rotation, which
+    is still proportional to the distance along the path.
+
+    This returns the sampled path in image pixel coordinates, an (M,4) array with the waypoints for each sample
+    and the minimum duration. When the total duration is longer, the profile is slowed down uniformly so that
+    the limits are still respected; when it is shorter or not specified, the minimum duration is used.
+    """
+    if not pixels_per_meter > 0:
+        raise ValueError('the scale should be positive')
+    if not (max_speed > 0 and max_acceleration > 0):
+        raise ValueError('the maximum speed and acceleration should be positive')
+    path = sample_path(points, SPACING * pixels_per_meter, smooth)
+    cumulative = cumulative_length(path)
+    waypoints = waypoints_from_cumulative(path, cumulative, pixels_per_meter, 0, total_rotation)
+    if len(path) < 2:
+        return path, waypoints, 0.0
+
+    length = cumulative[-1] / pixels_per_meter
+    limit = np.full(len(path), float(max_speed))
+    with np.errstate(divide='ignore'):
+        np.minimum(limit, np.sqrt(max_acceleration / (curvature(path) * pixels_per_meter)), out=limit)
+    if max_angular_speed > 0 and total_rotation != 0:
+        np.minimum(limit, max_angular_speed * length / abs(total_rotation), out=limit)
+    speed = speed_profile(cumulative / pixels_per_meter, limit, max_acceleration)
+    time = travel_time(cumulative / pixels_per_meter, speed)
+
+    minimum_duration = time[-1]
+    if total_duration > minimum_duration > 0:
+        time *= total_duration / minimum_duration
+    waypoints[:, 0] = time
+    return path, waypoints, minimum_duration
+
+
+def resample(waypoints, rate, chunk_size=65536):
+    """
+    Resample an (N,4) array of waypoints at a fixed rate (in Hz), e.g., for the control rate of the robot. The
+    position and angle are linearly interpolated in time, a segment without duration is skipped. The samples
+    are at multiples of the sampling period up to the last waypoint.
+
+    This is a generator that yields the samples in (M,4) arrays of at most chunk_size rows, so that long
+    performances at a high rate never have to be held in memory as a whole.
+    """
+    waypoints = np.asarray(waypoints, dtype=float).reshape(-1, 4)
+    if not rate > 0:
+        raise ValueError('the rate should be positive')
+    if len(waypoints) == 0:
+        return
+    time = waypoints[:, 0]
+    count = int(np.floor(time[-1] * rate + 1e-9)) + 1
+    for start in range(0, count, chunk_size):
+        t = np.arange(start, min(count, start + chunk_size)) / rate
+        if len(waypoints) == 1:
+            samples = np.repeat(waypoints, len(t), axis=0)
+            samples[:, 0] = t
+            yield samples
+            continue
+        # Binary search for the segment that contains each sample, the last point of a pause is used
+        i = np.clip(np.searchsorted(time, t, side='right') - 1, 0, len(time) - 2)
+        duration = time[i + 1] - time[i]
+        fraction = np.divide(t - time[i], duration, out=np.ones(len(t)), where=duration > 0)
+        fraction = np.clip(fraction, 0, 1)[:, np.newaxis]
+        samples = waypoints[i] + (waypoints[i + 1] - waypoints[i]) * fraction
+        samples[:, 0] = t
+        yield samples
+
+
+class Trajectory:
+    """
+    A path that consists of points in image pixel coordinates, together with the scale (pixels per meter),
+    the total duration (seconds) and the total rotation (degrees). The robot moves at a constant speed and
+    rotates at a constant angular speed over the whole path.
+
+    The points and the cumulative length along the path are kept in arrays that grow with amortized doubling.
+    Appending, removing the last point and clearing take constant time, moving, inserting or removing a point
+    only updates the cumulative length from that point onwards. The times and angles are not stored, since
+    these are the cumulative length scaled by a single factor; they are computed when needed.
+
+    Imported waypoints can have an explicit time and angle for each point, e.g., with pauses. This timing is
+    kept when a point is moved, and cleared when points are added or removed.
+
+    This does not depend on Qt, so that it can also be used without the graphical user interface.
+    """
+    def __init__(self, points=(), pixels_per_meter=0, total_duration=0, total_rotation=0):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self._points = np.zeros((max(16, len(points)), 2))
+        self._cumulative = np.zeros(len(self._points))  # cumulative length in pixels from the first point up to each point
+        self._count = len(points)
+        self._points[:self._count] = points
+        self._update_cumulative(0)
+        self.pixels_per_meter = pixels_per_meter
+        self.total_duration = total_duration
+        self.total_rotation = total_rotation
+        self.max_speed = 0         # meter/second, together with the maximum acceleration this enables the motion profile
+        self.max_acceleration = 0  # meter/second^2
+        self.max_angular_speed = 0 # degrees/second, this is optional
+        self.smooth = False        # follow a smooth spline through the points rather than the polyline
+        self.planner = None        # route around the obstacles on the stage between the points
+        self.radius = 0            # meter, the robot keeps this distance to the obstacles
+        self.draft = False         # only use the routes that were planned before, e.g., while a point is dragged
+        self.version = 0  # this is incremented on every change of the points, e.g., to update cached drawings
+        self._times = None   # the explicit time of each point in seconds, or None for a constant speed
+        self._angles = None  # the explicit angle of each point in degrees
+        self._profile = None
+        self._profile_key = None
+        self._route = None
+        self._route_key = None
+        self._routed = None
+        self._routed_key = None
+
+    def __len__(self):
+        return self._count
+
+    def _reserve(self, count):
+        if count > len(self._points):
+            capacity = max(count, 2 * len(self._points))
+            self._points = np.resize(self._points, (capacity, 2))
+            self._cumulative = np.resize(self._cumulative, capacity)
+
+    def _update_cumulative(self, start):
+        """
+        Update the cumulative length from the specified point onwards
+        """
+        n = self._count
+        if start >= n:
+            return
+        if start == 0:
+            self._cumulative[0] = 0
+            start = 1
+        segment = np.hypot(*np.diff(self._points[start - 1:n], axis=0).T)
+        np.cumsum(segment, out=self._cumulative[start:n])
+        self._cumulative[start:n] += self._cumulative[start - 1]
+
+    def append(self, x, y):
+        n = self._count
+        self._reserve(n + 1)
+        self._points[n] = (x, y)
+        self._cumulative[n] = self._cumulative[n - 1] + np.hypot(x - self._points[n - 1, 0], y - self._points[n - 1, 1]) if n else 0
+        self._count += 1
+        self._times = self._angles = None
+        self.version += 1
+
+    def pop(self):
+        if self._count == 0:
+            raise IndexError('pop from an empty trajectory')
+        self._count -= 1
+        self._times = self._angles = None
+        self.version += 1
+        return tuple(self._points[self._count])
+
+    def insert(self, i, x, y):
+        n = self._count
+        self._reserve(n + 1)
+        self._points[i + 1:n + 1] = self._points[i:n].copy()
+        self._points[i] = (x, y)
+        self._count += 1
+        self._update_cumulative(i)
+        self._times = self._angles = None
+        self.version += 1
+
+    def remove(self, i):
+        point = tuple(self._points[i])
+        self._points[i:self._count - 1] = self._points[i + 1:self._count].copy()
+        self._count -= 1
+        self._update_cumulative(i)
+        self._times = self._angles = None
+        self.version += 1
+        return point
+
+    def move(self, i, x, y):
+        self._points[i] = (x, y)
+        self._update_cumulative(i)
+        self.version += 1
+
+    def clear(self):
+        self._count = 0
+        self._times = self._angles = None
+        self.version += 1
+
+    def replace(self, points, times=None, angles=None):
+        """
+        Replace all points, optionally with the explicit time (in seconds) and angle (in degrees) of each point,
+        e.g., for imported waypoints. The times should not decrease.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self._reserve(len(points))
+        self._points[:len(points)] = points
+        self._count = len(points)
+        self._update_cumulative(0)
+        if times is not None:
+            self._times = np.array(times, dtype=float).reshape(-1)
+            self._angles = np.array(angles, dtype=float).reshape(-1) if angles is not None else np.zeros(len(points))
+            if len(self._times) != len(points) or len(self._angles) != len(points):
+                self._times = self._angles = None
+                raise ValueError('the number of times and angles should match the number of points')
+            try:
+                check_times(self._times)
+            except ValueError:
+                self._times = self._angles = None
+                raise
+        else:
+            self._times = self._angles = None
+        self.version += 1
+
+    def simplify(self, tolerance, method=METHODS[0]):
+        """
+        Remove the points that are not needed to follow the path within the tolerance (in meter). This returns
+        the number of points before and after, and the largest deviation (in meter) from the original path.
+        """
+        if not self.has_scale:
+            raise ValueError('the scale should be positive')
+        points = self.as_array()
+        keep = simplify(points, tolerance * self.pixels_per_meter, method)
+        deviation = max_deviation(points, keep) / self.pixels_per_meter
+        before = self._count
+        self._points[:len(keep)] = points[keep]
+        self._count = len(keep)
+        self._update_cumulative(0)
+        if len(keep) < before:
+            self._times = self._angles = None
+        self.version += 1
+        return before, self._count, deviation
+
+    @property
+    def points(self):
+        """
+        The points as an (N,2) array, this is a view that should not be modified
+        """
+        return self._points[:self._count]
+
+    def as_array(self):
+        """
+        Return a copy of the points as an (N,2) array
+        """
+        return self.points.copy()
+
+    @property
+    def cumulative(self):
+        """
+        The cumulative length in pixels along the path
+        """
+        return self._cumulative[:self._count]
+
+    @property
+    def has_scale(self):
+        return self.pixels_per_meter > 0
+
+    @property
+    def fraction(self):
+        """
+        The fraction of the total length that has been covered at each point
+        """
+        length_pixels = self.length_pixels
+        if length_pixels > 0:
+            return self.cumulative / length_pixels
+        else:
+            return np.zeros(self._count)
+
+    @property
+    def has_timing(self):
+        return self._times is not None
+
+    def timing(self):
+        """
+        Return the explicit times and angles of the points, the times are stretched to the total duration
+        """
+        return self._times * self._time_scale(), self._angles
+
+    def _time_scale(self):
+        # The factor that stretches the explicit times to the total duration
+        last = self._times[-1]
+        return self.total_duration / last if self.total_duration > 0 and last > 0 else 1.0
+
+    @property
+    def has_profile(self):
+        return self.max_speed > 0 and self.max_acceleration > 0
+
+    def profile(self):
+        """
+        Return the sampled path, the waypoints and the minimum duration with the motion profile, see the
+        compute_profile() function. These are cached until the points or the settings change.
+        """
+        key = (self.route_key(), self.pixels_per_meter, self.total_duration, self.total_rotation, self.max_speed, self.max_acceleration, self.max_angular_speed, self.smooth)
+        if key != self._profile_key:
+            self._profile = compute_profile(self.route(), self.pixels_per_meter, self.total_duration, self.total_rotation, self.max_speed, self.max_acceleration, self.max_angular_speed, self.smooth)
+            self._profile_key = key
+        return self._profile
+
+    def route_key(self):
+        return (self.version, id(self.planner), self.planner.version, self.radius, self.draft) if self.planner else (self.version,)
+
+    def route(self):
+        """
+        Return the points or, with a planner, the route around the obstacles along the points. This is cached
+        until the points, the obstacles or the radius change. As a draft, the segments that were not planned
+        before are straight lines.
+        """
+        if self.planner is None:
+            return self.points
+        key = self.route_key()
+        if key != self._route_key:
+            self._route = self.planner.route(self.points, self.radius, self.draft)
+            self._route_key = key
+        return self._route
+
+    def routed(self):
+        """
+        Return the waypoints along the route at a constant speed, these are cached like the route
+        """
+        key = (self.route_key(), self.pixels_per_meter, self.total_duration, self.total_rotation)
+        if key != self._routed_key:
+            route = self.route()
+            self._routed = waypoints_from_cumulative(route, cumulative_length(route), self.pixels_per_meter, self.total_duration, self.total_rotation)
+            self._routed_key = key
+        return self._routed
+
+    @property
+    def path(self):
+        """
+        The path that is followed in image pixel coordinates, this consists of the points or the route along the
+        points or, with the motion profile, of the samples along the path
+        """
+        if self.has_timing:
+            return self.points
+        return self.profile()[0] if self.is_valid() and self.has_profile else self.route()
+
+    @property
+    def minimum_duration(self):
+        return self.profile()[2] if self.is_valid() and self.has_profile and not self.has_timing else 0
+
+    @property
+    def length_pixels(self):
+        return self._cumulative[self._count - 1] if self._count else 0
+
+    @property
+    def length_meter(self):
+        return self.length_pixels / self.pixels_per_meter if self.has_scale else 0
+
+    @property
+    def average_speed(self):
+        return self.length_meter / self.total_duration if self.total_duration > 0 else 0
+
+    @property
+    def angular_speed(self):
+        return self.total_rotation / self.total_duration if self.total_duration > 0 else 0
+
+    @property
+    def time(self):
+        """
+        The time in seconds of each waypoint, the time, x, y and angle all follow from the same waypoints
+        """
+        return self.waypoints()[:, 0]
+
+    @property
+    def x(self):
+        """
+        The stage x coordinate in meter, positive x is away from the audience, i.e., up in the image
+        """
+        return self.waypoints()[:, 1]
+
+    @property
+    def y(self):
+        """
+        The stage y coordinate in meter, positive y is to the left of the audience, i.e., left in the image
+        """
+        return self.waypoints()[:, 2]
+
+    @property
+    def angle(self):
+        """
+        The angle in degrees, positive angles are counter clockwise
+        """
+        return self.waypoints()[:, 3]
+
+    def is_valid(self):
+        return self._count > 0 and self.has_scale
+
+    def waypoint_count(self):
+        """
+        Return the number of waypoints, with the motion profile this is the number of samples along the path
+        """
+        if not self.is_valid():
+            return 0
+        if self.has_timing:
+            return self._count
+        if self.has_profile:
+            return len(self.profile()[1])
+        return len(self.routed()) if self.planner else self._count
+
+    def waypoint(self, i):
+        """
+        Return the time, x, y and angle of a single waypoint, this takes constant time
+        """
+        if self.has_timing:
+            x0, y0 = self._points[0]
+            x, y = self._points[i]
+            return (float(self._times[i] * self._time_scale()), -((y - y0) / self.pixels_per_meter), -((x - x0) / self.pixels_per_meter), float(self._angles[i]))
+        if self.has_profile:
+            return tuple(self.profile()[1][i].tolist())
+        if self.planner:
+            return tuple(self.routed()[i].tolist())
+        length_pixels = self.length_pixels
+        fraction = self._cumulative[i] / length_pixels if length_pixels > 0 else 0.0
+        x0, y0 = self._points[0]
+        x, y = self._points[i]
+        return (fraction * self.total_duration, -((y - y0) / self.pixels_per_meter), -((x - x0) / self.pixels_per_meter), fraction * self.total_rotation)
+
+    def waypoints(self):
+        """
+        Return an (N,4) array with the time, x, y and angle for each point, for each point along the route with a
+        planner, or for each sample along the path with the motion profile. This is empty if there is no valid scale.
+        """
+        if not self.is_valid():
+            return np.zeros((0, 4))
+        if self.has_timing:
+            waypoints = waypoints_from_cumulative(self.points, self.cumulative, self.pixels_per_meter, 0, 0)
+            waypoints[:, 0], waypoints[:, 3] = self.timing()
+            return waypoints
+        if self.has_profile:
+            return self.profile()[1].copy()
+        if self.planner:
+            return self.routed().copy()
+        return waypoints_from_cumulative(self.points, self.cumulative, self.pixels_per_meter, self.total_duration, self.total_rotation)
+
+    def timeline(self):
+        """
+        Return the (N,) times and the (N,2) positions in meter along the path, e.g., to compare the positions of
+        multiple robots on the same stage. The positions are in image orientation and relative to the image
+        rather than to the first point.
+        """
+        if not self.is_valid():
+            return np.zeros(0), np.zeros((0, 2))
+        if self.has_timing:
+            return self.timing()[0], self.points / self.pixels_per_meter
+        if self.has_profile:
+            path, waypoints, minimum_duration = self.profile()
+            return waypoints[:, 0], path / self.pixels_per_meter
+        if self.planner:
+            return self.routed()[:, 0], self.route() / self.pixels_per_meter
+        return self.fraction * self.total_duration, self.points / self.pixels_per_meter
+
+    def resample(self, rate, chunk_size=65536):
+        """
+        Return a generator with the waypoints at a fixed rate (in Hz), see the resample() function
+        """
+        return resample(self.waypoints(), rate, chunk_size)
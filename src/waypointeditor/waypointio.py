@@ -0,0 +1,199 @@
+"""
+Reading and writing of point lists and waypoints for the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+import math
+import itertools
+import numpy as np
+
+# The settings that can be specified together with the points in a JSON file
+SETTINGS = ('pixels_per_meter', 'total_duration', 'total_rotation', 'max_speed', 'max_acceleration', 'max_angular_speed')
+
+# The binary waypoint files consist of records with four little-endian float32 values
+RECORD = np.dtype('<f4')
+
+# The number of waypoints that are formatted and written at once
+CHUNK_SIZE = 65536
+
+# The default rate in Hz and UDP port of the waypoints that are streamed to the robots, see the playback module
+RATE = 50
+PORT = 9000
+
+
+def isnumber(s):
+    try:
+        float(s)
+        return True
+    except ValueError:
+        return False
+
+
+def check_times(times):
+    """
+    Check that the times of the waypoints do not decrease, e.g., after editing them in a spreadsheet. A
+    ValueError reports the first waypoint that is earlier than the one before it, counting from one.
+    """
+    times = np.asarray(times, dtype=float).reshape(-1)
+    earlier = np.flatnonzero(np.diff(times) < 0)
+    if len(earlier):
+        row = earlier[0] + 1
+        raise ValueError(f'waypoint {row + 1} has an earlier time ({times[row]:g}) than waypoint {row} ({times[row - 1]:g})')
+
+
+def read_points(file_name):
+    """
+    Read a list of points in image pixel coordinates from a JSON or CSV file. This returns an (N,2) array with
+    the points and a dictionary with the settings that were specified in the file.
+
+    The JSON file can contain a list of [x, y] pairs, or an object with "points" and optionally the settings.
+    The CSV file should have the x and y coordinates in the first two columns, the first line can be a header.
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension == '.json':
+        with open(file_name) as f:
+            content = json.load(f)
+        if isinstance(content, dict):
+            settings = {key: float(content[key]) for key in SETTINGS if content.get(key) is not None}
+            points = content.get('points', [])
+        else:
+            settings = {}
+            points = content
+        points = np.array(points, dtype=float).reshape(-1, 2)
+    elif extension == '.csv':
+        with open(file_name) as f:
+            first = f.readline()
+            header = 0 if all(isnumber(s) for s in first.split(',')[:2]) else 1
+            f.seek(0)
+            points = np.loadtxt(f, delimiter=',', skiprows=header, usecols=(0, 1), ndmin=2)
+        settings = {}
+    else:
+        raise ValueError(f'unsupported file format "{extension}"')
+    return points.reshape(-1, 2), settings
+
+
+def read_waypoints(file_name, chunk_size=CHUNK_SIZE):
+    """
+    Read the waypoints from a CSV file as written by write_csv() or from a binary file, this returns an (N,4)
+    array with the time, x, y and angle. The times should not decrease.
+
+    The CSV file is parsed in chunks of lines, so that files with hundreds of thousands of waypoints are read
+    quickly and without holding the text in memory. It can have a header, and it can also be saved by a
+    spreadsheet program with semicolons or tabs as delimiter and decimal commas. Without an angle column the
+    angle is zero.
+    """
+    if os.path.splitext(file_name)[1].lower() == '.bin':
+        waypoints = read_binary(file_name).astype(float)
+        check_times(waypoints[:, 0])
+        return waypoints
+    with open(file_name) as f:
+        first = ''
+        for first in f:
+            if first.strip():
+                break
+        delimiter = ';' if ';' in first else '\t' if '\t' in first else ','
+        comma = delimiter != ','  # decimal commas are only possible with another delimiter
+        fields = [s.strip() for s in first.split(delimiter)]
+        columns = min(4, len(fields))
+        if columns < 3:
+            raise ValueError(f'"{file_name}" should have the time, x, y and angle in the first columns')
+        header = not all(isnumber(s.replace(',', '.') if comma else s) for s in fields[:columns])
+        blocks = []
+        lines = [] if header or not first.strip() else [first]
+        while True:
+            lines.extend(itertools.islice(f, chunk_size - len(lines)))
+            if not lines:
+                break
+            lines = [line.replace(',', '.') if comma else line for line in lines if line.strip()]
+            if lines:
+                blocks.append(np.loadtxt(lines, delimiter=delimiter, usecols=range(columns), ndmin=2))
+                lines = []
+    waypoints = np.zeros((sum(len(block) for block in blocks), 4))
+    start = 0
+    for block in blocks:
+        waypoints[start:start + len(block), :block.shape[1]] = block
+        start += len(block)
+    check_times(waypoints[:, 0])
+    return waypoints
+
+
+def format_csv(waypoints, decimals=1):
+    """
+    Format an (N,4) array with waypoints as CSV text, this is the same as in the "Waypoints as CSV" tab. The
+    number of decimals of the time can be increased, e.g., for waypoints that are resampled at a high rate.
+    """
+    return ''.join(f'{time:.{decimals}f},{x:.3f},{y:.3f},{angle:.0f}\n' for time, x, y, angle in waypoints)
+
+
+def time_decimals(rate=None):
+    """
+    Return the number of decimals that is needed for the time of waypoints at the specified rate (in Hz)
+    """
+    return max(1, math.ceil(math.log10(rate))) if rate else 1
+
+
+def chunks(waypoints, size=CHUNK_SIZE):
+    """
+    Split an (N,4) array into chunks, an iterable of chunks (e.g., from a generator) is passed through as it is
+    """
+    if isinstance(waypoints, np.ndarray):
+        for i in range(0, len(waypoints), size):
+            yield waypoints[i:i + size]
+    else:
+        yield from waypoints
+
+
+def write_csv(file, waypoints, decimals=1):
+    """
+    Write the waypoints as CSV to a file name or an open text file. The waypoints can be an (N,4) array or an
+    iterable of (M,4) arrays; they are formatted and written one chunk at a time.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'w') as f:
+            return write_csv(f, waypoints, decimals)
+    count = 0
+    for chunk in chunks(waypoints):
+        file.write(format_csv(chunk, decimals))
+        count += len(chunk)
+    return count
+
+
+def write_binary(file, waypoints):
+    """
+    Write the waypoints to a file name or an open binary file as fixed-width records with four little-endian
+    float32 values (time, x, y, angle), i.e., 16 bytes per waypoint without a header. This can be memory-mapped
+    or read directly on small controllers.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'wb') as f:
+            return write_binary(f, waypoints)
+    count = 0
+    for chunk in chunks(waypoints):
+        file.write(np.ascontiguousarray(chunk, dtype=RECORD).tobytes())
+        count += len(chunk)
+    return count
+
+
+def read_binary(file_name, mmap=False):
+    """
+    Read the waypoints from a binary file as an (N,4) float32 array, optionally memory-mapped
+    """
+    if mmap:
+        return np.memmap(file_name, dtype=RECORD, mode='r').reshape(-1, 4)
+    return np.fromfile(file_name, dtype=RECORD).reshape(-1, 4)
@@ -0,0 +1,60 @@
+"""
+Tests of the collision checker of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pytest
+
+from waypointeditor.choreography import find_conflicts
+
+
+def line(start, stop, duration=10):
+    return np.array([0, duration]), np.array([start, stop], dtype=float)
+
+
+def test_crossing():
+    # Two robots cross in the middle of the stage after 5 seconds
+    conflicts = find_conflicts(['a', 'b'], [line((0, 0), (4, 4)), line((4, 0), (0, 4))], 0.5)
+    assert len(conflicts) == 1
+    conflict = conflicts[0]
+    assert (conflict.first, conflict.second) == ('a', 'b')
+    assert conflict.start < 5 < conflict.stop
+    assert conflict.distance < 0.1
+
+
+def test_apart():
+    timelines = [line((0, 0), (4, 0)), line((0, 1), (4, 1)), line((0, 2), (4, 2))]
+    assert find_conflicts(['a', 'b', 'c'], timelines, 0.5) == []
+    conflicts = find_conflicts(['a', 'b', 'c'], timelines, 1.5)
+    assert [(c.first, c.second) for c in conflicts] == [('a', 'b'), ('b', 'c')]
+    assert all(c.start == 0 and c.stop == 10 for c in conflicts)
+
+
+def test_finished():
+    # A robot stays at its last position after it finished, and at its first position before it starts
+    waiting = (np.array([20, 30]), np.array([[4, 4], [0, 0]], dtype=float))
+    conflicts = find_conflicts(['a', 'b'], [line((0, 0), (4, 4)), waiting], 0.5)
+    assert len(conflicts) == 1
+    assert conflicts[0].stop > 20
+
+
+def test_clearance():
+    with pytest.raises(ValueError):
+        find_conflicts(['a', 'b'], [line((0, 0), (1, 1)), line((1, 1), (0, 0))], 0)
+    with pytest.raises(ValueError):
+        find_conflicts(['a', 'b'], [line((0, 0), (1, 1)), line((1, 1), (0, 0))], False)
@@ -0,0 +1,60 @@
+"""
+Tests of the command line interface of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import numpy as np
+import pytest
+
+from waypointeditor.compiler import main
+from waypointeditor.trajectory import compute_waypoints
+from waypointeditor.waypointio import read_waypoints
+
+
+def run(*argv):
+    with pytest.raises(SystemExit) as exit:
+        main(list(argv))
+    return exit.value.code
+
+
+def test_compile(tmp_path):
+    (tmp_path / 'input').mkdir()
+    points = [[0, 0], [300, 0], [300, 300]]
+    (tmp_path / 'input' / 'first.json').write_text(json.dumps({'points': points, 'pixels_per_meter': 300, 'total_duration': 10}))
+    (tmp_path / 'input' / 'second.csv').write_text('x,y\n0,0\n150,0\n')
+    assert run('compile', str(tmp_path / 'input'), '-o', str(tmp_path / 'output'), '--scale', '300', '-q', '-j', '1') == 0
+    assert np.allclose(read_waypoints(str(tmp_path / 'output' / 'first.csv')), compute_waypoints(np.array(points), 300, 10), atol=0.05)
+    assert len(read_waypoints(str(tmp_path / 'output' / 'second.csv'))) == 2
+
+
+def test_same_name(tmp_path, capsys):
+    # Input files with the same name would be written to the same waypoint file, neither is written
+    (tmp_path / 'input').mkdir()
+    (tmp_path / 'input' / 'show.json').write_text('[[0, 0], [300, 0]]')
+    (tmp_path / 'input' / 'show.csv').write_text('0,0\n0,300\n')
+    (tmp_path / 'input' / 'other.csv').write_text('0,0\n0,300\n')
+    assert run('compile', str(tmp_path / 'input'), '-o', str(tmp_path / 'output'), '--scale', '300', '-j', '1') == 1
+    assert sorted(path.name for path in (tmp_path / 'output').iterdir()) == ['other.csv']
+    output = capsys.readouterr()
+    assert 'show.json' in output.err and 'show.csv' in output.err
+    assert 'compiled 1 of 3 files' in output.out
+
+
+def test_missing_scale(tmp_path):
+    (tmp_path / 'show.csv').write_text('0,0\n0,300\n')
+    assert run('compile', str(tmp_path / 'show.csv'), '-o', str(tmp_path / 'output'), '-q') == 1
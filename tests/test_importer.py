@@ -0,0 +1,123 @@
+"""
+Tests of the import of waypoints and of paths from other programs into the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pytest
+
+from waypointeditor.importer import read_gpx, read_svg, parse_svg_path, EARTH_RADIUS
+from waypointeditor.trajectory import Trajectory, points_from_waypoints
+from waypointeditor.waypointio import read_waypoints, write_csv, write_binary
+
+GPX = """<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">
+  <trk>
+    <name>Parade</name>
+    <trkseg>
+      <trkpt lat="52.0" lon="5.0"><time>2025-05-01T12:00:00Z</time></trkpt>
+      <trkpt lat="52.0001" lon="5.0"><time>2025-05-01T12:00:10Z</time></trkpt>
+      <trkpt lat="52.0001" lon="5.0001"><time>2025-05-01T12:00:30Z</time></trkpt>
+    </trkseg>
+  </trk>
+  <rte>
+    <rtept lat="52.0" lon="5.0"/>
+    <rtept lat="52.0" lon="5.001"/>
+  </rte>
+</gpx>
+"""
+
+SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="400" height="300">
+  <polyline id="zigzag" points="0,0 10,10 20,0"/>
+  <polygon points="0,0 10,0 10,10"/>
+  <line x1="5" y1="5" x2="50" y2="5"/>
+  <path d="M 0 0 L 10 0 M 20 20 l 5 5 h 5 z"/>
+</svg>
+"""
+
+
+def test_roundtrip(tmp_path):
+    # The exported waypoints are converted back to the same points, with the time and angle of each waypoint
+    trajectory = Trajectory([(100, 100), (400, 100), (400, 500)], 100, 10, 90)
+    waypoints = trajectory.waypoints()
+    for name, write in (('waypoints.csv', write_csv), ('waypoints.bin', write_binary)):
+        write(str(tmp_path / name), waypoints)
+        loaded = read_waypoints(str(tmp_path / name))
+        # The CSV file has the time with one decimal, the position in millimeter and the angle in whole degrees
+        assert np.all(np.abs(loaded - waypoints) <= [0.05, 5e-4, 5e-4, 0.5])
+        assert np.allclose(points_from_waypoints(loaded, (100, 100), 100), trajectory.points, atol=0.1)
+
+
+def test_spreadsheet(tmp_path):
+    # A header, semicolons and decimal commas, and no angle column
+    file_name = tmp_path / 'waypoints.csv'
+    file_name.write_text('time;x;y\n0,0;0,000;0,000\n\n1,5;0,250;-1,000\n')
+    assert np.allclose(read_waypoints(str(file_name), chunk_size=1), [[0, 0, 0, 0], [1.5, 0.25, -1, 0]])
+    file_name.write_text('0,0\n1,1\n')
+    with pytest.raises(ValueError):
+        read_waypoints(str(file_name))
+
+
+def test_gpx(tmp_path):
+    file_name = tmp_path / 'parade.gpx'
+    file_name.write_text(GPX)
+    track, route = read_gpx(str(file_name))
+    assert track.name == 'Parade'
+    assert route.name == 'parade 2'
+    north = np.radians(0.0001) * EARTH_RADIUS
+    east = north * np.cos(np.radians(52))
+    assert np.allclose(track.points, [[0, 0], [0, north], [east, north]])
+    assert np.allclose(track.times, [0, 10, 30])
+    assert route.times is None
+    assert np.isclose(route.points[1, 0], 10 * east)
+
+
+def test_svg(tmp_path):
+    file_name = tmp_path / 'stage.svg'
+    file_name.write_text(SVG)
+    paths = read_svg(str(file_name))
+    assert [path.name for path in paths] == ['zigzag', 'stage 2', 'stage 3', 'stage 4', 'stage 5']
+    assert np.array_equal(paths[0].points, [[0, 0], [10, 10], [20, 0]])
+    assert np.array_equal(paths[1].points, [[0, 0], [10, 0], [10, 10], [0, 0]])
+    assert np.array_equal(paths[4].points, [[20, 20], [25, 25], [30, 25], [20, 20]])
+
+
+def test_svg_path():
+    # The curves are replaced by their end points, relative commands follow the current position
+    subpaths = parse_svg_path('m10,10 c 1,1 2,2 5,0 S 30,30 40,40 v-10 H0')
+    assert len(subpaths) == 1
+    assert np.array_equal(subpaths[0], [[10, 10], [15, 10], [40, 40], [40, 30], [0, 30]])
+    with pytest.raises(ValueError):
+        parse_svg_path('10,10 20,20')
+    with pytest.raises(ValueError):
+        parse_svg_path('M 10')
+
+
+def test_decreasing_times(tmp_path):
+    # A time that was edited in a spreadsheet to be earlier than the waypoint before it is reported with its row
+    waypoints = np.array([[0, 0, 0, 0], [5, 1, 0, 0], [3, 2, 0, 0], [6, 3, 0, 0]])
+    for name, write in (('waypoints.csv', write_csv), ('waypoints.bin', write_binary)):
+        write(str(tmp_path / name), waypoints)
+        with pytest.raises(ValueError, match='waypoint 3 has an earlier time'):
+            read_waypoints(str(tmp_path / name))
+    trajectory = Trajectory([(0, 0), (100, 0), (200, 0), (300, 0)], 100)
+    with pytest.raises(ValueError, match='waypoint 3'):
+        trajectory.replace(trajectory.points, waypoints[:, 0], waypoints[:, 3])
+    assert not trajectory.has_timing
+    # Waypoints with the same time, e.g., a rotation on the spot, are allowed
+    trajectory.replace(trajectory.points, [0, 1, 1, 2])
+    assert trajectory.has_timing
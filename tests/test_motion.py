@@ -0,0 +1,109 @@
+"""
+Tests of the motion profile of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pytest
+
+from waypointeditor.motion import speed_profile, travel_time, curvature
+from waypointeditor.trajectory import compute_profile
+
+PIXELS_PER_METER = 100
+TOLERANCE = 1e-9
+
+
+def segment_speed(waypoints):
+    # The average speed and angular speed between the waypoints
+    dt = np.diff(waypoints[:, 0])
+    ds = np.hypot(np.diff(waypoints[:, 1]), np.diff(waypoints[:, 2]))
+    return ds / dt, np.abs(np.diff(waypoints[:, 3])) / dt
+
+
+def test_speed_profile():
+    # The speed starts and ends at rest, and stays within the speed and acceleration limits
+    rng = np.random.default_rng(15)
+    cumulative = np.cumsum(rng.uniform(0, 0.1, 500))
+    limit = rng.uniform(0.5, 2, 500)
+    speed = speed_profile(cumulative, limit, 0.8)
+    assert speed[0] == 0 and speed[-1] == 0
+    assert np.all(speed[1:-1] <= limit[1:-1] + TOLERANCE)
+    assert np.all(np.abs(np.diff(speed ** 2)) <= 2 * 0.8 * np.diff(cumulative) + TOLERANCE)
+    # Each sample is at its limit, or at the limit of the acceleration from a neighbour
+    reached = np.isclose(speed[1:-1], limit[1:-1]) | np.isclose(speed[1:-1] ** 2, speed[:-2] ** 2 + 2 * 0.8 * np.diff(cumulative)[:-1]) | np.isclose(speed[1:-1] ** 2, speed[2:] ** 2 + 2 * 0.8 * np.diff(cumulative)[1:])
+    assert np.all(reached)
+    assert len(speed_profile([], [], 1)) == 0
+
+
+def test_straight():
+    # A straight line of 10 meter accelerates to the maximum speed, cruises and decelerates
+    points = [(0, 0), (10 * PIXELS_PER_METER, 0)]
+    path, waypoints, minimum_duration = compute_profile(points, PIXELS_PER_METER, 0, 0, 2.0, 0.5)
+    assert minimum_duration == pytest.approx(10 / 2.0 + 2.0 / 0.5)
+    speed, angular_speed = segment_speed(waypoints)
+    assert np.all(speed <= 2.0 + TOLERANCE)
+    assert speed.max() == pytest.approx(2.0)
+    assert len(path) == len(waypoints)
+    # A longer duration slows down the whole profile
+    path, waypoints, minimum_duration = compute_profile(points, PIXELS_PER_METER, 2 * minimum_duration, 0, 2.0, 0.5)
+    assert waypoints[-1, 0] == pytest.approx(2 * minimum_duration)
+    assert segment_speed(waypoints)[0].max() == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize('smooth', [False, True])
+def test_curves(smooth):
+    # The lateral acceleration in the curves stays within the limit
+    points = [(0, 0), (300, 0), (300, 300), (600, 300), (600, 0), (900, 100)]
+    path, waypoints, minimum_duration = compute_profile(points, PIXELS_PER_METER, 0, 0, 3.0, 0.5, smooth=smooth)
+    speed, angular_speed = segment_speed(waypoints)
+    assert np.all(speed <= 3.0 + TOLERANCE)
+    # The acceleration is constant between the samples, so that the speed at each sample follows from the average
+    sample = np.zeros(len(path))
+    for i in range(len(speed)):
+        sample[i + 1] = 2 * speed[i] - sample[i]
+    assert abs(sample[-1]) < 1e-6
+    lateral = curvature(path) * PIXELS_PER_METER * sample ** 2
+    assert np.all(lateral <= 0.5 + 1e-6)
+    assert lateral.max() == pytest.approx(0.5)
+
+
+def test_angular_speed():
+    # A large rotation is limited by the maximum angular speed, the rotation is proportional to the distance
+    points = [(0, 0), (10 * PIXELS_PER_METER, 0)]
+    path, waypoints, minimum_duration = compute_profile(points, PIXELS_PER_METER, 0, 720, 2.0, 0.5, 90)
+    assert minimum_duration >= 720 / 90
+    speed, angular_speed = segment_speed(waypoints)
+    assert np.all(angular_speed <= 90 + TOLERANCE)
+    assert angular_speed.max() == pytest.approx(90)
+    assert waypoints[-1, 3] == pytest.approx(720)
+    # Without a maximum angular speed the rotation does not slow down the robot
+    path, waypoints, unlimited = compute_profile(points, PIXELS_PER_METER, 0, 720, 2.0, 0.5)
+    assert unlimited < minimum_duration
+
+
+def test_travel_time():
+    # A constant acceleration from rest covers the distance in sqrt(2 s / a)
+    cumulative = np.linspace(0, 2, 101)
+    speed = np.sqrt(2 * 0.5 * cumulative)
+    assert travel_time(cumulative, speed)[-1] == pytest.approx(np.sqrt(2 * 2 / 0.5))
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        compute_profile([(0, 0), (100, 0)], 0, 0, 0, 1, 1)
+    with pytest.raises(ValueError):
+        compute_profile([(0, 0), (100, 0)], PIXELS_PER_METER, 0, 0, 0, 1)
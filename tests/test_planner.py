@@ -0,0 +1,130 @@
+"""
+Tests of the routes around the obstacles on the stage plan of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+
+from waypointeditor.planner import Planner, astar, coarse_astar
+from waypointeditor.trajectory import Trajectory
+
+PIXELS_PER_METER = 100
+
+
+def wall(planner):
+    # A wall across the middle of a 4x3 meter stage, with an opening at the bottom
+    for y in range(0, 220, 10):
+        planner.paint(200, y, 10)
+
+
+def clear_of_obstacles(planner, route, radius):
+    # Check the samples along each segment of the route against the obstacles
+    free = planner.free(radius)
+    for a, b in zip(route[:-1], route[1:]):
+        for fraction in np.linspace(0, 1, 50):
+            row, col = planner.to_cell(*(a + (b - a) * fraction))
+            if not free[row, col]:
+                return False
+    return True
+
+
+def test_straight():
+    planner = Planner(400, 300, PIXELS_PER_METER)
+    route = planner.route([(50, 50), (350, 50), (350, 250)], 0.1)
+    assert np.array_equal(route, [(50, 50), (350, 50), (350, 250)])
+
+
+def test_around():
+    planner = Planner(400, 300, PIXELS_PER_METER)
+    wall(planner)
+    route = planner.route([(50, 50), (350, 50)], 0.1)
+    assert len(route) > 2
+    assert np.array_equal(route[0], (50, 50)) and np.array_equal(route[-1], (350, 50))
+    assert route[:, 1].max() > 220
+    assert clear_of_obstacles(planner, route, 0.1)
+
+
+def test_changed():
+    planner = Planner(400, 300, PIXELS_PER_METER)
+    trajectory = Trajectory([(50, 50), (350, 50)], PIXELS_PER_METER)
+    trajectory.planner = planner
+    assert len(trajectory.route()) == 2
+    key = trajectory.route_key()
+    wall(planner)
+    assert trajectory.route_key() != key
+    assert len(trajectory.route()) > 2
+    trajectory.radius = 0.3
+    assert trajectory.route_key() != key
+    assert clear_of_obstacles(planner, trajectory.route(), 0.3)
+    planner.clear_painted()
+    assert len(trajectory.route()) == 2
+
+
+def test_blocked():
+    # Without a route the robot goes straight, e.g., when the goal is inside an obstacle
+    planner = Planner(400, 300, PIXELS_PER_METER)
+    planner.paint(350, 50, 30)
+    assert np.array_equal(planner.route([(50, 50), (350, 50)], 0.1), [(50, 50), (350, 50)])
+    planner.paint(350, 50, 30, obstacle=False)
+    assert np.array_equal(planner.route([(50, 50), (350, 50)], 0.1), [(50, 50), (350, 50)])
+
+
+def length(cells):
+    return sum(np.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(cells[:-1], cells[1:]))
+
+
+def test_coarse():
+    # On a large stage the coarse search finds a path around the walls that is close to the shortest one
+    planner = Planner(4000, 3000, PIXELS_PER_METER)
+    for y in range(0, 2600, 10):
+        planner.paint(2000, y, 10)
+    for y in range(400, 3000, 10):
+        planner.paint(1000, y, 10)
+    free = planner.free(0.3)
+    start, goal = planner.to_cell(50, 2900), planner.to_cell(3950, 50)
+    cells = coarse_astar(free, start, goal)
+    assert cells[0] == start and cells[-1] == goal
+    assert all(free[cell] for cell in cells)
+    assert all(max(abs(b[0] - a[0]), abs(b[1] - a[1])) == 1 for a, b in zip(cells[:-1], cells[1:]))
+    assert length(cells) < 1.05 * length(astar(free, start, goal))
+
+
+def test_narrow():
+    # A passage that is narrower than the coarse cells is found on the fine grid
+    free = np.ones((300, 400), dtype=bool)
+    free[:, 200] = False
+    free[150, 200] = True
+    cells = coarse_astar(free, (10, 10), (10, 390))
+    assert (150, 200) in cells
+    assert coarse_astar(free, (10, 10), (10, 390), size=1000) == cells
+    free[150, 200] = False
+    assert coarse_astar(free, (10, 10), (10, 390)) is None
+
+
+def test_draft():
+    # While a point is dragged only the routes that were planned before go around the obstacles
+    planner = Planner(400, 300, PIXELS_PER_METER)
+    wall(planner)
+    trajectory = Trajectory([(50, 50), (350, 50)], PIXELS_PER_METER)
+    trajectory.planner = planner
+    planned = trajectory.route()
+    trajectory.draft = True
+    assert np.array_equal(trajectory.route(), planned)
+    trajectory.move(1, 350, 60)
+    assert np.array_equal(trajectory.route(), [(50, 50), (350, 60)])
+    trajectory.draft = False
+    assert len(trajectory.route()) > 2
@@ -0,0 +1,88 @@
+"""
+Tests of the real-time playback and streaming of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import numpy as np
+import pytest
+
+from waypointeditor.playback import interpolate, encode_osc, decode_osc, encode_json, decode_json, create_sender, MQTTSender, UDPSender, Playback, Receiver, play, receive
+
+WAYPOINTS = np.array([[0, 0, 0, 0], [1, 1, 0, 90], [3, 1, 2, 90]], dtype=float)
+
+
+def test_interpolate():
+    assert np.allclose(interpolate(WAYPOINTS, -1), [-1, 0, 0, 0])
+    assert np.allclose(interpolate(WAYPOINTS, 0.5), [0.5, 0.5, 0, 45])
+    assert np.allclose(interpolate(WAYPOINTS, 2), [2, 1, 1, 90])
+    assert np.allclose(interpolate(WAYPOINTS, 5), [5, 1, 2, 90])
+
+
+def test_encode():
+    sample = np.array([1.5, 0.25, -1, 90])
+    robot, decoded, sent = decode_osc(encode_osc('Robot 1', sample, 123.5))
+    assert robot == 'Robot_1' and np.allclose(decoded, sample) and sent == 123.5
+    robot, decoded, sent = decode_json(encode_json('Robot 1', sample, 123.5))
+    assert robot == 'Robot 1' and np.allclose(decoded, sample) and sent == 123.5
+
+
+def test_create_sender():
+    sender = create_sender('mqtt://broker/stage')
+    assert isinstance(sender, MQTTSender) and (sender.host, sender.port, sender.topic) == ('broker', 1883, 'stage')
+    sender = create_sender('localhost:9001')
+    assert isinstance(sender, UDPSender) and sender.port == 9001
+    with pytest.raises(ValueError):
+        create_sender('http://localhost')
+
+
+def test_loopback():
+    # Play the waypoints over UDP on the loopback interface and receive them again
+    async def run(playback, receiver):
+        task = asyncio.create_task(receive(receiver, '127.0.0.1', 0, 2))
+        await asyncio.sleep(0.1)
+        port = receiver.transport.get_extra_info('sockname')[1]
+        await play(playback, [f'osc://127.0.0.1:{port}'])
+        await asyncio.sleep(0.1)  # the last setpoint is still underway
+        task.cancel()
+
+    class Recorder(Receiver):
+        def connection_made(self, transport):
+            self.transport = transport
+
+    received = []
+    playback = Playback({'a': WAYPOINTS}, rate=50, speed=10)
+    receiver = Recorder(osc=True, callback=lambda robot, sample, sent: received.append(sample))
+    asyncio.run(run(playback, receiver))
+    assert playback.time == pytest.approx(3)
+    assert len(received) == 16 - playback.skipped
+    assert np.allclose(received[-1], WAYPOINTS[-1])
+
+
+def test_mqtt_closed():
+    # A server that closes the connection, e.g., on the wrong port, is reported as a ConnectionError
+    async def run():
+        async def close(reader, writer):
+            await reader.read(100)
+            writer.close()
+        server = await asyncio.start_server(close, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            await play(Playback({'a': WAYPOINTS}), [f'mqtt://127.0.0.1:{port}/stage'])
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
@@ -0,0 +1,120 @@
+"""
+Tests of the project files and the autosave journal of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pytest
+
+from waypointeditor import project
+from waypointeditor.trajectory import Trajectory
+
+
+def example():
+    result = project.Project()
+    result.template = [4, 3]
+    result.pixels_per_meter = 300
+    result.robots['first'] = Trajectory([(0, 0), (300, 0), (300, 300)], 300, 10, 90)
+    result.robots['second'] = Trajectory([(600, 600), (900, 600)], 300)
+    result.robots['second'].replace([(600, 600), (900, 600)], [0, 4], [0, 45])
+    result.robots['second'].max_speed = 1.5
+    result.avoid.add('first')
+    result.robot = 'second'
+    result.painted = np.zeros((30, 40), dtype=np.int8)
+    result.painted[5:10, 5:10] = 1
+    return result
+
+
+def test_save_load(tmp_path):
+    original = example()
+    file_name = str(tmp_path / 'show.wpe')
+    project.save(file_name, original)
+    loaded = project.load(file_name)
+    assert loaded.template == [4, 3]
+    assert loaded.robot == 'second'
+    assert loaded.avoid == {'first'}
+    assert list(loaded.robots) == ['first', 'second']
+    for name, trajectory in original.robots.items():
+        assert np.array_equal(loaded.robots[name].points, trajectory.points)
+        assert loaded.settings(name) == original.settings(name)
+        assert np.allclose(loaded.robots[name].waypoints(), trajectory.waypoints())
+    assert loaded.robots['second'].has_timing
+    assert np.array_equal(loaded.painted, original.painted)
+
+
+def test_load_invalid(tmp_path):
+    file_name = tmp_path / 'other.wpe'
+    file_name.write_bytes(b'not a project file at all')
+    with pytest.raises(ValueError):
+        project.load(str(file_name))
+    file_name.write_bytes(b'')
+    with pytest.raises(ValueError):
+        project.load(str(file_name))
+    file_name.write_bytes(project.MAGIC + b'\1\0')
+    with pytest.raises(ValueError):
+        project.load(str(file_name))
+    # A file that was cut off in the header or in the binary block
+    project.save(str(file_name), example())
+    data = file_name.read_bytes()
+    for size in (project.PREFIX.size + 10, len(data) - 8):
+        file_name.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            project.load(str(file_name))
+
+
+def test_replay(tmp_path):
+    journal = project.Journal(str(tmp_path / 'autosave.journal'))
+    journal.record('template', 4, 3)
+    journal.record('new_robot', 'Robot 1')
+    journal.record('settings', 'Robot 1', {'pixels_per_meter': 300, 'total_duration': 5, 'avoid_obstacles': True})
+    for x, y in [(0, 0), (300, 0), (300, 300)]:
+        journal.record('edit', 'Robot 1', 'append', x, y)
+    journal.record('edit', 'Robot 1', 'replace', np.array([[0, 0], [600, 0.5]]), np.array([0, 2.5]), np.array([0, 90]))
+    journal.record('new_robot', 'Robot 2')
+    journal.record('rename_robot', 'Robot 1', 'Lead')
+    journal.record('paint', 10, 10, 5, True)
+    journal.close()
+    with open(journal.file_name, 'a') as f:
+        f.write('["edit", "Lead", "app')  # the last change was not completely written
+
+    replayed = project.replay(journal.file_name)
+    assert replayed.template == [4, 3]
+    assert list(replayed.robots) == ['Lead', 'Robot 2']
+    assert replayed.robot == 'Robot 2'
+    assert replayed.avoid == {'Lead'}
+    lead = replayed.robots['Lead']
+    assert lead.pixels_per_meter == 300 and lead.total_duration == 5
+    assert np.array_equal(lead.points, [[0, 0], [600, 0.5]])
+    assert np.array_equal(lead.timing()[0], [0, 5])
+    assert replayed.strokes == [(10, 10, 5, True)]
+
+
+def test_has_changes(tmp_path):
+    journal = project.Journal(str(tmp_path / 'autosave.journal'))
+    assert not journal.has_changes()
+    journal.snapshot([('template', 4, 3), ('new_robot', 'Robot 1')])
+    assert not journal.has_changes()
+    journal.record('edit', 'Robot 1', 'append', 10, 10)
+    assert journal.has_changes()
+    journal.reset()
+    assert not journal.has_changes()
+    # A journal without a snapshot, e.g., next to a project file, has changes as soon as it is not empty
+    journal.record('select_robot', 'Robot 1')
+    assert journal.has_changes()
+    journal.close()
+    replayed = project.replay(journal.file_name)
+    assert replayed.robot == 'Robot 1'
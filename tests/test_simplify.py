@@ -0,0 +1,87 @@
+"""
+Tests of the simplification of the paths of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pytest
+
+from waypointeditor.simplify import METHODS, simplify, visvalingam, max_deviation, segment_distance
+
+
+def random_walk(n, seed=14):
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.normal(0, 10, (n, 2)), axis=0)
+
+
+def reference_visvalingam(points, tolerance):
+    # Remove the point with the smallest distance one at a time, without a priority queue
+    points = np.asarray(points, dtype=float)
+    keep = list(range(len(points)))
+    costs = {i: segment_distance(points[i], points[i - 1], points[i + 1]) for i in range(1, len(points) - 1)}
+    while len(keep) > 2:
+        k = min(range(1, len(keep) - 1), key=lambda k: (costs[keep[k]], keep[k]))
+        c = costs[keep[k]]
+        if c > tolerance:
+            break
+        del keep[k]
+        for j in (k - 1, k):
+            if 0 < j < len(keep) - 1:
+                costs[keep[j]] = max(c, segment_distance(points[keep[j]], points[keep[j - 1]], points[keep[j + 1]]))
+    return np.array(keep)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_endpoints(method):
+    # The first and last point are always kept, a straight line only keeps these
+    points = random_walk(200)
+    keep = simplify(points, 25, method)
+    assert keep[0] == 0 and keep[-1] == len(points) - 1
+    assert np.all(np.diff(keep) > 0)
+    line = np.column_stack([np.linspace(0, 100, 11), np.linspace(0, 50, 11)])
+    assert np.array_equal(simplify(line, 0, method), [0, 10])
+    for n in range(3):
+        assert np.array_equal(simplify(points[:n], 25, method), np.arange(n))
+
+
+def test_douglas_peucker():
+    # All removed points are within the tolerance
+    points = random_walk(1000)
+    for tolerance in (1, 10, 50):
+        keep = simplify(points, tolerance, 'douglas-peucker')
+        assert max_deviation(points, keep) <= tolerance
+    assert len(simplify(points, 0, 'douglas-peucker')) == len(points)
+
+
+def test_visvalingam():
+    points = random_walk(300)
+    for tolerance in (0, 5, 20, 100):
+        assert np.array_equal(visvalingam(points, tolerance), reference_visvalingam(points, tolerance))
+    # A zigzag with a larger amplitude than the tolerance is kept as a whole
+    zigzag = np.column_stack([np.arange(10) * 10, np.arange(10) % 2 * 10])
+    assert len(visvalingam(zigzag, 5)) == 10
+    assert np.array_equal(visvalingam(zigzag, 10), [0, 9])
+    # Fewer points are kept with a larger tolerance
+    counts = [len(visvalingam(points, tolerance)) for tolerance in (1, 5, 20, 100)]
+    assert counts == sorted(counts, reverse=True)
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        simplify(random_walk(10), -1)
+    with pytest.raises(ValueError):
+        simplify(random_walk(10), 1, 'unknown')
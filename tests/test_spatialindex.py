@@ -0,0 +1,104 @@
+"""
+Tests of the spatial index of the points and segments of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import math
+import random
+
+from waypointeditor.spatialindex import GridIndex
+
+RADIUS = 40
+
+
+def nearest_point(points, x, y, radius):
+    # The brute force search over all points
+    distance = [math.hypot(px - x, py - y) for px, py in points]
+    return min((d, i) for i, d in enumerate(distance))[1] if distance and min(distance) <= radius else None
+
+
+def nearest_segment(points, x, y, radius):
+    # The brute force search over all segments, this returns the distance
+    best = math.inf
+    for (x1, y1), (x2, y2) in zip(points[:-1], points[1:]):
+        dx, dy = x2 - x1, y2 - y1
+        length = dx * dx + dy * dy
+        t = min(max(((x - x1) * dx + (y - y1) * dy) / length, 0), 1) if length > 0 else 0
+        best = min(best, math.hypot(x1 + t * dx - x, y1 + t * dy - y))
+    return best if best <= radius else None
+
+
+def check(index, points, rng):
+    # The index should find the same point and segment as the brute force search
+    assert index.points == points
+    rebuilt = GridIndex(index.cell_size, points)
+    assert index.point_cells == rebuilt.point_cells and index.segment_cells == rebuilt.segment_cells
+    for k in range(50):
+        x, y = rng.uniform(-50, 1050), rng.uniform(-50, 1050)
+        i = index.nearest_point(x, y, RADIUS)
+        expected = nearest_point(points, x, y, RADIUS)
+        if expected is None:
+            assert i is None
+        else:
+            assert math.isclose(math.hypot(points[i][0] - x, points[i][1] - y), math.hypot(points[expected][0] - x, points[expected][1] - y))
+        segment, position = index.nearest_segment(x, y, RADIUS)
+        expected = nearest_segment(points, x, y, RADIUS)
+        if expected is None:
+            assert segment is None
+        else:
+            assert math.isclose(math.hypot(position[0] - x, position[1] - y), expected, abs_tol=1e-9)
+
+
+def test_incremental():
+    rng = random.Random(11)
+    index = GridIndex(32)
+    points = []
+    for k in range(30):
+        x, y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+        index.append(x, y)
+        points.append((x, y))
+    check(index, points, rng)
+    for k in range(20):
+        operation = rng.choice(['append', 'pop', 'move', 'insert', 'remove'])
+        i = rng.randrange(len(points))
+        x, y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+        if operation == 'append':
+            index.append(x, y)
+            points.append((x, y))
+        elif operation == 'pop':
+            assert index.pop() == points.pop()
+        elif operation == 'move':
+            index.move(i, x, y)
+            points[i] = (x, y)
+        elif operation == 'insert':
+            index.insert(i, x, y)
+            points.insert(i, (x, y))
+        else:
+            index.remove(i)
+            del points[i]
+        check(index, points, rng)
+
+
+def test_empty():
+    index = GridIndex(32)
+    assert index.nearest_point(10, 10, RADIUS) is None
+    assert index.nearest_segment(10, 10, RADIUS) == (None, None)
+    index.append(10, 10)
+    assert index.nearest_point(20, 20, RADIUS) == 0
+    assert index.nearest_segment(20, 20, RADIUS) == (None, None)
+    index.pop()
+    assert len(index) == 0 and not index.point_cells and not index.segment_cells
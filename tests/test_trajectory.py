@@ -0,0 +1,138 @@
+"""
+Tests of the trajectory of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pytest
+
+from waypointeditor.trajectory import Trajectory, compute_waypoints, compute_batch, points_from_waypoints, cumulative_length
+
+POINTS = [(100, 100), (400, 100), (400, 500), (100, 500), (250, 300)]
+
+
+def check(trajectory):
+    # The incrementally updated state should match a computation from scratch
+    points = trajectory.points
+    assert np.allclose(trajectory.cumulative, cumulative_length(points))
+    assert np.allclose(trajectory.waypoints(), compute_waypoints(points, trajectory.pixels_per_meter, trajectory.total_duration, trajectory.total_rotation))
+
+
+def test_incremental():
+    trajectory = Trajectory(pixels_per_meter=100, total_duration=10, total_rotation=90)
+    for x, y in POINTS:
+        trajectory.append(x, y)
+        check(trajectory)
+    for i in range(20):
+        trajectory.append(i * 10, i * 5)  # beyond the initial capacity
+    check(trajectory)
+    trajectory.insert(2, 300, 300)
+    check(trajectory)
+    assert trajectory.remove(2) == (300, 300)
+    check(trajectory)
+    trajectory.move(0, 50, 50)
+    check(trajectory)
+    assert trajectory.pop() == (190, 95)
+    check(trajectory)
+    version = trajectory.version
+    trajectory.clear()
+    assert len(trajectory) == 0 and trajectory.version > version
+    with pytest.raises(IndexError):
+        trajectory.pop()
+
+
+def test_waypoint():
+    trajectory = Trajectory(POINTS, 100, 10, 90)
+    waypoints = trajectory.waypoints()
+    assert trajectory.waypoint_count() == len(waypoints)
+    for i in range(len(waypoints)):
+        assert np.allclose(trajectory.waypoint(i), waypoints[i])
+
+
+def test_timing():
+    trajectory = Trajectory(POINTS, 100)
+    trajectory.replace(POINTS, [0, 1, 1, 4, 5], [0, 0, 90, 90, 180])
+    assert np.allclose(trajectory.time, [0, 1, 1, 4, 5])
+    trajectory.total_duration = 10
+    assert np.allclose(trajectory.time, [0, 2, 2, 8, 10])
+    assert np.allclose(trajectory.angle, [0, 0, 90, 90, 180])
+    waypoints = trajectory.waypoints()
+    for i in range(len(waypoints)):
+        assert np.allclose(trajectory.waypoint(i), waypoints[i])
+    trajectory.move(1, 400, 150)
+    assert trajectory.has_timing
+    trajectory.append(0, 0)
+    assert not trajectory.has_timing
+    with pytest.raises(ValueError):
+        trajectory.replace(POINTS, [0, 1])
+
+
+def test_arrays_consistent():
+    # The time, x, y and angle all have one value per waypoint, also with the motion profile
+    trajectory = Trajectory(POINTS, 100, 0, 90)
+    trajectory.max_speed, trajectory.max_acceleration = 1.0, 0.5
+    count = trajectory.waypoint_count()
+    assert count > len(POINTS)
+    assert len(trajectory.time) == len(trajectory.x) == len(trajectory.y) == len(trajectory.angle) == count
+    assert np.allclose(trajectory.time, trajectory.waypoints()[:, 0])
+
+
+def test_simplify():
+    points = [(0, 0), (100, 1), (200, 0), (300, 100)]
+    trajectory = Trajectory(points, 100)
+    before, after, deviation = trajectory.simplify(0.05)
+    assert (before, after) == (4, 3)
+    assert deviation <= 0.05
+    check(trajectory)
+
+
+def test_points_from_waypoints():
+    points = np.array(POINTS, dtype=float)
+    waypoints = compute_waypoints(points, 100, 10, 90)
+    assert np.allclose(points_from_waypoints(waypoints, points[0], 100), points)
+    with pytest.raises(ValueError):
+        points_from_waypoints(waypoints, points[0], 0)
+
+
+def test_batch():
+    # The batch gives the same waypoints as each path on its own, also for empty paths and single points
+    rng = np.random.default_rng(3)
+    paths = [rng.uniform(0, 1000, (n, 2)) for n in (5, 0, 1, 2, 50, 0)] + [[(10, 10), (10, 10), (20, 10)]]
+    scales = [100, 200, 300, 100, 50, 100, 100]
+    durations = [10, 5, 3, 0, 60, 1, 2]
+    rotations = [90, 0, 45, -180, 720, 0, 90]
+    batch = compute_batch(paths, scales, durations, rotations)
+    assert len(batch) == len(paths)
+    for path, scale, duration, rotation, waypoints in zip(paths, scales, durations, rotations, batch):
+        assert waypoints.shape == (len(path), 4)
+        assert np.allclose(waypoints, compute_waypoints(np.array(path, dtype=float).reshape(-1, 2), scale, duration, rotation))
+    # A single scale, duration and rotation applies to all paths
+    batch = compute_batch(paths, 100, 10, 90)
+    for path, waypoints in zip(paths, batch):
+        assert np.allclose(waypoints, compute_waypoints(np.array(path, dtype=float).reshape(-1, 2), 100, 10, 90))
+    assert compute_batch([], 100) == []
+    assert [waypoints.shape for waypoints in compute_batch([[], []], 100)] == [(0, 4), (0, 4)]
+    with pytest.raises(ValueError):
+        compute_batch(paths, 0)
+
+
+def test_resample():
+    trajectory = Trajectory(POINTS, 100, 10, 90)
+    waypoints = np.concatenate(list(trajectory.resample(10)))
+    assert len(waypoints) == 101
+    assert np.allclose(np.diff(waypoints[:, 0]), 0.1)
+    assert np.allclose(waypoints[-1], trajectory.waypoints()[-1])
@@ -0,0 +1,301 @@
+"""
+Tests of the graphical user interface of the Waypoint Editor
+
+Copyright (C) 2025, Robert Oostenveld
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('PyQt5')
+
+from PyQt5.QtCore import Qt, QEvent, QPointF, QRect, QSize
+from PyQt5.QtGui import QImage, QMouseEvent, QPainter, QPixmap
+from PyQt5.QtWidgets import QInputDialog, QMessageBox
+
+import waypointeditor.editor
+from waypointeditor import project
+from waypointeditor.editor import WaypointEditor, WaypointsModel, TilePyramid, ImageLoader
+
+
+@pytest.fixture
+def dialogs(monkeypatch):
+    """
+    Answer the dialogs without showing them, this returns the list of dialogs that were asked
+    """
+    asked = []
+    monkeypatch.setattr(QInputDialog, 'getDouble', lambda parent, title, label, *args: asked.append(label) or (0.05, True))
+    monkeypatch.setattr(QMessageBox, 'question', lambda parent, title, text, *args: asked.append(title) or QMessageBox.No)
+    monkeypatch.setattr(QMessageBox, 'information', lambda parent, title, text, *args: asked.append(title))
+    monkeypatch.setattr(QMessageBox, 'warning', lambda parent, title, text, *args: asked.append(title))
+    return asked
+
+
+@pytest.fixture
+def editor(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(waypointeditor.editor, 'AUTOSAVE', str(tmp_path / 'autosave.journal'))
+    editor = WaypointEditor()
+    editor.resize(1200, 900)
+    editor.new_image(4, 3)
+    yield editor
+    editor.close()
+
+
+def trigger(menu, text):
+    for action in menu.actions():
+        if action.menu() is not None:
+            if trigger(action.menu(), text):
+                return True
+        elif action.text() == text:
+            action.trigger()
+            return True
+    return False
+
+
+def render(widget):
+    image = QImage(widget.size(), QImage.Format_ARGB32_Premultiplied)
+    widget.render(image)
+    return image
+
+
+def test_tile_pyramid(app):
+    # The smallest level that still has the resolution of the screen is drawn, only the visible tiles are converted
+    image = QImage(4000, 3000, QImage.Format_RGB32)
+    image.fill(Qt.white)
+    pyramid = TilePyramid(image)
+    assert [pyramid.level(scale) for scale in (2, 1, 0.6, 0.5, 0.3, 0.25)] == [0, 0, 0, 1, 1, 2]
+    assert [(level.width(), level.height()) for level in pyramid.levels] == [(4000, 3000), (2000, 1500), (1000, 750)]
+    # The levels end at a single pixel
+    assert pyramid.level(1e-6) == len(pyramid.levels) - 1
+    assert min(pyramid.levels[-1].width(), pyramid.levels[-1].height()) == 1
+    pixmap = QPixmap(400, 300)
+    painter = QPainter(pixmap)
+    pyramid.draw(painter, 1, (0, 0), QRect(0, 0, 400, 300))
+    assert set(pyramid.tiles) == {(0, 0, 0)}
+    pyramid.draw(painter, 0.1, (0, 0), QRect(0, 0, 400, 300))
+    assert (3, 0, 0) in pyramid.tiles
+    for x in range(0, 4000, 400):
+        pyramid.draw(painter, 1, (-x, 0), QRect(0, 0, 400, 300))
+    painter.end()
+    assert len(pyramid.tiles) == 9 and max(column for level, column, row in pyramid.tiles) == 7
+    # The least recently used tiles are removed from the cache
+    pyramid = TilePyramid(image)
+    pyramid.MAX_TILES = 4
+    for column in range(6):
+        pyramid.tile(0, column, 0)
+    pyramid.tile(0, 2, 0)
+    assert list(pyramid.tiles) == [(0, 3, 0), (0, 4, 0), (0, 5, 0), (0, 2, 0)]
+    # A downsampled preview is drawn at the size of the stage
+    preview = TilePyramid(pyramid.levels[0].scaled(1000, 750), QSize(4000, 3000))
+    assert preview.factor == 4
+    preview.build(0.25)
+    assert len(preview.levels) == 1
+
+
+def load(file_name, view=QSize(800, 600)):
+    # Run the loader on this thread and return the signals that it emitted
+    loader = ImageLoader(file_name, view)
+    signals = []
+    loader.preview.connect(lambda pyramid: signals.append(('preview', pyramid)))
+    loader.loaded.connect(lambda pyramid, statistics: signals.append(('loaded', pyramid)))
+    loader.failed.connect(lambda error: signals.append(('failed', error)))
+    loader.run()
+    return signals
+
+
+@pytest.mark.parametrize('extension', ['png', 'jpg'])
+def test_image_loader(app, tmp_path, extension):
+    # A large image is first shown as a downsampled preview, then at full resolution
+    image = QImage(3000, 2000, QImage.Format_RGB32)
+    image.fill(Qt.gray)
+    file_name = str(tmp_path / f'stage.{extension}')
+    assert image.save(file_name)
+    signals = load(file_name)
+    assert [signal for signal, pyramid in signals] == ['preview', 'loaded']
+    preview, full = signals[0][1], signals[1][1]
+    assert ImageLoader.PREVIEW_SIZE <= max(preview.levels[0].width(), preview.levels[0].height()) < 2 * ImageLoader.PREVIEW_SIZE
+    assert preview.factor * preview.levels[0].width() == 3000
+    assert (full.levels[0].width(), full.levels[0].height()) == (3000, 2000) and full.factor == 1
+    # The levels for the size of the view are computed on the worker thread
+    assert len(full.levels) == 2
+    # A small image is shown at once
+    image.scaled(600, 400).save(file_name)
+    assert [signal for signal, pyramid in load(file_name)] == ['loaded']
+
+
+def test_image_loader_failed(app, tmp_path):
+    file_name = tmp_path / 'stage.png'
+    file_name.write_bytes(b'not an image')
+    assert [signal for signal, error in load(str(file_name))] == ['failed']
+
+
+def test_waypoints_model(editor):
+    # The rows follow the edits of the trajectory, only the rows at the end are inserted or removed
+    model = WaypointsModel(editor)
+    signals = []
+    model.rowsInserted.connect(lambda parent, first, last: signals.append(('inserted', first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: signals.append(('removed', first, last)))
+    model.dataChanged.connect(lambda first, last, roles: signals.append(('changed', first.row(), last.row())))
+    trajectory = editor.trajectory
+    for x, y in [(100, 100), (400, 100), (400, 400)]:
+        trajectory.append(x, y)
+    model.refresh()
+    assert model.rowCount() == 3 and model.columnCount() == 4
+    assert signals == [('inserted', 0, 2)]
+    waypoints = trajectory.waypoints()
+    assert [model.data(model.index(2, column)) for column in range(4)] == [format.format(value) for format, value in zip(model.FORMAT, waypoints[2])]
+    del signals[:]
+    trajectory.append(100, 400)
+    model.refresh()
+    assert signals == [('inserted', 3, 3), ('changed', 0, 2)]
+    del signals[:]
+    trajectory.move(1, 300, 200)
+    model.refresh()
+    assert signals == [('changed', 0, 3)]
+    del signals[:]
+    trajectory.pop()
+    trajectory.pop()
+    model.refresh()
+    assert model.rowCount() == 2
+    assert signals == [('removed', 2, 3), ('changed', 0, 1)]
+    assert model.data(model.index(2, 0)) is None
+    del signals[:]
+    trajectory.clear()
+    model.refresh()
+    assert model.rowCount() == 0
+    assert signals == [('removed', 0, 1)]
+
+
+def test_check_collisions(editor, dialogs):
+    for x, y in [(100, 100), (600, 100)]:
+        editor.trajectory.append(x, y)
+    editor.update_robot_menu()
+    assert trigger(editor.robot_menu, 'Check collisions...')
+    assert dialogs == ['Clearance (meter):', 'Check Collisions']
+
+
+def test_simplify_path(editor, dialogs):
+    for x, y in [(100, 100), (300, 101), (600, 100)]:
+        editor.trajectory.append(x, y)
+    assert trigger(editor.menuBar(), 'Simplify path...')
+    assert dialogs == ['Tolerance (meter):']
+    assert len(editor.trajectory) == 2
+
+
+def test_route_redrawn(editor):
+    # The path on the screen follows the route when obstacles are painted on the stage
+    editor.trajectory.append(100, 450)
+    editor.trajectory.append(1100, 450)
+    editor.settings_tab.avoid_obstacles.setChecked(True)
+    image_tab = editor.image_tab
+    render(image_tab)
+    assert len(image_tab.segments) == 2
+    for y in range(150, 900, 20):
+        editor.planner.paint(600, y, 40)
+    render(image_tab)
+    assert len(editor.trajectory.route()) > 2
+    assert len(image_tab.segments) == 2 * (len(editor.trajectory.route()) - 1)
+
+
+def test_drag_draft(editor):
+    # The route is planned again when the dragged point is released
+    editor.trajectory.append(100, 450)
+    editor.trajectory.append(1100, 450)
+    editor.settings_tab.avoid_obstacles.setChecked(True)
+    for y in range(150, 900, 20):
+        editor.planner.paint(600, y, 40)
+    image_tab = editor.image_tab
+    render(image_tab)
+    point = QPointF(image_tab.offset[0] + 1100 * image_tab.pixels_to_pixels, image_tab.offset[1] + 450 * image_tab.pixels_to_pixels)
+    moved = point + QPointF(0, 20)
+    image_tab.mousePressEvent(QMouseEvent(QEvent.MouseButtonPress, point, Qt.LeftButton, Qt.LeftButton, Qt.NoModifier))
+    image_tab.mouseMoveEvent(QMouseEvent(QEvent.MouseMove, moved, Qt.NoButton, Qt.LeftButton, Qt.NoModifier))
+    assert editor.trajectory.draft
+    assert len(editor.trajectory.route()) == 2
+    image_tab.mouseReleaseEvent(QMouseEvent(QEvent.MouseButtonRelease, moved, Qt.LeftButton, Qt.NoButton, Qt.NoModifier))
+    assert not editor.trajectory.draft
+    assert len(editor.trajectory.route()) > 2
+
+
+def test_export(editor, dialogs, tmp_path):
+    for x, y in [(100, 100), (400, 100), (400, 400)]:
+        editor.trajectory.append(x, y)
+    editor.export_waypoints(str(tmp_path / 'waypoints.csv'))
+    assert (tmp_path / 'waypoints.csv').read_text().count('\n') == 3
+    editor.export_waypoints(str(tmp_path / 'waypoints.bin'))
+    assert (tmp_path / 'waypoints.bin').stat().st_size == 3 * 16
+    # A directory that does not exist is reported rather than raised in the slot
+    editor.export_waypoints(str(tmp_path / 'missing' / 'waypoints.csv'))
+    assert dialogs == ['Export Waypoints']
+
+
+def test_recover(app, editor, dialogs):
+    # The autosave journal is only offered for recovery when there are changes
+    editor.startup()
+    editor.close()
+    second = WaypointEditor()
+    second.startup()
+    assert dialogs == []
+    second.trajectory.append(100, 100)
+    second.record('edit', second.robot, 'append', 100, 100)
+    second.close()
+    third = WaypointEditor()
+    third.startup()
+    assert dialogs == ['Recover']
+    third.close()
+
+
+def test_recover_timing(app, editor, dialogs):
+    # The imported time and angle of each waypoint are in the snapshot at the start of the autosave journal
+    editor.startup()
+    editor.trajectory.replace([(100, 100), (400, 100), (400, 400)], [0, 4, 5], [0, 90, 90])
+    editor.start_journal(waypointeditor.editor.AUTOSAVE)
+    editor.close()
+    recovered = project.replay(waypointeditor.editor.AUTOSAVE)
+    trajectory = recovered.robots[editor.robot]
+    assert trajectory.has_timing
+    assert np.allclose(trajectory.waypoints(), editor.trajectory.waypoints())
+
+
+@pytest.mark.parametrize('text', ['0.001x5', '5x0', '-1x2', 'nanx3', 'infx3', '5', 'ax5'])
+def test_invalid_custom_size(editor, dialogs, monkeypatch, text):
+    size = editor.image_tab.stage
+    monkeypatch.setattr(QInputDialog, 'getText', lambda *args, **kwargs: (text, True))
+    editor.new_custom_image()
+    assert dialogs == ['New Image']
+    assert editor.image_tab.stage == size
+
+
+def test_custom_size(editor, dialogs, monkeypatch):
+    monkeypatch.setattr(QInputDialog, 'getText', lambda *args, **kwargs: ('20x15', True))
+    editor.new_custom_image()
+    assert dialogs == []
+    assert editor.template == [20, 15]
+    assert (editor.image_tab.stage.width(), editor.image_tab.stage.height()) == (6000, 4500)
+
+
+def test_lazy_tabs(app, editor):
+    # The waypoints tabs are created when they are first shown, and then show the current waypoints
+    assert editor.waypoints_tab.tab is None and editor.export_tab.tab is None
+    editor.show()
+    for x, y in [(100, 100), (400, 100), (400, 400)]:
+        editor.trajectory.append(x, y)
+    editor.central_widget.setCurrentWidget(editor.waypoints_tab)
+    editor.refresh()
+    assert editor.waypoints_tab.tab.model.rowCount() == 3
+    editor.central_widget.setCurrentWidget(editor.export_tab)
+    editor.refresh()
+    assert editor.export_tab.tab is not None